@@ -0,0 +1,346 @@
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import sleeper_cache
+import sleeperUtilities as su
+from draft_snapshot import load_snapshot
+from instrumentation import peak_rss_mb
+from sleeper_client import SleeperClient
+from sleeper_stub_server import SleeperStubServer
+
+UTILITIES_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(UTILITIES_DIR, 'fixtures')
+SLEEPER_PLAYERS_CSV = os.path.join(UTILITIES_DIR, 'sleeper_data_output.csv')
+
+# League used by the recorded users and rosters fixtures
+FIXTURE_LEAGUE_ID = 'benchmark'
+FIXTURE_TEAMS = 14
+
+DEFAULT_LEAGUE_SIZES = (8, 10, 12, 14)
+DEFAULT_POOL_SCALES = (1, 4)
+
+# Latency the stub server adds to every response in the network stages, in seconds
+DEFAULT_NETWORK_DELAY = 0.05
+
+# Error responses served before the rosters request succeeds in the retry stage
+RETRY_FAILURES = 2
+
+def write_fixtures(fixtures_dir=FIXTURES_DIR, players_csv=SLEEPER_PLAYERS_CSV, teams=FIXTURE_TEAMS):
+    """
+    Write the Sleeper API fixtures: league users and empty pre-draft rosters for `teams` teams,
+    and a /players/nfl payload rebuilt from the checked-in sleeper_data_output.csv.
+    """
+    os.makedirs(fixtures_dir, exist_ok=True)
+    users = [
+        {'user_id': f"user_{team}", 'display_name': f"manager{team}", 'metadata': {'team_name': f"Bench Team {team}"}}
+        for team in range(1, teams + 1)
+    ]
+    rosters = [
+        {'roster_id': team, 'owner_id': f"user_{team}", 'players': [], 'starters': [], 'reserve': None}
+        for team in range(1, teams + 1)
+    ]
+
+    sleeper_players = pd.read_csv(players_csv, dtype=str, keep_default_na=False)
+    players = {}
+    for row in sleeper_players.itertuples(index=False):
+        players[row.player_id] = {
+            'player_id': row.player_id,
+            'full_name': row.full_name if row.full_name != 'Unknown' else None,
+            'search_full_name': row.search_full_name or None,
+            'position': row.position,
+            'fantasy_positions': [row.position],
+            'team': row.team or None,
+            'sport': 'nfl',
+            'status': 'Active' if row.team else 'Inactive',
+            'active': bool(row.team),
+        }
+        players[row.player_id] = {key: value for key, value in players[row.player_id].items() if value is not None}
+
+    for name, payload in [('sleeper_users.json', users), ('sleeper_rosters.json', rosters), ('sleeper_players.json', players)]:
+        with open(os.path.join(fixtures_dir, name), 'w') as f:
+            json.dump(payload, f, separators=(',', ':'))
+    print(f"Wrote fixtures for {teams} teams and {len(players)} players to {fixtures_dir}")
+
+
+def load_fixtures(fixtures_dir=FIXTURES_DIR):
+    fixtures = {}
+    for name in ['users', 'rosters', 'players']:
+        with open(os.path.join(fixtures_dir, f"sleeper_{name}.json")) as f:
+            fixtures[name] = json.load(f)
+    return fixtures
+
+
+def deepen_pool(merged_data, pool_scale):
+    """
+    Add (pool_scale - 1) synthetic copies of every projected player, each projected a little
+    lower than the last, to benchmark the simulator on deeper player pools.
+    """
+    if pool_scale <= 1:
+        return merged_data
+    projected = merged_data[merged_data['FPTS'].notna()]
+    copies = [merged_data]
+    for copy_number in range(1, pool_scale):
+        clone = projected.copy()
+        clone['player_id'] = clone['player_id'].astype(str) + f"_{copy_number}"
+        clone['FPTS'] = clone['FPTS'] * (1.0 - 0.1 * copy_number / pool_scale)
+        copies.append(clone)
+    return pd.concat(copies, ignore_index=True)
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=UTILITIES_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class _StageTimer:
+    """Collects one result row per benchmarked stage, keeping the fastest of `repeat` runs."""
+
+    def __init__(self, repeat):
+        self.repeat = repeat
+        self.results = []
+
+    def run(self, stage, fn, params, rollouts=None):
+        timings = []
+        value = None
+        for _ in range(self.repeat):
+            # The pipeline's progress output is not part of what is measured
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                started = time.perf_counter()
+                value = fn()
+                timings.append(time.perf_counter() - started)
+        wall = min(timings)
+        count = rollouts(value) if callable(rollouts) else rollouts
+        self.results.append({
+            **params,
+            'stage': stage,
+            'wall_s': round(wall, 6),
+            'peak_rss_mb': peak_rss_mb(),
+            'rollouts': count,
+            'rollouts_per_s': round(count / wall, 1) if count and wall > 0 else None,
+        })
+        print(f"{stage:<28} {params}  {wall * 1000:9.1f} ms" + (f"  {count / wall:8.0f} rollouts/s" if count else ""))
+        return value
+
+
+def run_network_benchmarks(timer, fixtures, delay=DEFAULT_NETWORK_DELAY):
+    """
+    Time the Sleeper requests against a stub server that adds `delay` seconds to every response.
+
+    The league users, rosters and players are fetched one after another and then concurrently
+    with client.gather, so the two rows show what overlapping the requests saves. A last stage
+    fetches the rosters while the stub answers the first RETRY_FAILURES requests with a 503,
+    so its time includes the client's retries and backoff.
+    """
+    rosters_path = f"/v1/league/{FIXTURE_LEAGUE_ID}/rosters"
+    users_path = f"/v1/league/{FIXTURE_LEAGUE_ID}/users"
+    params = {'delay_ms': round(delay * 1000)}
+
+    with tempfile.TemporaryDirectory() as cache_dir, SleeperStubServer({
+        users_path: fixtures['users'], rosters_path: fixtures['rosters'], '/v1/players/nfl': fixtures['players'],
+    }, delay=delay) as server:
+        client = SleeperClient(server.base_url)
+        original_cache_dir = sleeper_cache.CACHE_DIR
+
+        def fetch_players():
+            # A fresh cache directory per call, so every fetch downloads and parses the payload
+            sleeper_cache.CACHE_DIR = tempfile.mkdtemp(dir=cache_dir)
+            return su.fetch_data_from_sleeper(ttl=0, client=client)
+
+        calls = [(su.get_league_users, FIXTURE_LEAGUE_ID, client), (su.fetch_league_rosters, FIXTURE_LEAGUE_ID, client),
+                 (fetch_players,)]
+        try:
+            timer.run('fetch_sequential', lambda: [call[0](*call[1:]) for call in calls], params)
+            timer.run('fetch_gather', lambda: client.gather(*calls), params)
+
+            def fetch_with_retries():
+                server.fail_requests(rosters_path, RETRY_FAILURES)
+                requests_before = len(server.request_log)
+                rosters = su.fetch_league_rosters(FIXTURE_LEAGUE_ID, client)
+                if rosters != fixtures['rosters'] or len(server.request_log) - requests_before != RETRY_FAILURES + 1:
+                    raise RuntimeError("The rosters request was not retried past the injected failures")
+                return rosters
+            timer.run('fetch_retry', fetch_with_retries, {**params, 'failures': RETRY_FAILURES})
+        finally:
+            sleeper_cache.CACHE_DIR = original_cache_dir
+            client.close()
+
+
+def run_benchmarks(league_sizes=DEFAULT_LEAGUE_SIZES, pool_scales=DEFAULT_POOL_SCALES, repeat=3,
+                   fixtures_dir=FIXTURES_DIR, excel_path=None, network_delay=DEFAULT_NETWORK_DELAY):
+    """
+    Run every pipeline stage on the offline fixtures and return the result rows.
+
+    The Excel, league and players stages run once; the rest run for every league size and
+    pool depth. Sleeper requests are served by a local stub server from the fixtures, with the
+    players cache pointed at an empty temporary directory so every fetch parses the payload.
+    With a `network_delay`, the run_network_benchmarks stages repeat the requests against a
+    stub with that much latency.
+    """
+    fixtures = load_fixtures(fixtures_dir)
+    timer = _StageTimer(repeat)
+    rosters_path = f"/v1/league/{FIXTURE_LEAGUE_ID}/rosters"
+    users_path = f"/v1/league/{FIXTURE_LEAGUE_ID}/users"
+
+    cbs_data = timer.run(
+        'load_excel', lambda: su.load_and_process_excel(excel_path or su.excel_file_path, use_cache=False), {}
+    )
+
+    with tempfile.TemporaryDirectory() as cache_dir, SleeperStubServer({
+        users_path: fixtures['users'], rosters_path: fixtures['rosters'], '/v1/players/nfl': fixtures['players'],
+    }) as server:
+        client = SleeperClient(server.base_url)
+        original_cache_dir = sleeper_cache.CACHE_DIR
+        sleeper_cache.CACHE_DIR = cache_dir
+        try:
+            timer.run('fetch_league', lambda: client.gather(
+                (su.get_league_users, FIXTURE_LEAGUE_ID, client), (su.fetch_league_rosters, FIXTURE_LEAGUE_ID, client)
+            ), {})
+            def fetch_players():
+                # A fresh cache directory per run, so every run downloads and parses the payload
+                sleeper_cache.CACHE_DIR = tempfile.mkdtemp(dir=cache_dir)
+                return su.fetch_data_from_sleeper(ttl=0, client=client)
+            sleeper_data = timer.run('fetch_players', fetch_players, {})
+        finally:
+            sleeper_cache.CACHE_DIR = original_cache_dir
+            client.close()
+    if network_delay:
+        run_network_benchmarks(timer, fixtures, network_delay)
+
+    merged_data = timer.run('merge', lambda: su.merge_data(cbs_data, sleeper_data), {})
+
+    saved_globals = (su.LEAGUE_SIZE, su.TEAMS, su.TEAM_ROSTER_NEEDS, su.DRAFTED_PLAYERS)
+    try:
+        for pool_scale in pool_scales:
+            pool = deepen_pool(merged_data, pool_scale)
+            for league_size in league_sizes:
+                params = {'league_size': league_size, 'pool_scale': pool_scale, 'players': len(pool)}
+                su.LEAGUE_SIZE = league_size
+                su.update_teams_data(fixtures['rosters'][:league_size])
+                my_team = su.TEAMS[-1]
+
+                data = pool.copy()
+                baselines = timer.run('baselines', lambda: su.identify_baseline_players(data), params)
+                timer.run('vorp', lambda: su.calculate_vorp(data, baselines), params)
+                player_table = su.build_player_table(data)
+                timer.run('filter', lambda: su.filter_by_team_needs(player_table), params)
+
+                def remaining_draft():
+                    draft_results, available_players, team_needs = su.initial_draft_state(player_table)
+                    return su.simulate_remaining_draft(player_table, team_needs, draft_results, available_players)
+                timer.run('simulate_remaining_draft', remaining_draft, params, rollouts=1)
+
+                _, available_players, _ = su.initial_draft_state(player_table)
+                candidates = len(su.find_potential_picks(player_table, available_players, su.TEAM_ROSTER_NEEDS[my_team]))
+                timer.run(
+                    'simulate_draft_for_my_team',
+                    lambda: su.simulate_draft_for_my_team(player_table, su.TEAM_ROSTER_NEEDS, my_team),
+                    params, rollouts=candidates
+                )
+    finally:
+        su.LEAGUE_SIZE, su.TEAMS, su.TEAM_ROSTER_NEEDS, su.DRAFTED_PLAYERS = saved_globals
+
+    return timer.results
+
+
+def run_snapshot_benchmarks(paths, repeat=3):
+    """
+    Benchmark restoring each draft snapshot and simulating my next pick from its state.
+
+    A snapshot freezes a draft part-way (player table, valuations, rosters and picks), so the
+    same inputs can be re-run on any commit without the fixtures, the Excel file or the network.
+    """
+    timer = _StageTimer(repeat)
+    for path in paths:
+        snapshot = load_snapshot(path)
+        params = {'snapshot': os.path.basename(path), 'league_size': len(snapshot.teams),
+                  'players': len(snapshot.player_table.player_id), 'picks': snapshot.last_pick_no}
+        timer.run('load_snapshot', lambda: load_snapshot(path), params)
+
+        my_team = snapshot.my_team or snapshot.teams[-1]
+        candidates = len(su.find_potential_picks(
+            snapshot.player_table, snapshot.available_players, snapshot.team_roster_needs[my_team]
+        ))
+        timer.run(
+            'simulate_draft_for_my_team',
+            lambda: su.simulate_draft_for_my_team(
+                snapshot.player_table, snapshot.team_roster_needs, my_team, drafted_players=snapshot.drafted_players
+            ),
+            params, rollouts=candidates
+        )
+    return timer.results
+
+
+def compare_results(baseline, current):
+    """Print each stage's wall time against a previous results file's."""
+    def key(row):
+        return (row['stage'], row.get('league_size'), row.get('pool_scale'), row.get('snapshot'))
+
+    previous = {key(row): row for row in baseline['results']}
+    print(f"\nCompared with {baseline.get('commit') or 'baseline'}:")
+    for row in current['results']:
+        before = previous.get(key(row))
+        if before is None or not before['wall_s']:
+            continue
+        ratio = row['wall_s'] / before['wall_s']
+        flag = '  REGRESSION' if ratio > 1.2 else ''
+        input_name = f"snapshot={row['snapshot']}" if row.get('snapshot') else f"scale={row.get('pool_scale')}"
+        print(f"{row['stage']:<28} size={row.get('league_size')} {input_name}  "
+              f"{before['wall_s'] * 1000:9.1f} -> {row['wall_s'] * 1000:9.1f} ms  x{ratio:.2f}{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the draft pipeline on offline fixtures.")
+    parser.add_argument('--league-sizes', type=int, nargs='+', default=list(DEFAULT_LEAGUE_SIZES))
+    parser.add_argument('--pool-scales', type=int, nargs='+', default=list(DEFAULT_POOL_SCALES),
+                        help="Player pool depths, as multiples of the projected players")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per stage; the fastest is reported")
+    parser.add_argument('--network-delay', type=float, default=DEFAULT_NETWORK_DELAY,
+                        help="Seconds of stub latency per request for the network stages (0 skips them)")
+    parser.add_argument('--output', default='benchmark_results.json', help="Results JSON file")
+    parser.add_argument('--compare', help="Previous results JSON to compare against")
+    parser.add_argument('--write-fixtures', action='store_true', help="Regenerate the Sleeper fixtures and exit")
+    parser.add_argument('--snapshots', nargs='+',
+                        help="Benchmark these draft snapshots (draft_room.py --checkpoint, draft_cli.py snapshot) "
+                             "instead of the fixtures")
+    args = parser.parse_args()
+
+    if args.write_fixtures:
+        write_fixtures()
+        return
+
+    results = {
+        'commit': _git_commit(),
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'repeat': args.repeat,
+        'results': (run_snapshot_benchmarks(args.snapshots, args.repeat) if args.snapshots
+                    else run_benchmarks(args.league_sizes, args.pool_scales, args.repeat,
+                                        network_delay=args.network_delay)),
+    }
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare_results(json.load(f), results)
+
+
+if __name__ == "__main__":
+    main()
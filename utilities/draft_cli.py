@@ -0,0 +1,327 @@
+import argparse
+import json
+import math
+import sys
+import time
+
+# Only the standard library and project modules built on it are imported here; the simulator's
+# NumPy, pandas and requests are imported by the commands that run it, so the light commands
+# (player, leagues, needs) start without loading them.
+from player_matching import normalize_player_name
+from roster_needs import (
+    NEEDS_COLUMNS, SIM_POSITIONS, UNKNOWN_POSITION_CODE, remaining_simulation_needs, teams_data, unpack_roster_needs,
+)
+from sleeper_api import fetch_league_rosters, get_all_leagues_for_user, get_user_info
+from sleeper_cache import PLAYER_TABLE_CACHE_NAME, load_cached_value
+from sleeper_client import SLEEPER_API_BASE, LightSleeperClient, SleeperClient
+
+# League size whose VORP `player` reports by default (sleeperUtilities.LEAGUE_SIZE)
+DEFAULT_LEAGUE_SIZE = 12
+
+# Most players printed by a name lookup
+MAX_LOOKUP_RESULTS = 10
+
+
+def load_players():
+    """
+    Return the cached player columns, building the cache with the full pipeline if there is none.
+
+    Returns:
+        dict: player_id, full_name, search_name (normalized), team, position (codes) and fpts lists,
+        plus baselines per league size.
+    """
+    cached = load_cached_value(PLAYER_TABLE_CACHE_NAME)
+    if cached is None:
+        print("No cached player table; running the projection pipeline to build it...", file=sys.stderr)
+        import sleeperUtilities as su
+        su.load_player_table()
+        cached = load_cached_value(PLAYER_TABLE_CACHE_NAME)
+    players, age = cached
+    if age > 24 * 60 * 60:
+        print(f"Note: the cached player table is {age / 3600:.0f} hours old; "
+              f"run `draft_cli.py refresh` to update it.", file=sys.stderr)
+    return players
+
+
+def _vorp(players, player_index, league_size):
+    points = players['fpts'][player_index]
+    if math.isnan(points):
+        return None
+    code = players['position'][player_index]
+    baseline = players['baselines'][league_size].get(SIM_POSITIONS[code], 0.0) if code < UNKNOWN_POSITION_CODE else 0.0
+    return round(points - baseline, 2)
+
+
+def _player_row(players, player_index, league_size):
+    code = players['position'][player_index]
+    points = players['fpts'][player_index]
+    return {
+        'player_id': players['player_id'][player_index],
+        'full_name': players['full_name'][player_index],
+        'team': players['team'][player_index],
+        'position': SIM_POSITIONS[code] if code < UNKNOWN_POSITION_CODE else None,
+        'fpts': None if math.isnan(points) else round(points, 2),
+        'vorp': _vorp(players, player_index, league_size),
+    }
+
+
+def _output(args, result, lines):
+    if args.json:
+        print(json.dumps(result))
+    else:
+        print('\n'.join(lines))
+
+
+def command_player(args):
+    """Look a player up by Sleeper ID or name in the cached player table."""
+    players = load_players()
+    if args.teams not in players['baselines']:
+        raise SystemExit(f"No baselines for a {args.teams}-team league.")
+
+    rows = [i for i, player_id in enumerate(players['player_id']) if player_id == args.query]
+    if not rows:
+        key = normalize_player_name(args.query)
+        rows = [i for i, name in enumerate(players['search_name']) if name == key]
+        if not rows and key:
+            rows = [i for i, name in enumerate(players['search_name']) if key in name]
+    matches = [_player_row(players, i, args.teams) for i in rows[:args.limit]]
+
+    lines = [
+        f"{row['player_id']:>8}  {row['full_name']:<28} {row['position'] or '-':<4} {row['team'] or '-':<4} "
+        f"FPTS {row['fpts'] if row['fpts'] is not None else '-':>7}  VORP {row['vorp'] if row['vorp'] is not None else '-':>7}"
+        for row in matches
+    ] or [f"No player matches '{args.query}'."]
+    _output(args, {'league_size': args.teams, 'players': matches}, lines)
+
+
+def command_leagues(args):
+    """List a user's leagues for a season."""
+    client = LightSleeperClient(args.api)
+    user_id = args.user
+    if not user_id.isdigit():
+        user_info = get_user_info(user_id, client)
+        if not user_info:
+            raise SystemExit(f"Unknown Sleeper user {args.user}")
+        user_id = user_info['user_id']
+
+    leagues = [
+        {
+            'league_id': league['league_id'],
+            'name': league.get('name'),
+            'teams': league.get('total_rosters'),
+            'status': league.get('status'),
+            'draft_id': league.get('draft_id'),
+        }
+        for league in get_all_leagues_for_user(user_id, sport=args.sport, season=args.season, client=client)
+    ]
+    lines = [
+        f"{league['league_id']:>20}  {league['name'] or '':<32} {league['teams'] or '?':>3} teams  {league['status']}"
+        for league in leagues
+    ] or [f"No {args.sport} leagues for user {args.user} in {args.season}."]
+    _output(args, {'user_id': user_id, 'season': args.season, 'leagues': leagues}, lines)
+
+
+def command_needs(args):
+    """Show each team's open simulator roster slots in a league."""
+    rosters = fetch_league_rosters(args.league, LightSleeperClient(args.api))
+    if not rosters:
+        raise SystemExit(f"No rosters found for league {args.league}")
+    _, team_roster_needs, drafted_players = teams_data(rosters)
+    if args.team:
+        if args.team not in team_roster_needs:
+            raise SystemExit(f"Team {args.team} is not in league {args.league}")
+        drafted_players = {args.team: drafted_players[args.team]}
+
+    # Rostered players' positions come from the cached table; an empty league needs no lookups
+    if any(drafted_players.values()):
+        players = load_players()
+        position_by_id = dict(zip(players['player_id'], players['position']))
+    else:
+        position_by_id = {}
+
+    teams = {}
+    for team, player_ids in drafted_players.items():
+        codes = [position_by_id[str(player_id)] for player_id in player_ids if str(player_id) in position_by_id]
+        unknown = len(player_ids) - len(codes)
+        if unknown:
+            print(f"Warning: {unknown} of {team}'s players are not in the cached player table.", file=sys.stderr)
+        teams[team] = {'open_slots': unpack_roster_needs(remaining_simulation_needs(codes)), 'rostered': len(player_ids)}
+
+    lines = [f"{'Team':<10} {'rostered':>8}  " + ' '.join(f"{column:>5}" for column in NEEDS_COLUMNS)]
+    lines += [
+        f"{team:<10} {needs['rostered']:>8}  " + ' '.join(f"{needs['open_slots'][column]:>5}" for column in NEEDS_COLUMNS)
+        for team, needs in teams.items()
+    ]
+    _output(args, {'league_id': args.league, 'teams': teams}, lines)
+
+
+def command_pick(args):
+    """Simulate the rest of a league's draft and recommend the best next pick for a team."""
+    import logging
+    import sleeperUtilities as su
+    from draft_logging import configure_logging
+
+    configure_logging(logging.WARNING)
+    started = time.perf_counter()
+    rosters = fetch_league_rosters(args.league, SleeperClient(args.api))
+    if not rosters:
+        raise SystemExit(f"No rosters found for league {args.league}")
+    teams, team_roster_needs, drafted_players = teams_data(rosters)
+    if args.team not in team_roster_needs:
+        raise SystemExit(f"Team {args.team} is not in league {args.league}")
+
+    player_table = su.load_cached_player_table(len(teams))
+    if player_table is None:
+        print("No cached player table; running the projection pipeline to build it...", file=sys.stderr)
+        su.load_player_table()
+        player_table = su.load_cached_player_table(len(teams))
+
+    if args.monte_carlo:
+        _monte_carlo_pick(args, player_table, team_roster_needs, drafted_players, started)
+        return
+
+    best_pick, best_points = su.simulate_draft_for_my_team(
+        player_table, team_roster_needs, args.team, per_position=args.per_position, drafted_players=drafted_players
+    )
+    result = {
+        'league_id': args.league,
+        'team': args.team,
+        'player_id': best_pick,
+        'full_name': player_table.full_name[player_table.index[best_pick]] if best_pick is not None else None,
+        'projected_points': best_points,
+        'seconds': round(time.perf_counter() - started, 3),
+    }
+    if best_pick is None:
+        lines = [f"No suitable pick found for {args.team}."]
+    else:
+        lines = [f"Best pick for {args.team}: {result['full_name']} ({best_pick}), "
+                 f"projected total points {best_points} ({result['seconds']}s)"]
+    _output(args, result, lines)
+
+
+def _monte_carlo_pick(args, player_table, team_roster_needs, drafted_players, started):
+    """Rank the candidates of `pick --monte-carlo N` over N noisy simulated drafts."""
+    import sleeperUtilities as su
+    from monte_carlo import simulate_draft_monte_carlo
+
+    candidates = None
+    if args.per_position is not None:
+        _, available_players, _ = su.initial_draft_state(player_table, team_roster_needs, drafted_players)
+        potential_picks = su.find_potential_picks(player_table, available_players, team_roster_needs[args.team])
+        candidates = list(su.prune_dominated_candidates(player_table, potential_picks, args.per_position))
+    summary = simulate_draft_monte_carlo(
+        player_table, team_roster_needs, args.team, n_simulations=args.monte_carlo, candidates=candidates,
+        drafted_players=drafted_players
+    )
+    seconds = round(time.perf_counter() - started, 3)
+    top = summary.head(MAX_LOOKUP_RESULTS)
+    result = {
+        'league_id': args.league,
+        'team': args.team,
+        'simulations': args.monte_carlo,
+        'player_id': top['player_id'].iloc[0] if len(top) else None,
+        'candidates': json.loads(top.to_json(orient='records')),
+        'seconds': seconds,
+    }
+    if summary.empty:
+        lines = [f"No suitable pick found for {args.team}."]
+    else:
+        lines = [f"Candidates for {args.team} over {args.monte_carlo} simulated drafts ({seconds}s):",
+                 top.to_string(index=False, float_format=lambda value: f"{value:.2f}")]
+    _output(args, result, lines)
+
+
+def command_snapshot(args):
+    """Save a league's current draft state to a snapshot file (for draft_room.py --resume or benchmark.py --snapshots)."""
+    import sleeperUtilities as su
+    from draft_snapshot import DraftSnapshot, save_snapshot
+    from sleeper_api import get_league
+
+    client = SleeperClient(args.api)
+    league, rosters = client.gather((get_league, args.league, client), (fetch_league_rosters, args.league, client))
+    if not rosters:
+        raise SystemExit(f"No rosters found for league {args.league}")
+    _, team_roster_needs, drafted_players = teams_data(rosters)
+    if args.team not in team_roster_needs:
+        raise SystemExit(f"Team {args.team} is not in league {args.league}")
+
+    player_table = su.load_cached_player_table(len(team_roster_needs))
+    if player_table is None:
+        print("No cached player table; running the projection pipeline to build it...", file=sys.stderr)
+        su.load_player_table()
+        player_table = su.load_cached_player_table(len(team_roster_needs))
+
+    snapshot = DraftSnapshot.capture(
+        player_table, team_roster_needs, drafted_players,
+        league_id=args.league, draft_id=(league or {}).get('draft_id'), my_team=args.team
+    )
+    size = save_snapshot(snapshot, args.output)
+    result = {'path': args.output, 'bytes': size, 'teams': len(team_roster_needs),
+              'rostered': sum(len(players) for players in drafted_players.values())}
+    _output(args, result, [f"Saved {result['teams']} teams and {result['rostered']} rostered players "
+                           f"to {args.output} ({size / 1024:.0f} KB)."])
+
+
+def command_refresh(args):
+    """Rebuild the cached player table with the projection pipeline."""
+    import sleeperUtilities as su
+
+    started = time.perf_counter()
+    player_table = su.load_player_table(args.players_csv)
+    result = {'players': len(player_table.player_id), 'seconds': round(time.perf_counter() - started, 2)}
+    _output(args, result, [f"Cached {result['players']} players in {result['seconds']}s."])
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Quick draft queries. player, leagues and needs read the cached player table "
+                    "and skip the projection pipeline; pick, snapshot and refresh load the full simulator."
+    )
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    parser.add_argument('--api', default=SLEEPER_API_BASE, help="Sleeper API root (e.g. a local stub server)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    player = commands.add_parser('player', help="Look up a player by Sleeper ID or name")
+    player.add_argument('query', help="Sleeper player ID, or a full or partial name")
+    player.add_argument('--teams', type=int, default=DEFAULT_LEAGUE_SIZE, help="League size for VORP")
+    player.add_argument('--limit', type=int, default=MAX_LOOKUP_RESULTS, help="Most players to show")
+    player.set_defaults(run=command_player)
+
+    leagues = commands.add_parser('leagues', help="List a user's leagues")
+    leagues.add_argument('user', help="Sleeper username or user ID")
+    leagues.add_argument('--season', default='2024')
+    leagues.add_argument('--sport', default='nfl')
+    leagues.set_defaults(run=command_leagues)
+
+    needs = commands.add_parser('needs', help="Show open roster slots per team in a league")
+    needs.add_argument('league', help="Sleeper league ID")
+    needs.add_argument('--team', help="Only this team (Team_<roster_id>)")
+    needs.set_defaults(run=command_needs)
+
+    pick = commands.add_parser('pick', help="Recommend the best next pick (runs the simulator)")
+    pick.add_argument('league', help="Sleeper league ID")
+    pick.add_argument('team', help="Team to pick for (Team_<roster_id>)")
+    pick.add_argument('--per-position', type=int, help="Only simulate the best N candidates per position")
+    pick.add_argument('--monte-carlo', type=int, metavar='N',
+                      help="Rank candidates over N noisy simulated drafts (mean, percentiles, win probability)")
+    pick.set_defaults(run=command_pick)
+
+    snapshot = commands.add_parser('snapshot', help="Save a league's draft state to a snapshot file")
+    snapshot.add_argument('league', help="Sleeper league ID")
+    snapshot.add_argument('team', help="Team to pick for (Team_<roster_id>)")
+    snapshot.add_argument('output', help="Snapshot file to write")
+    snapshot.set_defaults(run=command_snapshot)
+
+    refresh = commands.add_parser('refresh', help="Rebuild the cached player table (runs the projection pipeline)")
+    refresh.add_argument('--players-csv', help="Use a saved merged_data_output.csv instead of the Excel file and Sleeper")
+    refresh.set_defaults(run=command_refresh)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import datetime
+import json
+import logging
+import sys
+
+# Parent logger of the simulator, planner and draft room loggers
+ROOT_LOGGER = 'draft'
+
+# Console output looks like the plain progress lines the pipeline prints
+CONSOLE_FORMAT = '%(message)s'
+
+
+def get_logger(name):
+    """Return the logger for one part of the draft tools, e.g. get_logger('simulator')."""
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+def log_event(logger, level, event, message, *args, **fields):
+    """
+    Log `message % args` as a named event carrying structured fields.
+
+    Nothing is formatted unless a handler will see the record. The console shows the message;
+    a JsonEventHandler also writes the event name and fields. Fields that are costly to build
+    should be guarded by the caller with logger.isEnabledFor(level).
+    """
+    if logger.isEnabledFor(level):
+        logger.log(level, message, *args, extra={'event': event, 'fields': fields})
+
+
+def _json_default(value):
+    # numpy scalars and arrays, sets and anything else the fields may hold
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    return str(value)
+
+
+class JsonEventHandler(logging.Handler):
+    """
+    Write every record as one JSON object per line, for a live draft UI to follow.
+
+    Each line has ts, level, logger, event (the record's event name, or 'log' for plain
+    messages) and message, plus the event's fields.
+    """
+
+    def __init__(self, stream, owns_stream=False):
+        """
+        Args:
+            stream (file): Text stream to write to; it is flushed after every event.
+            owns_stream (bool): Close the stream when the handler is closed.
+        """
+        super().__init__()
+        self.stream = stream
+        self.owns_stream = owns_stream
+
+    def emit(self, record):
+        try:
+            payload = {
+                'ts': datetime.datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+                'level': record.levelname,
+                'logger': record.name,
+                'event': getattr(record, 'event', 'log'),
+                'message': record.getMessage(),
+            }
+            payload.update(getattr(record, 'fields', {}))
+            self.stream.write(json.dumps(payload, default=_json_default) + '\n')
+            self.stream.flush()
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        if self.owns_stream:
+            self.stream.close()
+        super().close()
+
+
+def configure_logging(level=logging.INFO, json_events=None, stream=None):
+    """
+    Send the draft tools' log output to the console and, optionally, to a JSON event stream.
+
+    Without this call only warnings are shown (through logging's last-resort handler), so
+    library callers such as the benchmarks pay nothing for summary or per-rollout output.
+
+    Args:
+        level (int or str): Lowest level shown; DEBUG adds per-candidate and per-rollout output.
+        json_events (str or file): Path (or '-' for stdout, or an open text stream) to also
+            write every event to as JSON lines.
+        stream (file): Console stream; defaults to stdout.
+
+    Returns:
+        logging.Logger: The configured parent logger.
+    """
+    logger = logging.getLogger(ROOT_LOGGER)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+    logger.setLevel(level)
+    logger.propagate = False
+
+    console = logging.StreamHandler(stream or sys.stdout)
+    console.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+    logger.addHandler(console)
+
+    if json_events is not None:
+        if json_events == '-':
+            handler = JsonEventHandler(sys.stdout)
+        elif isinstance(json_events, str):
+            handler = JsonEventHandler(open(json_events, 'a', encoding='utf-8'), owns_stream=True)
+        else:
+            handler = JsonEventHandler(json_events)
+        logger.addHandler(handler)
+    return logger
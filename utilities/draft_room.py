@@ -0,0 +1,381 @@
+import argparse
+import json
+import logging
+import time
+
+import sleeperUtilities as su
+from draft_logging import configure_logging, get_logger, log_event
+from draft_snapshot import DraftSnapshot, load_snapshot, save_snapshot
+from instrumentation import count
+from planner import plan_picks
+from sleeper_client import SleeperClient
+from sleeper_stub_server import SleeperStubServer
+from transposition import TranspositionCache
+
+logger = get_logger('room')
+
+# Team picked for when neither --team nor a resumed snapshot names one
+DEFAULT_TEAM = 'Team_10'
+
+
+class DraftRoom:
+    """
+    Long-running draft state that applies Sleeper picks as they arrive and re-plans my next pick.
+
+    The player table, baselines and VORP are computed once. Each new pick only marks the player
+    as drafted, fills a slot on the picking team and appends to DRAFTED_PLAYERS and
+    TEAM_ROSTER_NEEDS. Re-planning reuses the room's sorted pick queues, whose cursors just skip
+    players drafted since the last plan. My candidate list is only rebuilt when my own needs change.
+    A transposition cache of simulated draft suffixes lives as long as the room, so states that
+    an earlier plan already simulated (common when opponents draft close to the greedy model)
+    are replayed rather than simulated again.
+
+    The room's state can be saved with checkpoint() and restored with from_snapshot(), which
+    skips the pipeline; picks made since the checkpoint are applied by the next poll.
+
+    With workers > 1 the room keeps one pool of rollout processes for its lifetime; close the
+    room (or use it as a context manager) to shut the pool down.
+    """
+
+    def __init__(self, player_table, my_team, draft_id, client=None, workers=1, lookahead=1, beam_width=20,
+                 per_position=None, league_id=None, state=None):
+        """
+        Args:
+            player_table (PlayerTable): The table built by build_player_table.
+            my_team (str): The team to pick for (Team_<roster_id>).
+            draft_id (str): The Sleeper draft to poll.
+            client (SleeperClient): API client; defaults to the shared client.
+            workers (int): Processes for candidate rollouts.
+            lookahead (int): My picks to plan ahead with planner.plan_picks.
+            beam_width (int): Beam width for lookahead > 1.
+            per_position (int): Only simulate the best N candidates per position.
+            league_id (str): The Sleeper league, recorded in checkpoints.
+            state (tuple): (draft_results, available_players, team_needs) to start from instead of
+                initial_draft_state, e.g. a snapshot's.
+        """
+        self.player_table = player_table
+        self.my_team = my_team
+        self.draft_id = draft_id
+        self.league_id = league_id
+        self.client = client
+        self.workers = workers
+        self.lookahead = lookahead
+        self.beam_width = beam_width
+        self.per_position = per_position
+        self.plan = []
+
+        self.draft_results, self.available_players, self.team_needs = (
+            state if state is not None else su.initial_draft_state(player_table)
+        )
+        self.queues = su.PositionQueues.from_table(player_table, self.available_players)
+        self.cache = TranspositionCache()
+        self.executor = su.rollout_executor(player_table, workers) if workers > 1 else None
+        self.potential_picks = None
+        self.last_pick_no = 0
+        self.picks_seen = []
+        self.recommendation = None
+
+    @classmethod
+    def from_snapshot(cls, snapshot, my_team=None, client=None, **options):
+        """
+        Restore a room from a snapshot, making the snapshot's league the current one.
+
+        Args:
+            snapshot (DraftSnapshot): The state to resume from.
+            my_team (str): The team to pick for; defaults to the snapshot's.
+            client (SleeperClient): API client for polling the draft.
+            **options: workers, lookahead, beam_width and per_position, as for DraftRoom.
+        """
+        snapshot.install()
+        state = (
+            {team: list(players) for team, players in snapshot.draft_results.items()},
+            snapshot.available_players.copy(),
+            dict(snapshot.simulation_needs),
+        )
+        room = cls(snapshot.player_table, my_team or snapshot.my_team, snapshot.draft_id, client,
+                   league_id=snapshot.league_id, state=state, **options)
+        room.last_pick_no = snapshot.last_pick_no
+        room.picks_seen = list(snapshot.picks)
+        return room
+
+    def close(self):
+        """Shut down the room's rollout processes, if it has any."""
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def snapshot(self):
+        """Capture the room's current state (and the league's TEAM_ROSTER_NEEDS and DRAFTED_PLAYERS)."""
+        return DraftSnapshot(
+            self.player_table, dict(su.TEAM_ROSTER_NEEDS),
+            {team: [str(player_id) for player_id in players] for team, players in su.DRAFTED_PLAYERS.items()},
+            self.draft_results, self.available_players, self.team_needs, self.picks_seen, self.last_pick_no,
+            self.league_id, self.draft_id, self.my_team,
+        )
+
+    def checkpoint(self, path):
+        """Save the room's state to a snapshot file."""
+        started = time.perf_counter()
+        size = save_snapshot(self.snapshot(), path)
+        log_event(logger, logging.DEBUG, 'checkpoint', "Checkpoint after pick %s written to %s (%.0f KB, %.1f ms)",
+                  self.last_pick_no, path, size / 1024, (time.perf_counter() - started) * 1000,
+                  pick_no=self.last_pick_no, path=path, bytes=size)
+
+    def apply_picks(self, picks):
+        """
+        Apply the picks made since the last call.
+
+        Args:
+            picks (list): Sleeper pick dictionaries; picks already applied are ignored.
+
+        Returns:
+            list: The picks that were newly applied.
+        """
+        new_picks = sorted(
+            (pick for pick in picks if pick.get('pick_no', 0) > self.last_pick_no),
+            key=lambda pick: pick['pick_no']
+        )
+        for pick in new_picks:
+            self.last_pick_no = pick['pick_no']
+            self.picks_seen.append(pick)
+            team = f"Team_{pick['roster_id']}"
+            player_id = str(pick['player_id'])
+            if team not in self.team_needs:
+                logger.warning("Pick %s is for unknown roster %s", pick['pick_no'], pick['roster_id'])
+                continue
+
+            su.DRAFTED_PLAYERS.setdefault(team, []).append(player_id)
+            count('player_lookups')
+            player_index = self.player_table.index.get(player_id)
+            if player_index is None or not self.available_players[player_index]:
+                continue
+
+            position = su.position_name(self.player_table, player_index)
+            self.queues.take(player_index)
+            self.draft_results[team].append(player_index)
+            self.team_needs[team] = su._consume_roster_slot(self.team_needs[team], int(self.player_table.position[player_index]))
+            if position is not None:
+                su.update_team_roster_needs(team, position, su.TEAM_ROSTER_NEEDS)
+
+            if team == self.my_team:
+                self.potential_picks = None
+            elif self.potential_picks is not None:
+                self.potential_picks.pop(player_index, None)
+        return new_picks
+
+    def replan(self):
+        """
+        Re-evaluate my candidate picks against the current draft state.
+
+        With lookahead > 1 the next `lookahead` picks are planned with planner.plan_picks and
+        the plan is kept in self.plan.
+
+        Returns:
+            tuple: (best player_id, max total points), or (None, 0) when nothing fits.
+        """
+        if self.lookahead > 1:
+            self.plan, points = plan_picks(
+                self.player_table, su.TEAM_ROSTER_NEEDS, self.my_team, self.lookahead, self.beam_width,
+                state=(self.draft_results, self.available_players, self.team_needs, self.queues), cache=self.cache
+            )
+            self.recommendation = (self.plan[0], points) if self.plan else (None, 0)
+            return self.recommendation
+
+        if self.potential_picks is None:
+            self.potential_picks = su.find_potential_picks(
+                self.player_table, self.available_players, su.TEAM_ROSTER_NEEDS[self.my_team]
+            )
+        candidates = list(self.potential_picks)
+        if self.per_position is not None:
+            candidates = list(su.prune_dominated_candidates(self.player_table, self.potential_picks, self.per_position))
+        if not candidates:
+            self.recommendation = (None, 0)
+            return self.recommendation
+
+        rollouts = su.evaluate_candidates(
+            self.player_table, self.draft_results, self.available_players, self.team_needs,
+            self.my_team, candidates, self.workers, queues=self.queues, cache=self.cache, executor=self.executor
+        )
+        best_index, (best_points, _) = max(
+            zip(candidates, rollouts), key=lambda candidate: candidate[1][0]
+        )
+        self.recommendation = (self.player_table.player_id[best_index], best_points)
+        return self.recommendation
+
+    def poll(self):
+        """
+        Fetch the draft's picks once, apply anything new and re-plan if the state changed.
+
+        Returns:
+            list: The newly applied picks (empty if nothing changed).
+        """
+        picks = su.get_draft_picks(self.draft_id, self.client)
+        if picks is None:
+            return []
+        new_picks = self.apply_picks(picks)
+        if new_picks or self.recommendation is None:
+            started = time.perf_counter()
+            best_pick, best_points = self.replan()
+            elapsed = time.perf_counter() - started
+            if logger.isEnabledFor(logging.INFO):
+                self._log_update(new_picks, best_pick, best_points, elapsed)
+        return new_picks
+
+    def _log_update(self, new_picks, best_pick, best_points, elapsed):
+        for pick in new_picks:
+            log_event(logger, logging.INFO, 'pick', "Pick %s: Team_%s took %s",
+                      pick['pick_no'], pick['roster_id'], self.describe(pick['player_id']),
+                      pick_no=pick['pick_no'], team=f"Team_{pick['roster_id']}", player_id=str(pick['player_id']))
+        if best_pick is None:
+            log_event(logger, logging.INFO, 'recommendation', "No suitable pick found for your team.", player_id=None)
+            return
+        log_event(logger, logging.INFO, 'recommendation',
+                  "Best pick now: %s for %.1f projected points (re-planned in %.2fs, state cache hit rate %.0f%%)",
+                  self.describe(best_pick), best_points, elapsed, self.cache.hit_rate * 100,
+                  player_id=best_pick, name=self.describe(best_pick), total_points=best_points,
+                  replan_s=round(elapsed, 3), cache_hit_rate=self.cache.hit_rate, plan=list(self.plan))
+        if len(self.plan) > 1:
+            logger.info("Planned picks: %s", ', '.join(self.describe(player_id) for player_id in self.plan))
+
+    def describe(self, player_id):
+        player_index = self.player_table.index.get(str(player_id))
+        if player_index is None:
+            return f"player {player_id}"
+        return f"{self.player_table.full_name[player_index]} ({su.position_name(self.player_table, player_index)})"
+
+    def run(self, poll_interval=2.0, total_picks=None, max_polls=None, checkpoint=None):
+        """
+        Poll the draft until total_picks have been made, max_polls is reached or the user interrupts.
+
+        With `checkpoint` (a path), the room's snapshot is rewritten after every poll that applied picks.
+        """
+        polls = 0
+        try:
+            while max_polls is None or polls < max_polls:
+                if self.poll() and checkpoint:
+                    self.checkpoint(checkpoint)
+                polls += 1
+                if total_picks is not None and self.last_pick_no >= total_picks:
+                    break
+                time.sleep(poll_interval)
+        except KeyboardInterrupt:
+            logger.info("Draft room stopped.")
+        return self.recommendation
+
+
+def open_draft_room(league_id, my_team, player_table, draft_id=None, client=None, workers=1, lookahead=1,
+                    beam_width=20, per_position=None):
+    """
+    Load the league's rosters into the team globals and open a DraftRoom for its draft.
+
+    Returns:
+        tuple: (DraftRoom, league object, rosters), or (None, None, None) if the league could not be loaded.
+    """
+    league = su.get_league(league_id, client)
+    rosters = su.fetch_league_rosters(league_id, client)
+    if not league or not rosters:
+        logger.error("Could not load the league or its rosters.")
+        return None, None, None
+
+    su.update_teams_data(rosters)
+    room = DraftRoom(
+        player_table, my_team, draft_id or league['draft_id'], client, workers, lookahead, beam_width, per_position,
+        league_id
+    )
+    return room, league, rosters
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Follow a live Sleeper draft and keep the best pick up to date.")
+    parser.add_argument('--league', default=su.LEAGUE_ID, help="Sleeper league ID")
+    parser.add_argument('--team', help="My team (Team_<roster_id>); defaults to Team_10, or the snapshot's with --resume")
+    parser.add_argument('--draft', help="Draft ID (defaults to the league's draft)")
+    parser.add_argument('--interval', type=float, default=2.0, help="Seconds between polls")
+    parser.add_argument('--workers', type=int, default=1, help="Processes for candidate rollouts")
+    parser.add_argument('--lookahead', type=int, default=1, help="My picks to plan ahead with the beam search planner")
+    parser.add_argument('--beam', type=int, default=20, help="Beam width for --lookahead")
+    parser.add_argument('--per-position', type=int,
+                        help="Only simulate the best N candidates per position (prune dominated picks)")
+    parser.add_argument('--players-csv', help="Use a saved merged_data_output.csv instead of the full pipeline")
+    parser.add_argument('--record', help="Write the league, rosters and pick stream to this JSON file")
+    parser.add_argument('--replay', help="Replay a recording from --record through a local stub server")
+    parser.add_argument('--checkpoint', help="Rewrite a draft snapshot to this file after every new pick")
+    parser.add_argument('--resume', help="Start from a snapshot written by --checkpoint instead of running the pipeline; "
+                                         "picks made since are applied on the first poll")
+    parser.add_argument('--log-level', default='INFO', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                        help="DEBUG adds every candidate's simulated total")
+    parser.add_argument('--events', help="Also write picks and recommendations as JSON lines to this file ('-' for stdout)")
+    args = parser.parse_args()
+    if args.resume and args.record:
+        parser.error("--record needs the league's rosters from before the draft, so it cannot be used with --resume")
+
+    configure_logging(args.log_level, args.events)
+    options = {'workers': args.workers, 'lookahead': args.lookahead, 'beam_width': args.beam,
+               'per_position': args.per_position}
+
+    snapshot = None
+    if args.resume:
+        started = time.perf_counter()
+        snapshot = load_snapshot(args.resume)
+        log_event(logger, logging.INFO, 'resume', "Resumed %s after pick %s (%d players, %d teams) in %.1f ms",
+                  args.resume, snapshot.last_pick_no, len(snapshot.player_table.player_id), len(snapshot.teams),
+                  (time.perf_counter() - started) * 1000, path=args.resume, pick_no=snapshot.last_pick_no)
+        player_table = snapshot.player_table
+    else:
+        player_table = su.load_player_table(args.players_csv)
+    my_team = args.team or (snapshot.my_team if snapshot is not None else None) or DEFAULT_TEAM
+
+    if args.replay:
+        with open(args.replay) as f:
+            recording = json.load(f)
+        league_id = recording['league_id']
+        draft_id = recording['draft_id']
+        with SleeperStubServer({
+            f"/v1/league/{league_id}": recording['league'],
+            f"/v1/league/{league_id}/rosters": recording['rosters'],
+        }) as server:
+            server.replay_picks(draft_id, recording['picks'])
+            client = SleeperClient(server.base_url)
+            if snapshot is not None:
+                room = DraftRoom.from_snapshot(snapshot, my_team, client, **options)
+            else:
+                room, _, _ = open_draft_room(league_id, my_team, player_table, draft_id, client, **options)
+            if room:
+                with room:
+                    if args.checkpoint:
+                        room.checkpoint(args.checkpoint)
+                    room.run(poll_interval=args.interval, total_picks=len(recording['picks']), checkpoint=args.checkpoint)
+        return
+
+    if snapshot is not None:
+        room = DraftRoom.from_snapshot(snapshot, my_team, **options)
+        room.draft_id = args.draft or room.draft_id
+    else:
+        room, league, rosters = open_draft_room(args.league, my_team, player_table, args.draft, **options)
+        if room is None:
+            return
+    with room:
+        if args.checkpoint:
+            room.checkpoint(args.checkpoint)
+        room.run(poll_interval=args.interval, checkpoint=args.checkpoint)
+
+    if args.record:
+        with open(args.record, 'w') as f:
+            json.dump({
+                'league_id': args.league,
+                'draft_id': room.draft_id,
+                'league': league,
+                'rosters': rosters,
+                'picks': room.picks_seen,
+            }, f)
+        print(f"Recorded {len(room.picks_seen)} picks to {args.record}")
+
+
+if __name__ == "__main__":
+    main()
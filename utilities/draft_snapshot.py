@@ -0,0 +1,259 @@
+import datetime
+import json
+import os
+import struct
+
+import numpy as np
+import pandas as pd
+
+import sleeperUtilities as su
+from draft_logging import get_logger
+
+logger = get_logger('snapshot')
+
+# Snapshot files start with the magic bytes, the format version and the length of a JSON header.
+# The header holds the draft details and a directory of arrays (dtype, shape and offset into the
+# data section that follows it). Bump the version whenever the layout or the arrays change.
+SNAPSHOT_MAGIC = b'FFPSNAP\x00'
+SNAPSHOT_FORMAT_VERSION = 2
+_PREAMBLE = struct.Struct('<8sII')
+
+# The data section and every array in it start on this boundary, so arrays map in place
+_ALIGNMENT = 64
+
+
+class DraftSnapshot:
+    """
+    A draft's complete state at one moment, as saved by save_snapshot.
+
+    Holds the player table with its valuations, every team's packed roster needs and drafted
+    Sleeper IDs (the TEAM_ROSTER_NEEDS and DRAFTED_PLAYERS of that league), the simulator state
+    derived from them (drafted player indices, availability mask and packed simulator needs)
+    and the picks applied so far. Picks made after the snapshot are replayed on top with
+    DraftRoom.from_snapshot(...).apply_picks.
+    """
+
+    def __init__(self, player_table, team_roster_needs, drafted_players, draft_results, available_players,
+                 simulation_needs, picks=(), last_pick_no=0, league_id=None, draft_id=None, my_team=None,
+                 created_at=None):
+        """
+        Args:
+            player_table (PlayerTable): The player table, with VORP for the league's size.
+            team_roster_needs (dict): Packed open roster slots per team, in draft order.
+            drafted_players (dict): Sleeper player IDs rostered per team.
+            draft_results (dict): Player indices drafted per team (initial_draft_state's first value).
+            available_players (ndarray): Boolean availability mask over the player table.
+            simulation_needs (dict): Packed open simulator slots per team.
+            picks (list): Sleeper pick dictionaries applied so far.
+            last_pick_no (int): The last applied pick number.
+            league_id (str): The Sleeper league ID.
+            draft_id (str): The Sleeper draft ID.
+            my_team (str): The team picks are recommended for.
+            created_at (str): ISO time the snapshot was taken; defaults to now.
+        """
+        self.player_table = player_table
+        self.team_roster_needs = team_roster_needs
+        self.drafted_players = drafted_players
+        self.draft_results = draft_results
+        self.available_players = available_players
+        self.simulation_needs = simulation_needs
+        self.picks = list(picks)
+        self.last_pick_no = last_pick_no
+        self.league_id = league_id
+        self.draft_id = draft_id
+        self.my_team = my_team
+        self.created_at = created_at or datetime.datetime.now().isoformat(timespec='seconds')
+
+    @property
+    def teams(self):
+        return list(self.team_roster_needs)
+
+    @classmethod
+    def capture(cls, player_table, team_roster_needs=None, drafted_players=None, **details):
+        """
+        Snapshot a league before (or between) drafts, deriving the simulator state with initial_draft_state.
+
+        Args:
+            player_table (PlayerTable): The player table.
+            team_roster_needs (dict): Packed needs per team; defaults to TEAM_ROSTER_NEEDS.
+            drafted_players (dict): Player IDs per team; defaults to DRAFTED_PLAYERS.
+            **details: league_id, draft_id, my_team, picks or last_pick_no.
+        """
+        team_roster_needs = dict(team_roster_needs if team_roster_needs is not None else su.TEAM_ROSTER_NEEDS)
+        drafted_players = drafted_players if drafted_players is not None else su.DRAFTED_PLAYERS
+        drafted_players = {team: [str(player_id) for player_id in drafted_players.get(team, [])] for team in team_roster_needs}
+        draft_results, available_players, simulation_needs = su.initial_draft_state(
+            player_table, team_roster_needs, drafted_players
+        )
+        return cls(player_table, team_roster_needs, drafted_players, draft_results, available_players,
+                   simulation_needs, **details)
+
+    def install(self):
+        """Make this snapshot's league the current one (TEAMS, TEAM_ROSTER_NEEDS and DRAFTED_PLAYERS)."""
+        su.TEAMS = self.teams
+        su.TEAM_ROSTER_NEEDS = dict(self.team_roster_needs)
+        su.DRAFTED_PLAYERS = {team: list(players) for team, players in self.drafted_players.items()}
+
+
+def _aligned(position):
+    return -(-position // _ALIGNMENT) * _ALIGNMENT
+
+
+def _string_column(values):
+    """A fixed-width string array of `values` plus a mask of the missing (None/NaN) ones, stored as ''."""
+    missing = pd.isna(np.asarray(values, dtype=object))
+    return np.array(['' if is_missing else value for value, is_missing in zip(values, missing)], dtype=str), missing
+
+
+def _object_column(values, missing):
+    """Undo _string_column: an object array with None where the value was missing."""
+    column = values.astype(object)
+    column[missing] = None
+    return column
+
+
+def _flatten(lists, dtype):
+    """Concatenate per-team lists into one array plus offsets (team i owns values[offsets[i]:offsets[i + 1]])."""
+    offsets = np.zeros(len(lists) + 1, dtype=np.int32)
+    offsets[1:] = np.cumsum([len(values) for values in lists])
+    return np.array([value for values in lists for value in values], dtype=dtype), offsets
+
+
+def _unflatten(values, offsets, teams):
+    values = values.tolist()
+    return {team: values[offsets[i]:offsets[i + 1]] for i, team in enumerate(teams)}
+
+
+def save_snapshot(snapshot, path):
+    """
+    Write a snapshot to a single versioned binary file.
+
+    The file is written to a temporary name and renamed, so a crash mid-write never leaves a
+    truncated snapshot behind (the previous one survives).
+
+    Args:
+        snapshot (DraftSnapshot): The state to save.
+        path (str): The snapshot file.
+
+    Returns:
+        int: The file size in bytes.
+    """
+    table = snapshot.player_table
+    teams = snapshot.teams
+    draft_results, draft_results_offsets = _flatten([snapshot.draft_results[team] for team in teams], np.int32)
+    drafted_ids, drafted_offsets = _flatten([snapshot.drafted_players.get(team, []) for team in teams], str)
+    # Strings are fixed-width UTF-32 ('U') columns, which map in place like the numbers; a mask
+    # per column tells missing values apart from empty strings (a free agent's team is '')
+    full_name, full_name_missing = _string_column(table.full_name.tolist())
+    team, team_missing = _string_column(table.team.tolist())
+    arrays = {
+        'player_id': np.array(table.player_id.tolist(), dtype=str),
+        'full_name': full_name,
+        'full_name_missing': full_name_missing,
+        'team': team,
+        'team_missing': team_missing,
+        'position': table.position,
+        'fpts': table.fpts,
+        'vorp': table.vorp,
+        'available_players': np.asarray(snapshot.available_players, dtype=bool),
+        'team_roster_needs': np.array([snapshot.team_roster_needs[team] for team in teams], dtype=np.uint64),
+        'simulation_needs': np.array([snapshot.simulation_needs[team] for team in teams], dtype=np.uint64),
+        'draft_results': draft_results,
+        'draft_results_offsets': draft_results_offsets,
+        'drafted_ids': drafted_ids,
+        'drafted_offsets': drafted_offsets,
+    }
+
+    directory = {}
+    position = 0
+    for name, array in arrays.items():
+        position = _aligned(position)
+        directory[name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': position}
+        position += array.nbytes
+    header = json.dumps({
+        'created_at': snapshot.created_at,
+        'league_id': snapshot.league_id,
+        'draft_id': snapshot.draft_id,
+        'my_team': snapshot.my_team,
+        'teams': teams,
+        'last_pick_no': snapshot.last_pick_no,
+        'picks': snapshot.picks,
+        'arrays': directory,
+    }).encode()
+    data_start = _aligned(_PREAMBLE.size + len(header))
+
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(_PREAMBLE.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION, len(header)))
+        f.write(header)
+        for name, array in arrays.items():
+            f.write(b'\0' * (data_start + directory[name]['offset'] - f.tell()))
+            f.write(np.ascontiguousarray(array).tobytes())
+        size = f.tell()
+    os.replace(temp_path, path)
+    return size
+
+
+def load_snapshot(path):
+    """
+    Restore a snapshot written by save_snapshot.
+
+    The position, FPTS and VORP columns are read-only views of a memory map of the file, so
+    restoring does not read or copy them; only the string columns, the player index and the
+    small per-team state are built in memory.
+
+    Args:
+        path (str): The snapshot file.
+
+    Returns:
+        DraftSnapshot: The restored state.
+
+    Raises:
+        ValueError: If the file is not a snapshot or was written in another format version.
+    """
+    with open(path, 'rb') as f:
+        preamble = f.read(_PREAMBLE.size)
+        if len(preamble) < _PREAMBLE.size or preamble[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+            raise ValueError(f"{path} is not a draft snapshot")
+        _, version, header_length = _PREAMBLE.unpack(preamble)
+        if version != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(f"{path} is snapshot format version {version}; this version reads {SNAPSHOT_FORMAT_VERSION}")
+        header = json.loads(f.read(header_length))
+
+    data = np.memmap(path, dtype=np.uint8, mode='r', offset=_aligned(_PREAMBLE.size + header_length))
+    arrays = {}
+    for name, entry in header['arrays'].items():
+        dtype = np.dtype(entry['dtype'])
+        count = int(np.prod(entry['shape']))
+        arrays[name] = data[entry['offset']:entry['offset'] + count * dtype.itemsize].view(dtype).reshape(entry['shape'])
+
+    columns = {
+        'player_id': arrays['player_id'].astype(object),
+        'full_name': _object_column(arrays['full_name'], arrays['full_name_missing']),
+        'team': _object_column(arrays['team'], arrays['team_missing']),
+        'position': arrays['position'],
+        'fpts': arrays['fpts'],
+        'vorp': arrays['vorp'],
+    }
+    for column in columns.values():
+        column.setflags(write=False)
+    player_table = su.PlayerTable(
+        index={player_id: i for i, player_id in enumerate(columns['player_id'])}, **columns
+    )
+
+    teams = header['teams']
+    return DraftSnapshot(
+        player_table,
+        team_roster_needs=dict(zip(teams, arrays['team_roster_needs'].tolist())),
+        drafted_players=_unflatten(arrays['drafted_ids'], arrays['drafted_offsets'], teams),
+        draft_results=_unflatten(arrays['draft_results'], arrays['draft_results_offsets'], teams),
+        # The availability mask changes with every pick, so it gets a private copy
+        available_players=np.array(arrays['available_players']),
+        simulation_needs=dict(zip(teams, arrays['simulation_needs'].tolist())),
+        picks=header['picks'],
+        last_pick_no=header['last_pick_no'],
+        league_id=header['league_id'],
+        draft_id=header['draft_id'],
+        my_team=header['my_team'],
+        created_at=header['created_at'],
+    )
@@ -0,0 +1,145 @@
+import contextlib
+import cProfile
+import io
+import os
+import platform
+import pstats
+import time
+import tracemalloc
+from collections import Counter
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# Simulator internals counted across a run: rollouts, picks_evaluated, picks_simulated,
+# player_lookups, cache_lookups and cache_hits. Only work done in this process is counted;
+# rollouts run in worker processes (workers > 1) are not.
+COUNTERS = Counter()
+
+# Rows of the profiler's cumulative-time and allocation listings in a report
+PROFILE_TOP_FUNCTIONS = 40
+PROFILE_TOP_ALLOCATIONS = 20
+
+
+def count(name, amount=1):
+    COUNTERS[name] += amount
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None where it cannot be read."""
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if platform.system() == 'Darwin' else 1024), 1)
+
+
+def current_rss_mb():
+    """Current resident set size in MB from /proc (Linux), falling back to the peak elsewhere."""
+    try:
+        with open('/proc/self/statm') as f:
+            resident_pages = int(f.read().split()[1])
+        return round(resident_pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024), 1)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return peak_rss_mb()
+
+
+class StageRecorder:
+    """
+    Record wall time, CPU time, memory delta and simulator counters for each step of a run.
+
+    Usage:
+        stages = StageRecorder()
+        with stages.stage('Load Excel'):
+            ...
+        print(stages.report())
+
+    Memory is the change in resident set size over the stage; while tracemalloc is tracing
+    (under --profile) the change and peak of Python allocations are recorded as well.
+    """
+
+    def __init__(self):
+        self.stages = []
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        counters_before = COUNTERS.copy()
+        rss_before = current_rss_mb()
+        traced_before = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+        if traced_before is not None:
+            tracemalloc.reset_peak()
+        wall_started = time.perf_counter()
+        cpu_started = time.process_time()
+        try:
+            yield
+        finally:
+            row = {
+                'stage': name,
+                'wall_s': round(time.perf_counter() - wall_started, 4),
+                'cpu_s': round(time.process_time() - cpu_started, 4),
+                'memory_delta_mb': _delta(rss_before, current_rss_mb()),
+                'counters': dict(COUNTERS - counters_before),
+            }
+            if traced_before is not None:
+                traced, traced_peak = tracemalloc.get_traced_memory()
+                row['traced_delta_mb'] = round((traced - traced_before) / (1024 * 1024), 2)
+                row['traced_peak_mb'] = round(traced_peak / (1024 * 1024), 2)
+            self.stages.append(row)
+
+    def report(self):
+        """Return the recorded stages as a text table, with a total row."""
+        lines = [f"{'Stage':<32} {'wall s':>9} {'cpu s':>9} {'mem MB':>8}  counters"]
+        for row in self.stages:
+            memory = '' if row['memory_delta_mb'] is None else f"{row['memory_delta_mb']:+.1f}"
+            counters = ', '.join(f"{name}={value}" for name, value in sorted(row['counters'].items()))
+            lines.append(f"{row['stage']:<32} {row['wall_s']:>9.3f} {row['cpu_s']:>9.3f} {memory:>8}  {counters}")
+        lines.append(f"{'Total':<32} {sum(row['wall_s'] for row in self.stages):>9.3f} "
+                     f"{sum(row['cpu_s'] for row in self.stages):>9.3f}")
+        return '\n'.join(lines)
+
+
+def _delta(before, after):
+    if before is None or after is None:
+        return None
+    return round(after - before, 1)
+
+
+@contextlib.contextmanager
+def profiled(report_path, stages=None):
+    """
+    Run the enclosed block under cProfile and tracemalloc and write a text report to report_path.
+
+    The report holds the stage table (if a StageRecorder is given), the simulator counters,
+    the functions with the most cumulative time and the source lines that allocated the
+    most memory still held at the end.
+    """
+    profiler = cProfile.Profile()
+    tracemalloc.start()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        _, traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        out = io.StringIO()
+        if stages is not None:
+            out.write("STAGES\n" + stages.report() + "\n\n")
+        out.write("COUNTERS\n")
+        for name, value in sorted(COUNTERS.items()):
+            out.write(f"{name:<20} {value}\n")
+        out.write(f"\nPEAK TRACED MEMORY: {traced_peak / (1024 * 1024):.1f} MB\n")
+
+        out.write(f"\nTOP {PROFILE_TOP_FUNCTIONS} FUNCTIONS BY CUMULATIVE TIME\n")
+        pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(PROFILE_TOP_FUNCTIONS)
+
+        out.write(f"TOP {PROFILE_TOP_ALLOCATIONS} ALLOCATION SITES\n")
+        for stat in snapshot.statistics('lineno')[:PROFILE_TOP_ALLOCATIONS]:
+            out.write(f"{stat}\n")
+
+        with open(report_path, 'w') as f:
+            f.write(out.getvalue())
@@ -0,0 +1,98 @@
+import codecs
+import json
+
+_WHITESPACE = ' \t\n\r'
+_VALUE_TERMINATORS = _WHITESPACE + ',:}]'
+
+
+class _ChunkBuffer:
+    """Text buffer over an iterable of byte chunks, refilled on demand and trimmed as it is consumed."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self.text = ''
+        self.pos = 0
+        self.exhausted = False
+
+    def fill(self):
+        """Append the next chunk; returns False once the input is exhausted."""
+        if self.exhausted:
+            return False
+        for chunk in self._chunks:
+            if not chunk:
+                continue
+            if self.pos > (1 << 16) and self.pos * 2 > len(self.text):
+                self.text = self.text[self.pos:]
+                self.pos = 0
+            self.text += self._decoder.decode(chunk)
+            return True
+        self.text += self._decoder.decode(b'', final=True)
+        self.exhausted = True
+        return False
+
+    def next_char(self):
+        """Skip whitespace and return the next character without consuming it ('' at end of input)."""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ''
+
+
+def iter_object_items(chunks, decoder=None):
+    """
+    Incrementally decode a JSON object whose text arrives as byte chunks, yielding its
+    top-level (key, value) pairs one at a time.
+
+    Only the undecoded tail of the input and the current value are held in memory, so a large
+    payload such as Sleeper's players dump never exists as one string or one dict.
+
+    Args:
+        chunks (iterable): Byte chunks, e.g. response.iter_content(chunk_size=1 << 16).
+        decoder (json.JSONDecoder): Decoder for the values; defaults to json's.
+
+    Yields:
+        tuple: (key, decoded value) for each member of the top-level object.
+    """
+    decoder = decoder or json.JSONDecoder()
+    buffer = _ChunkBuffer(chunks)
+
+    if buffer.next_char() != '{':
+        raise ValueError("Expected a JSON object")
+    buffer.pos += 1
+
+    while True:
+        char = buffer.next_char()
+        if char == '}':
+            return
+        if char == ',':
+            buffer.pos += 1
+            buffer.next_char()
+        elif char == '':
+            raise ValueError("Unexpected end of JSON object")
+
+        key = _decode_value(buffer, decoder)
+        if buffer.next_char() != ':':
+            raise ValueError(f"Expected ':' after key {key!r}")
+        buffer.pos += 1
+        buffer.next_char()
+        yield key, _decode_value(buffer, decoder)
+
+
+def _decode_value(buffer, decoder):
+    while True:
+        try:
+            value, end = decoder.raw_decode(buffer.text, buffer.pos)
+        except json.JSONDecodeError:
+            if not buffer.fill():
+                raise
+            continue
+        # A number cut off by a chunk boundary ('-15' of '-1500.0') still decodes, so only accept
+        # a value once the character after it is visible and ends it
+        if (end == len(buffer.text) or buffer.text[end] not in _VALUE_TERMINATORS) and buffer.fill():
+            continue
+        buffer.pos = end
+        return value
@@ -0,0 +1,185 @@
+import argparse
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+import sleeperUtilities as su
+from draft_logging import configure_logging, get_logger
+from sleeper_client import default_client
+
+logger = get_logger('batch')
+
+
+class LeagueState:
+    """
+    One league's draft state: the per-league counterpart of the TEAMS, TEAM_ROSTER_NEEDS and
+    DRAFTED_PLAYERS globals, so many leagues can be evaluated in one process.
+    """
+
+    def __init__(self, league_id, rosters, my_team, name=None):
+        """
+        Args:
+            league_id (str): The Sleeper league ID.
+            rosters (list): The league's roster dictionaries.
+            my_team (str): The team to pick for (Team_<roster_id>).
+            name (str): The league's display name.
+        """
+        self.league_id = league_id
+        self.name = name or league_id
+        self.my_team = my_team
+        self.teams, self.team_roster_needs, self.drafted_players = su.teams_data(rosters)
+
+    @property
+    def league_size(self):
+        return len(self.teams)
+
+    @classmethod
+    def for_user(cls, league, rosters, user_id):
+        """Build the state for `user_id`'s team in a league, or return None if they own no roster in it."""
+        my_roster = next((roster for roster in rosters if roster.get('owner_id') == user_id), None)
+        if my_roster is None:
+            return None
+        return cls(league['league_id'], rosters, f"Team_{my_roster['roster_id']}", league.get('name'))
+
+
+_BATCH_CONTEXT = {}
+
+def _init_batch_worker(player_table):
+    _BATCH_CONTEXT['player_table'] = player_table
+
+def _evaluate_league_in_worker(task):
+    return evaluate_league(_BATCH_CONTEXT['player_table'], *task)
+
+def evaluate_league(player_table, state, baseline_players):
+    """
+    Find the best next pick for one league.
+
+    Args:
+        player_table (PlayerTable): The shared table built by build_player_table.
+        state (LeagueState): The league to evaluate.
+        baseline_players (dict): Position -> baseline FPTS for the league's size.
+
+    Returns:
+        dict: One result row (league, my team, best pick, projected points, seconds).
+    """
+    started = time.perf_counter()
+    league_table = su.with_baselines(player_table, baseline_players)
+    best_pick, best_points = su.simulate_draft_for_my_team(
+        league_table, state.team_roster_needs, state.my_team, drafted_players=state.drafted_players
+    )
+    return {
+        'league_id': state.league_id,
+        'league_name': state.name,
+        'teams': state.league_size,
+        'my_team': state.my_team,
+        'best_pick': best_pick,
+        'best_pick_name': player_table.full_name[player_table.index[best_pick]] if best_pick is not None else None,
+        'projected_points': best_points,
+        'seconds': round(time.perf_counter() - started, 3),
+    }
+
+
+def load_league_states(user_id, season, league_ids=None, client=None):
+    """
+    Fetch the user's leagues and every league's rosters concurrently and build their states.
+
+    Args:
+        user_id (str): The Sleeper user whose team is evaluated in each league.
+        season (str): The season to list leagues for.
+        league_ids (list): Only these leagues; defaults to all of the user's leagues.
+        client (SleeperClient): API client; defaults to the shared client.
+
+    Returns:
+        list: A LeagueState per league in which the user owns a roster.
+    """
+    client = client or default_client()
+    leagues = su.get_all_leagues_for_user(user_id, season=season, client=client)
+    if league_ids:
+        wanted = set(league_ids)
+        leagues = [league for league in leagues if league['league_id'] in wanted]
+    all_rosters = client.gather(*[(su.fetch_league_rosters, league['league_id'], client) for league in leagues])
+
+    states = []
+    for league, rosters in zip(leagues, all_rosters):
+        state = LeagueState.for_user(league, rosters, user_id) if rosters else None
+        if state is None:
+            logger.warning("Skipping league %s: no roster owned by user %s", league['league_id'], user_id)
+            continue
+        states.append(state)
+    return states
+
+
+def run_batch(player_table, merged_data, states, workers=1):
+    """
+    Evaluate the best next pick in every league against one shared player universe.
+
+    The projections and the players dump are loaded once by the caller; each league only
+    costs a baseline lookup, a VORP column and one simulate_draft_for_my_team call.
+    Baselines for every league size in the batch come from a single baseline_matrix pass.
+
+    Args:
+        player_table (PlayerTable): Table built from merged_data (its VORP column is replaced per league).
+        merged_data (DataFrame): The merged projections, for the baselines.
+        states (list): LeagueState per league.
+        workers (int): Processes evaluating leagues concurrently; 1 runs them in-process.
+
+    Returns:
+        DataFrame: One row per league, in the order of `states`.
+    """
+    league_sizes = sorted({state.league_size for state in states})
+    if not league_sizes:
+        return pd.DataFrame()
+    baselines = su.baseline_matrix(merged_data, league_sizes, {'default': su.POSITIONS})
+    baselines_by_size = {
+        size: {position: float(points) for position, points in baselines.loc[(size, 'default')].items()}
+        for size in league_sizes
+    }
+    tasks = [(state, baselines_by_size[state.league_size]) for state in states]
+
+    if workers > 1:
+        # Ship the player table to each worker once; tasks are just the league states
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker, initargs=(player_table,)) as executor:
+            results = list(executor.map(_evaluate_league_in_worker, tasks))
+    else:
+        results = [evaluate_league(player_table, *task) for task in tasks]
+    return pd.DataFrame(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recommend the next pick in every league of a Sleeper user.")
+    parser.add_argument('--user', default=su.MY_USER_ID, help="Sleeper user ID")
+    parser.add_argument('--season', default='2024', help="Season to list leagues for")
+    parser.add_argument('--leagues', nargs='+', help="Only these league IDs")
+    parser.add_argument('--workers', type=int, default=1, help="Processes evaluating leagues concurrently")
+    parser.add_argument('--players-csv', help="Use a saved merged_data_output.csv instead of the full pipeline")
+    parser.add_argument('--output', default='batch_results.csv', help="Results CSV file")
+    args = parser.parse_args()
+
+    configure_logging(logging.WARNING)
+    started = time.perf_counter()
+    client = default_client()
+    # The projections and the players dump are loaded once for all leagues; the players
+    # download overlaps with the league requests
+    if not args.players_csv:
+        players_request = client.submit(su.fetch_data_from_sleeper, client=client)
+    states = load_league_states(args.user, args.season, args.leagues, client)
+
+    if args.players_csv:
+        merged_data = pd.read_csv(args.players_csv, dtype={'player_id': str})
+    else:
+        merged_data = su.merge_data(su.load_and_process_excel(su.excel_file_path), players_request.result())
+    player_table = su.build_player_table(merged_data)
+
+    results = run_batch(player_table, merged_data, states, args.workers)
+    if results.empty:
+        print("No leagues to evaluate.")
+        return
+    results.to_csv(args.output, index=False)
+    print(results[['league_name', 'teams', 'my_team', 'best_pick_name', 'projected_points', 'seconds']].to_string(index=False))
+    print(f"{len(results)} leagues evaluated in {time.perf_counter() - started:.2f}s; results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+import numpy as np
+import pandas as pd
+
+import sleeperUtilities as su
+from draft_logging import get_logger
+from instrumentation import count
+
+logger = get_logger('monte_carlo')
+
+# Relative standard deviation of a player's season FPTS around the CBS projection
+POSITION_FPTS_STDDEV = {'QB': 0.15, 'RB': 0.25, 'WR': 0.22, 'TE': 0.25, 'K': 0.20, 'DEF': 0.25}
+
+# Relative standard deviation (as a fraction of FPTS) of how differently opponents value a player
+POSITION_PREFERENCE_STDDEV = {'QB': 0.08, 'RB': 0.10, 'WR': 0.10, 'TE': 0.10, 'K': 0.15, 'DEF': 0.15}
+
+
+def _position_stddev(player_table, players, stddev_by_position):
+    codes = player_table.position[players]
+    lookup = np.array([stddev_by_position.get(position, 0.0) for position in su.SIM_POSITIONS] + [0.0])
+    return lookup[codes]
+
+
+def _rollout(orders, ranks, positions, available, needs, my_slot, first_pick, cache=None, cache_prefix=None,
+             state_hash=0, pool_keys=None):
+    """
+    Play one greedy draft on preallocated state and return my team's picks (pool indices).
+
+    `orders` holds each position's pool indices sorted by this simulation's draft preference
+    and `ranks` the overall preference rank of every pool index (lower is better).
+
+    `available` (bytearray) and `needs` (packed needs per team, in draft order) are modified in place.
+    The draft stops as soon as my roster is full, since later picks cannot change my points.
+
+    With a cache, my picks from each round start onward are cached under (cache_prefix, Zobrist
+    hash of the drafted players, needs), and a hit returns them without finishing the draft
+    (leaving `available` and `needs` part-way). `state_hash` is the hash after first_pick and
+    `pool_keys` the Zobrist key of every pool index.
+    """
+    eligible_codes = su._eligible_codes
+    consume_roster_slot = su._consume_roster_slot
+    cursors = [0] * len(orders)
+    my_picks = [first_pick]
+    available[first_pick] = 0
+    needs[my_slot] = consume_roster_slot(needs[my_slot], positions[first_pick])
+
+    round_starts = []
+    while needs[my_slot]:
+        if cache is not None:
+            state = (cache_prefix, state_hash, tuple(needs))
+            cached = cache.get(state)
+            if cached is not None:
+                my_picks.extend(cached)
+                break
+            round_starts.append((state, len(my_picks)))
+
+        for team, team_needs in enumerate(needs):
+            if not team_needs:
+                continue
+
+            best_pick = -1
+            for code in eligible_codes(team_needs):
+                order = orders[code]
+                cursor = cursors[code]
+                while cursor < len(order) and not available[order[cursor]]:
+                    cursor += 1
+                cursors[code] = cursor
+                if cursor < len(order) and (best_pick < 0 or ranks[order[cursor]] < ranks[best_pick]):
+                    best_pick = order[cursor]
+
+            if best_pick < 0:
+                needs[team] = 0
+                continue
+
+            available[best_pick] = 0
+            needs[team] = consume_roster_slot(team_needs, positions[best_pick])
+            if cache is not None:
+                state_hash ^= pool_keys[best_pick]
+            if team == my_slot:
+                my_picks.append(best_pick)
+            if not needs[my_slot]:
+                break
+
+    for state, start in round_starts:
+        cache.put(state, tuple(my_picks[start:]))
+    return my_picks
+
+
+def simulate_draft_monte_carlo(player_table, team_needs, my_team, n_simulations=1000, candidates=None, seed=0,
+                               fpts_stddev=POSITION_FPTS_STDDEV, preference_stddev=POSITION_PREFERENCE_STDDEV,
+                               percentiles=(10, 50, 90), cache=None, drafted_players=None):
+    """
+    Evaluate candidate picks for my team over many noisy simulated drafts.
+
+    Every simulation perturbs each player's season FPTS (the outcome we score) and the VORP
+    every team drafts by (opponent preferences), with per-position standard deviations.
+    All draws are made up front; every candidate is played against the same simulated
+    seasons, so candidates are compared on common random numbers.
+
+    Args:
+        player_table (PlayerTable): The table built by build_player_table.
+        team_needs (dict): Packed open roster slots per team (TEAM_ROSTER_NEEDS).
+        my_team (str): The team to pick for.
+        n_simulations (int): Number of simulated drafts per candidate.
+        candidates (list): Player indices to evaluate; defaults to find_potential_picks.
+        seed (int): Seed for the noise draws.
+        fpts_stddev (dict): Relative FPTS standard deviation per position.
+        preference_stddev (dict): Relative draft-preference standard deviation per position.
+        percentiles (tuple): Percentiles of total points to report.
+        cache (TranspositionCache): Cache of my picks from repeated draft states, shared by the
+            candidates (which replay the same simulated drafts). Off by default: rollouts stop
+            once my roster is full, so candidates' drafts rarely converge early enough to pay
+            for the lookups.
+        drafted_players (dict): Player IDs rostered per team, for another league than the globals'.
+
+    Returns:
+        DataFrame: One row per candidate with mean total points, the requested percentiles
+        and win_probability (share of simulations in which the candidate scored best),
+        sorted by mean.
+    """
+    draft_results, available_players, total_roster_needs = su.initial_draft_state(
+        player_table, team_needs, drafted_players
+    )
+    if candidates is None:
+        candidates = list(su.find_potential_picks(player_table, available_players, team_needs[my_team]))
+    if not candidates:
+        logger.info("No valid picks available for %s based on current needs.", my_team)
+        return pd.DataFrame()
+
+    # Simulate over the draftable pool only, addressed by pool position
+    pool = np.flatnonzero(
+        available_players
+        & np.isfinite(player_table.vorp)
+        & (player_table.position < su.UNKNOWN_POSITION_CODE)
+    )
+    pool_slot = {int(player_index): slot for slot, player_index in enumerate(pool)}
+    my_roster = np.array(draft_results[my_team], dtype=np.intp)
+
+    rng = np.random.default_rng(seed)
+    players = np.concatenate([pool, my_roster])
+    fpts = np.nan_to_num(player_table.fpts[players])
+    outcome_noise = rng.standard_normal((n_simulations, len(players)))
+    preference_noise = rng.standard_normal((n_simulations, len(pool)))
+
+    outcomes = np.maximum(fpts * (1.0 + _position_stddev(player_table, players, fpts_stddev) * outcome_noise), 0.0)
+    preferences = player_table.vorp[pool] + fpts[:len(pool)] * _position_stddev(player_table, pool, preference_stddev) * preference_noise
+    rostered_points = outcomes[:, len(pool):].sum(axis=1)
+
+    # Rank the whole pool once per simulation (ties to the lower index), then split by position
+    order = np.argsort(-preferences, axis=1, kind='stable')
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(len(pool)), axis=1)
+    pool_positions = player_table.position[pool]
+    orders_by_position = [
+        order[pool_positions[order] == code].reshape(n_simulations, -1).tolist()
+        for code in range(len(su.SIM_POSITIONS))
+    ]
+    orders_by_simulation = [
+        [orders_by_position[code][simulation] for code in range(len(su.SIM_POSITIONS))]
+        for simulation in range(n_simulations)
+    ]
+    ranks_by_simulation = ranks.tolist()
+
+    teams = list(total_roster_needs)
+    my_slot = teams.index(my_team)
+    base_needs = [total_roster_needs[team] for team in teams]
+    base_available = b'\x01' * len(pool)
+    positions = pool_positions.tolist()
+
+    # Draft states repeat across candidates within a simulation; the prefix ties cached picks to
+    # this call's noise draws and starting state
+    pool_keys, base_hash, noise_key = None, 0, None
+    if cache is not None:
+        cache.bind(player_table)
+        pool_keys = [cache.keys[player_index] for player_index in pool]
+        base_hash = cache.state_hash(available_players)
+        noise_key = (seed, n_simulations, tuple(teams), base_hash,
+                     tuple(sorted(preference_stddev.items())), tuple(sorted(fpts_stddev.items())))
+
+    # Preallocated rollout state, reset in place for every simulation. Simulations are the
+    # outer loop so each one's cached states are still recent when the next candidate needs them.
+    available = bytearray(base_available)
+    needs = list(base_needs)
+    totals = np.empty((len(candidates), n_simulations))
+    first_picks = [pool_slot[int(candidate)] for candidate in candidates]
+    for simulation in range(n_simulations):
+        cache_prefix = noise_key + (simulation,) if cache is not None else None
+        for row, first_pick in enumerate(first_picks):
+            available[:] = base_available
+            needs[:] = base_needs
+            my_picks = _rollout(
+                orders_by_simulation[simulation], ranks_by_simulation[simulation], positions,
+                available, needs, my_slot, first_pick,
+                cache, cache_prefix, base_hash ^ pool_keys[first_pick] if cache is not None else 0, pool_keys
+            )
+            totals[row, simulation] = outcomes[simulation, my_picks].sum()
+    totals += rostered_points
+    count('picks_evaluated', len(candidates))
+    count('rollouts', len(candidates) * n_simulations)
+
+    # Split wins evenly between candidates that tie for the best total in a simulation
+    winners = totals == totals.max(axis=0)
+    win_probability = (winners / winners.sum(axis=0)).mean(axis=1)
+
+    candidates = np.asarray(candidates, dtype=np.intp)
+    summary = pd.DataFrame({
+        'player_id': player_table.player_id[candidates],
+        'full_name': player_table.full_name[candidates],
+        'position': [su.position_name(player_table, i) for i in candidates],
+        'mean': totals.mean(axis=1),
+    })
+    for percentile, values in zip(percentiles, np.percentile(totals, percentiles, axis=1)):
+        summary[f'p{percentile}'] = values
+    summary['win_probability'] = win_probability
+
+    return summary.sort_values('mean', ascending=False, kind='stable').reset_index(drop=True)
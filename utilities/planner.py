@@ -0,0 +1,195 @@
+import argparse
+import logging
+import time
+
+import numpy as np
+
+import sleeperUtilities as su
+from draft_logging import configure_logging, get_logger, log_event
+from transposition import TranspositionCache
+
+logger = get_logger('planner')
+
+# Candidates kept per position at every decision (highest VORP first)
+DEFAULT_PER_POSITION = 3
+
+
+def _top_candidates(queues, codes, per_position):
+    """Return the `per_position` best available players with a non-negative VORP at each position code."""
+    candidates = []
+    for code in codes:
+        order = queues.orders[code]
+        kept = 0
+        for player_index in order[queues.cursors[code]:]:
+            if kept == per_position or queues.vorp[player_index] < 0:
+                break
+            if queues.available_players[player_index]:
+                candidates.append(player_index)
+                kept += 1
+    return candidates
+
+
+def _copy_state(state):
+    draft_results, available_players, team_needs, queues = state
+    available_players = available_players.copy()
+    return (
+        {team: picks.copy() for team, picks in draft_results.items()},
+        available_players,
+        dict(team_needs),
+        queues.copy(available_players),
+    )
+
+
+def _draft(state, team, player_index):
+    draft_results, _, team_needs, queues = state
+    queues.take(player_index)
+    draft_results[team].append(player_index)
+    team_needs[team] = su._consume_roster_slot(team_needs[team], queues.positions[player_index])
+
+
+def _play_turns(state, teams, position, stop_team=None):
+    """
+    Play greedy picks in draft order from slot `position` of the current round.
+
+    With stop_team, play until that team is on the clock and return its slot (None if it has
+    no open slots left). Without it, play to the end of the current round.
+    """
+    _, _, team_needs, queues = state
+    while any(team_needs.values()):
+        for slot in range(position, len(teams)):
+            team = teams[slot]
+            needs = team_needs[team]
+            if not needs:
+                continue
+            if team == stop_team:
+                return slot
+            best_pick = queues.best(su._eligible_codes(needs))
+            if best_pick is None:
+                team_needs[team] = 0
+                continue
+            _draft(state, team, best_pick)
+        if stop_team is None or not team_needs[stop_team]:
+            return None
+        position = 0
+    return None
+
+
+def _leaf_value(player_table, state, teams, position, my_team, cache):
+    """Finish the draft greedily from slot `position` with simulate_remaining_draft and score my roster."""
+    state = _copy_state(state)
+    _play_turns(state, teams, position)
+    draft_results, available_players, team_needs, queues = state
+    su.simulate_remaining_draft(player_table, team_needs, draft_results, available_players, queues=queues, cache=cache)
+    # Rostered players without a CBS projection count as zero points
+    return float(np.nansum(player_table.fpts[draft_results[my_team]]))
+
+
+def plan_picks(player_table, team_needs, my_team, lookahead=3, beam_width=20, per_position=DEFAULT_PER_POSITION,
+               state=None, cache=None, time_limit=None, drafted_players=None):
+    """
+    Plan my next `lookahead` picks with a beam search over my own choices.
+
+    Opponents draft with the greedy model of simulate_remaining_draft. At each of my turns the
+    candidates are my `per_position` best available players per eligible position (a lower-VORP
+    player at the same position is dominated by the ones kept). Every partial plan is scored by
+    finishing the draft greedily, and only the `beam_width` best plans are expanded further, so
+    the cost is about lookahead * beam_width * (6 * per_position) rollouts, most of them sharing
+    draft suffixes through the transposition cache.
+
+    With lookahead=1 this is simulate_draft_for_my_team restricted to the kept candidates.
+
+    Args:
+        player_table (PlayerTable): The table built by build_player_table.
+        team_needs (dict): Packed open roster slots per team (TEAM_ROSTER_NEEDS), for my first pick.
+        my_team (str): The team to plan for.
+        lookahead (int): Number of my picks to search over (k).
+        beam_width (int): Partial plans kept after each of my picks (b).
+        per_position (int): Candidates kept per position at each decision.
+        state (tuple): (draft_results, available_players, packed simulation needs, PositionQueues)
+            to plan from, e.g. a DraftRoom's; defaults to initial_draft_state for team_needs and
+            drafted_players. Not modified.
+        cache (TranspositionCache): Draft-suffix cache; a new one is used if omitted.
+        time_limit (float): Seconds after which no further depth is expanded; the best plan
+            found so far is returned.
+        drafted_players (dict): Sleeper player IDs rostered per team, for the default state;
+            defaults to DRAFTED_PLAYERS.
+
+    Returns:
+        tuple: (planned player_ids in pick order, projected total points), or ([], 0) when
+        there is nothing to pick.
+    """
+    started = time.perf_counter()
+    if state is None:
+        draft_results, available_players, simulation_needs = su.initial_draft_state(player_table, team_needs, drafted_players)
+        state = (draft_results, available_players, simulation_needs,
+                 su.PositionQueues.from_table(player_table, available_players))
+    cache = cache if cache is not None else TranspositionCache()
+    teams = list(state[2])
+    my_slot = teams.index(my_team)
+
+    # A beam entry is (projected points, plan as player indices, state before my next turn,
+    # slot to resume play from); my first pick comes before a fresh round, like the one-pick planner
+    beam = [(None, [], _copy_state(state), None)]
+    for depth in range(lookahead):
+        children = []
+        for value, plan, node_state, position in beam:
+            if depth == 0:
+                codes = [code for code in range(len(su.SIM_POSITIONS)) if su._fits_roster_needs(team_needs[my_team], code)]
+                next_position = 0
+            else:
+                if _play_turns(node_state, teams, position, stop_team=my_team) is None:
+                    children.append((value, plan, node_state, position))  # My roster is full
+                    continue
+                codes = su._eligible_codes(node_state[2][my_team])
+                next_position = my_slot + 1
+
+            for player_index in _top_candidates(node_state[3], codes, per_position):
+                child_state = _copy_state(node_state)
+                _draft(child_state, my_team, player_index)
+                child_value = _leaf_value(player_table, child_state, teams, next_position, my_team, cache)
+                children.append((child_value, plan + [player_index], child_state, next_position))
+
+        if not children:
+            break
+        # Best plans first; ties go to the plan found first, as in the one-pick planner
+        beam = sorted(children, key=lambda child: -child[0])[:beam_width]
+        if time_limit is not None and time.perf_counter() - started > time_limit:
+            log_event(logger, logging.INFO, 'plan_time_limit', "Planning stopped after %d of %d picks (time limit %ss)",
+                      depth + 1, lookahead, time_limit, depth=depth + 1, lookahead=lookahead, time_limit=time_limit)
+            break
+
+    best_value, best_plan, _, _ = beam[0]
+    if not best_plan:
+        return [], 0
+    return [player_table.player_id[player_index] for player_index in best_plan], best_value
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plan my next picks with a beam search over the draft simulator.")
+    parser.add_argument('--team', default='Team_10', help="My team (Team_<roster_id>)")
+    parser.add_argument('--teams', type=int, default=su.LEAGUE_SIZE, help="Number of teams in an empty draft")
+    parser.add_argument('--lookahead', type=int, default=3, help="My picks to search over (k)")
+    parser.add_argument('--beam', type=int, default=20, help="Partial plans kept per pick (b)")
+    parser.add_argument('--per-position', type=int, default=DEFAULT_PER_POSITION, help="Candidates per position")
+    parser.add_argument('--time-limit', type=float, help="Seconds before returning the best plan so far")
+    parser.add_argument('--players-csv', help="Use a saved merged_data_output.csv instead of the full pipeline")
+    args = parser.parse_args()
+
+    configure_logging()
+    player_table = su.load_player_table(args.players_csv)
+    su.update_teams_data([{'roster_id': roster_id, 'players': []} for roster_id in range(1, args.teams + 1)])
+
+    started = time.perf_counter()
+    plan, points = plan_picks(
+        player_table, su.TEAM_ROSTER_NEEDS, args.team, args.lookahead, args.beam, args.per_position,
+        time_limit=args.time_limit
+    )
+    elapsed = time.perf_counter() - started
+    for pick_number, player_id in enumerate(plan, start=1):
+        player_index = player_table.index[player_id]
+        print(f"Pick {pick_number}: {player_table.full_name[player_index]} ({su.position_name(player_table, player_index)})")
+    print(f"Projected total points: {points:.1f} (planned in {elapsed:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
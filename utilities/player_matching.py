@@ -0,0 +1,152 @@
+import re
+from collections import Counter, defaultdict
+
+# Name suffixes dropped before matching ("Kenneth Walker III" -> "kennethwalker")
+NAME_SUFFIXES = {'jr', 'sr', 'ii', 'iii', 'iv', 'v'}
+
+# Projection-source team abbreviations that differ from Sleeper's
+TEAM_ALIASES = {'JAC': 'JAX', 'WSH': 'WAS', 'LA': 'LAR', 'OAK': 'LV', 'SD': 'LAC', 'STL': 'LAR'}
+
+# Projection-source positions that Sleeper files under another position
+POSITION_ALIASES = {'FB': 'RB', 'DST': 'DEF', 'PK': 'K'}
+
+# Minimum fuzzy score to accept a candidate on the same team, and on a different team
+SAME_TEAM_THRESHOLD = 0.6
+OTHER_TEAM_THRESHOLD = 0.8
+
+
+def normalize_player_name(name):
+    """Lowercase a player name, drop suffixes like Jr./III and remove non-alphanumerics."""
+    if not isinstance(name, str):
+        return ''
+    tokens = [re.sub(r'[^a-z0-9]', '', token) for token in name.lower().split()]
+    return ''.join(token for token in tokens if token and token not in NAME_SUFFIXES)
+
+
+def normalize_team(team):
+    if not isinstance(team, str):
+        return ''
+    team = team.strip().upper()
+    return TEAM_ALIASES.get(team, team)
+
+
+def normalize_position(position):
+    if not isinstance(position, str):
+        return ''
+    position = position.strip().upper()
+    return POSITION_ALIASES.get(position, position)
+
+
+def trigrams(name):
+    padded = f"^{name}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class PlayerMatchIndex:
+    """
+    Index of one side of a player join (e.g. Sleeper players) for matching records from another.
+
+    Lookups go from cheapest to most expensive:
+      1. exact hash on (normalized name, position, team)
+      2. exact hash on (normalized name, position), for players who changed teams
+      3. trigram inverted index, blocked on position (and preferring the same team),
+         scored with the Dice coefficient of the two names' trigram sets
+
+    Candidates are only ever compared within a position block, so matching stays close to
+    linear in the number of records instead of comparing every pair of names.
+    """
+
+    def __init__(self, names, positions, teams):
+        """
+        Args:
+            names, positions, teams: Normalized keys for each indexed row, in row order.
+        """
+        self.names = list(names)
+        self.positions = list(positions)
+        self.teams = list(teams)
+        self.exact = defaultdict(list)
+        self.by_name_position = defaultdict(list)
+        self.postings = defaultdict(lambda: defaultdict(list))
+        self.gram_counts = []
+        for row, (name, position, team) in enumerate(zip(self.names, self.positions, self.teams)):
+            self.exact[(name, position, team)].append(row)
+            self.by_name_position[(name, position)].append(row)
+            grams = trigrams(name) if name else set()
+            self.gram_counts.append(len(grams))
+            for gram in grams:
+                self.postings[position][gram].append(row)
+
+    def match(self, name, position, team):
+        """
+        Find the indexed row for one record.
+
+        Returns:
+            tuple: (row or None, confidence in [0, 1], method) where method is one of
+            'exact', 'name_position', 'fuzzy', 'ambiguous' or 'unmatched'.
+        """
+        rows = self.exact.get((name, position, team), [])
+        if len(rows) == 1:
+            return rows[0], 1.0, 'exact'
+        if len(rows) > 1:
+            return None, 0.0, 'ambiguous'
+
+        rows = self.by_name_position.get((name, position), []) if name else []
+        if len(rows) == 1:
+            return rows[0], 0.95, 'name_position'
+        if len(rows) > 1:
+            return None, 0.0, 'ambiguous'
+
+        return self._fuzzy(name, position, team)
+
+    def _fuzzy(self, name, position, team):
+        if not name:
+            return None, 0.0, 'unmatched'
+        grams = trigrams(name)
+        postings = self.postings.get(position, {})
+        shared = Counter()
+        for gram in grams:
+            shared.update(postings.get(gram, ()))
+
+        best = (None, 0.0)
+        for row, overlap in shared.items():
+            score = 2.0 * overlap / (len(grams) + self.gram_counts[row])
+            threshold = SAME_TEAM_THRESHOLD if self.teams[row] == team else OTHER_TEAM_THRESHOLD
+            if score < threshold:
+                continue
+            if self.teams[row] != team:
+                score *= 0.9  # Same-team candidates win close calls
+            if score > best[1] or (score == best[1] and best[0] is not None and row < best[0]):
+                best = (row, score)
+
+        if best[0] is None:
+            return None, 0.0, 'unmatched'
+        return best[0], round(best[1], 3), 'fuzzy'
+
+
+def match_players(left_keys, index):
+    """
+    Match every left record to at most one indexed row, and every indexed row to at most one record.
+
+    When several records claim the same indexed row, the most confident one keeps it (the earlier
+    record on ties) and the others are reported as 'duplicate'.
+
+    Args:
+        left_keys (iterable): (normalized name, position, team) per left record.
+        index (PlayerMatchIndex): The index over the right side.
+
+    Returns:
+        list: (right row or None, confidence, method) per left record.
+    """
+    results = [index.match(*keys) for keys in left_keys]
+    owner = {}
+    for left_row, (right_row, confidence, _) in enumerate(results):
+        if right_row is None:
+            continue
+        current = owner.get(right_row)
+        if current is None or confidence > results[current][1]:
+            owner[right_row] = left_row
+
+    for left_row, (right_row, _, _) in enumerate(results):
+        if right_row is not None and owner[right_row] != left_row:
+            results[left_row] = (None, 0.0, 'duplicate')
+    return results
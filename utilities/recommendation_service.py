@@ -0,0 +1,355 @@
+import argparse
+import datetime
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+import sleeperUtilities as su
+from draft_logging import configure_logging, get_logger, log_event
+from player_matching import normalize_player_name
+from sleeper_client import default_client
+
+logger = get_logger('service')
+
+DEFAULT_PORT = 8765
+DEFAULT_REFRESH_MINUTES = 60
+
+# League sizes whose baselines are computed with every snapshot; other sizes are computed per request
+SNAPSHOT_LEAGUE_SIZES = range(8, 17)
+
+# Most players returned by a name lookup
+MAX_LOOKUP_RESULTS = 10
+
+
+class ServiceSnapshot:
+    """
+    One loaded generation of the player universe: the player table and its VORP per league size.
+
+    A snapshot is never modified after it is published, so a request can keep using the
+    snapshot it started with while a refresh builds the next one.
+    """
+
+    def __init__(self, merged_data, version):
+        self.version = version
+        self.loaded_at = datetime.datetime.now().isoformat(timespec='seconds')
+        self.merged_data = merged_data
+        self.player_table = su.build_player_table(merged_data)
+        baselines = su.baseline_matrix(merged_data, SNAPSHOT_LEAGUE_SIZES, {'default': su.POSITIONS})
+        self.tables = {
+            size: su.with_baselines(self.player_table, {position: float(points) for position, points in row.items()})
+            for (size, _), row in baselines.iterrows()
+        }
+        self.names = {}
+        for player_index, name in enumerate(self.player_table.full_name):
+            self.names.setdefault(normalize_player_name(name), []).append(player_index)
+
+    def table_for(self, league_size):
+        """The player table with VORP for a league of `league_size` teams."""
+        table = self.tables.get(league_size)
+        if table is None:
+            # Not cached, so arbitrary sizes from requests can't grow the snapshot
+            table = su.with_baselines(self.player_table, su.identify_baseline_players(self.merged_data, league_size))
+        return table
+
+
+def load_merged_data(players_csv=None, client=None):
+    """Load the merged projections: a saved merged_data_output.csv, or the Excel file merged with Sleeper's players."""
+    if players_csv:
+        return pd.read_csv(players_csv, dtype={'player_id': str})
+    return su.merge_data(su.load_and_process_excel(su.excel_file_path), su.fetch_data_from_sleeper(client=client))
+
+
+class ServiceError(Exception):
+    """A query the service cannot answer, with the HTTP status to answer it with."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class RecommendationService:
+    """
+    Keeps the player universe warm in memory and answers pick, roster-needs and player queries.
+
+    Data is reloaded in a background thread every `refresh_interval` seconds. The new snapshot
+    is built completely before it replaces the current one in a single reference assignment,
+    so queries never see a half-loaded table and never wait for a refresh.
+    """
+
+    def __init__(self, loader=load_merged_data, refresh_interval=None, client=None):
+        """
+        Args:
+            loader (callable): Returns the merged projections DataFrame for a new snapshot.
+            refresh_interval (float): Seconds between background refreshes; None disables them.
+            client (SleeperClient): API client for league rosters; defaults to the shared client.
+        """
+        self.loader = loader
+        self.refresh_interval = refresh_interval
+        self.client = client or default_client()
+        self.snapshot = None
+        self.last_refresh_error = None
+        self._refresh_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def refresh(self):
+        """Load a new snapshot and swap it in; on failure the current snapshot keeps serving."""
+        with self._refresh_lock:
+            started = time.perf_counter()
+            version = self.snapshot.version + 1 if self.snapshot else 1
+            try:
+                snapshot = ServiceSnapshot(self.loader(), version)
+            except Exception as e:
+                self.last_refresh_error = str(e)
+                logger.warning("Refresh failed, still serving version %s: %s",
+                               self.snapshot.version if self.snapshot else None, e)
+                return False
+            self.snapshot = snapshot
+            self.last_refresh_error = None
+            log_event(logger, logging.INFO, 'snapshot_loaded', "Loaded snapshot %d (%d players) in %.1fs",
+                      version, len(snapshot.player_table.player_id), time.perf_counter() - started,
+                      version=version, players=len(snapshot.player_table.player_id))
+            return True
+
+    def start(self):
+        """Load the first snapshot and start the background refresh thread."""
+        if self.snapshot is None and not self.refresh():
+            raise RuntimeError(f"Could not load the player data: {self.last_refresh_error}")
+        if self.refresh_interval:
+            self._thread = threading.Thread(target=self._refresh_loop, name='refresh', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+
+    def _refresh_loop(self):
+        while not self._stopped.wait(self.refresh_interval):
+            self.refresh()
+
+    def _league(self, league_id, rosters=None):
+        if rosters is None:
+            rosters = su.fetch_league_rosters(league_id, self.client)
+        elif not _valid_rosters(rosters):
+            raise ServiceError(400, "rosters must be a list of Sleeper rosters, each with an integer roster_id "
+                                    "and a players list (or null)")
+        if not rosters:
+            raise ServiceError(404, f"No rosters found for league {league_id}")
+        return rosters
+
+    def status(self):
+        snapshot = self.snapshot
+        return {
+            'version': snapshot.version,
+            'loaded_at': snapshot.loaded_at,
+            'players': len(snapshot.player_table.player_id),
+            'refresh_interval_s': self.refresh_interval,
+            'last_refresh_error': self.last_refresh_error,
+        }
+
+    def recommend(self, league_id=None, my_team=None, rosters=None, per_position=None):
+        """
+        Best next pick for `my_team` (Team_<roster_id>) in a league.
+
+        Args:
+            league_id (str): League whose rosters are fetched, unless `rosters` is given.
+            my_team (str): The team to pick for.
+            rosters (list): The league's roster dictionaries, for callers that track the draft themselves.
+            per_position (int): Only simulate the best N candidates per position.
+        """
+        snapshot = self.snapshot
+        rosters = self._league(league_id, rosters)
+        teams, team_roster_needs, drafted_players = su.teams_data(rosters)
+        if my_team not in team_roster_needs:
+            raise ServiceError(404, f"Team {my_team} is not in the league")
+
+        started = time.perf_counter()
+        player_table = snapshot.table_for(len(teams))
+        best_pick, best_points = su.simulate_draft_for_my_team(
+            player_table, team_roster_needs, my_team, per_position=per_position, drafted_players=drafted_players
+        )
+        return {
+            'league_id': league_id,
+            'my_team': my_team,
+            'teams': len(teams),
+            'player': _player_json(player_table, player_table.index[best_pick]) if best_pick is not None else None,
+            'projected_points': best_points,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+            'snapshot_version': snapshot.version,
+        }
+
+    def roster_needs(self, league_id=None, rosters=None):
+        """Open simulator roster slots and rostered player count per team in a league."""
+        snapshot = self.snapshot
+        rosters = self._league(league_id, rosters)
+        _, team_roster_needs, drafted_players = su.teams_data(rosters)
+        draft_results, _, simulation_needs = su.initial_draft_state(
+            snapshot.player_table, team_roster_needs, drafted_players
+        )
+        return {
+            'league_id': league_id,
+            'teams': {
+                team: {'open_slots': su.unpack_roster_needs(needs), 'rostered': len(draft_results[team])}
+                for team, needs in simulation_needs.items()
+            },
+        }
+
+    def lookup(self, player_id=None, name=None, league_size=None):
+        """Players by Sleeper ID or name (exact after normalizing, else partial), with VORP for a league size."""
+        snapshot = self.snapshot
+        player_table = snapshot.table_for(league_size or su.LEAGUE_SIZE)
+        if player_id is not None:
+            player_index = player_table.index.get(str(player_id))
+            if player_index is None:
+                raise ServiceError(404, f"Unknown player {player_id}")
+            rows = [player_index]
+        elif name:
+            key = normalize_player_name(name)
+            rows = snapshot.names.get(key, [])
+            if not rows and key:
+                rows = [row for other, matches in snapshot.names.items() if key in other for row in matches]
+        else:
+            raise ServiceError(400, "Pass a player id or name")
+        return {'players': [_player_json(player_table, row) for row in rows[:MAX_LOOKUP_RESULTS]]}
+
+
+def _valid_rosters(rosters):
+    """Whether client-supplied rosters have the roster_id and players that teams_data reads."""
+    return isinstance(rosters, list) and all(
+        isinstance(roster, dict)
+        and isinstance(roster.get('roster_id'), int) and not isinstance(roster['roster_id'], bool)
+        and 'players' in roster and (roster['players'] is None or isinstance(roster['players'], list))
+        for roster in rosters
+    )
+
+
+def _player_json(player_table, player_index):
+    def number(value):
+        return None if np.isnan(value) else round(float(value), 2)
+
+    return {
+        'player_id': player_table.player_id[player_index],
+        'full_name': player_table.full_name[player_index],
+        'team': player_table.team[player_index],
+        'position': su.position_name(player_table, player_index),
+        'fpts': number(player_table.fpts[player_index]),
+        'vorp': number(player_table.vorp[player_index]),
+    }
+
+
+def _make_handler(service):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # Keep-alive, so a UI polling the service reuses its connection
+        disable_nagle_algorithm = True  # Headers and body are separate writes; don't hold the body back
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+            self._answer(url.path, params, None)
+
+        def do_POST(self):
+            url = urlsplit(self.path)
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                body = json.loads(self.rfile.read(length) or b'{}')
+                if not isinstance(body, dict):
+                    raise ValueError
+            except ValueError:
+                self._send(400, {'error': "Body must be a JSON object"})
+                return
+            self._answer(url.path, body, body.get('rosters'))
+
+        def _answer(self, path, params, rosters):
+            try:
+                if path == '/status':
+                    result = service.status()
+                elif path == '/pick':
+                    per_position = params.get('per_position')
+                    result = service.recommend(
+                        params.get('league'), _team_param(params), rosters,
+                        int(per_position) if per_position is not None else None
+                    )
+                elif path == '/needs':
+                    result = service.roster_needs(params.get('league'), rosters)
+                elif path == '/player':
+                    league_size = params.get('teams')
+                    result = service.lookup(params.get('id'), params.get('name'),
+                                            int(league_size) if league_size is not None else None)
+                else:
+                    raise ServiceError(404, f"Unknown endpoint {path}")
+            except ServiceError as e:
+                self._send(e.status, {'error': str(e)})
+            except (TypeError, ValueError) as e:
+                self._send(400, {'error': str(e)})
+            except Exception as e:
+                logger.exception("Query %s failed", path)
+                self._send(500, {'error': str(e)})
+            else:
+                self._send(200, result)
+
+        def _send(self, status, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug("%s - %s", self.address_string(), format % args)
+
+    return Handler
+
+
+def _team_param(params):
+    if params.get('team'):
+        return params['team']
+    if params.get('roster_id') is not None:
+        return f"Team_{params['roster_id']}"
+    raise ServiceError(400, "Pass team (Team_<roster_id>) or roster_id")
+
+
+def serve(service, host='127.0.0.1', port=DEFAULT_PORT):
+    """Serve the service's queries over HTTP until interrupted."""
+    server = ThreadingHTTPServer((host, port), _make_handler(service))
+    server.daemon_threads = True
+    host, port = server.server_address[:2]
+    logger.info("Serving on http://%s:%s (/pick, /needs, /player, /status)", host, port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Service stopped.")
+    finally:
+        service.stop()
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve pick recommendations from a warm player table over HTTP/JSON.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--refresh-minutes', type=float, default=DEFAULT_REFRESH_MINUTES,
+                        help="Minutes between background data refreshes (0 disables them)")
+    parser.add_argument('--players-csv', help="Serve a saved merged_data_output.csv instead of the full pipeline")
+    args = parser.parse_args()
+
+    configure_logging()
+    # Per-query simulator summaries would render a roster table on every request
+    su.logger.setLevel(logging.WARNING)
+
+    client = default_client()
+    service = RecommendationService(
+        lambda: load_merged_data(args.players_csv, client),
+        refresh_interval=args.refresh_minutes * 60 or None, client=client
+    ).start()
+    serve(service, args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+# Updated POSITIONS list with clearer roles for FLEX and BENCH spots
+POSITIONS = [
+    'QB',        # 1 QB
+    'RB', 'RB',  # 2 RB
+    'WR', 'WR',  # 2 WR
+    'TE',        # 1 TE
+    'K',         # 1 K
+    'DEF',       # 1 DEF
+    'FLEX1', 'FLEX2',  # 2 FLEX (RB, WR, or TE)
+    'BENCH1', 'BENCH2', 'BENCH3', 'BENCH4', 'BENCH5'  # 5 BENCH spots
+]
+
+# Positions the draft simulator can roster, in position-code order
+SIM_POSITIONS = ['QB', 'RB', 'WR', 'TE', 'K', 'DEF']
+POSITION_CODES = {position: code for code, position in enumerate(SIM_POSITIONS)}
+UNKNOWN_POSITION_CODE = len(SIM_POSITIONS)  # Sleeper positions we never draft (DB, DL, ...)
+FLEX_POSITIONS = ['RB', 'WR', 'TE']
+CAPPED_POSITIONS = ['QB', 'K', 'DEF']  # Only drafted into their own slots
+BENCH_SPOTS = ['BENCH1', 'BENCH2', 'BENCH3', 'BENCH4', 'BENCH5']
+
+# Roster slots each team fills during a simulated draft (QB, K and DEF capped at 2)
+SIMULATION_ROSTER_LIMITS = {
+    'QB': 2, 'RB': 2, 'WR': 2, 'TE': 1, 'K': 2, 'DEF': 2, 'FLEX1': 1, 'FLEX2': 1,
+    'BENCH1': 1, 'BENCH2': 1, 'BENCH3': 1, 'BENCH4': 1, 'BENCH5': 1
+}
+
+# Open roster slots are packed into one int per team: an 8-bit count per needs column, one
+# column per SIM_POSITIONS code followed by the combined FLEX and BENCH counts. Copying a
+# league's needs is a copy of one small dict of ints, and every check below is O(1).
+NEEDS_COLUMNS = SIM_POSITIONS + ['FLEX', 'BENCH']
+FLEX_COLUMN = NEEDS_COLUMNS.index('FLEX')
+BENCH_COLUMN = NEEDS_COLUMNS.index('BENCH')
+NEEDS_FIELD_BITS = 8
+_NEEDS_FIELD_MASK = (1 << NEEDS_FIELD_BITS) - 1
+_FLEX_SHIFT = FLEX_COLUMN * NEEDS_FIELD_BITS
+_BENCH_SHIFT = BENCH_COLUMN * NEEDS_FIELD_BITS
+_FLEX_CODES = frozenset(POSITION_CODES[position] for position in FLEX_POSITIONS)
+_CAPPED_CODES = frozenset(POSITION_CODES[position] for position in CAPPED_POSITIONS)
+_ELIGIBLE_CODES = {}  # Packed needs -> eligible position codes, filled on first use
+
+def _needs_column(slot):
+    if slot in POSITION_CODES:
+        return POSITION_CODES[slot]
+    if slot.startswith('FLEX'):
+        return FLEX_COLUMN
+    if slot.startswith('BENCH'):
+        return BENCH_COLUMN
+    raise ValueError(f"Unknown roster slot: {slot}")
+
+def pack_roster_needs(slots):
+    """
+    Pack open roster slots into a needs value.
+
+    Args:
+        slots (list or dict): Slot names, one per open slot (like POSITIONS), or slot counts
+            (like SIMULATION_ROSTER_LIMITS). FLEX1/FLEX2 and BENCH1..BENCH5 are pooled.
+
+    Returns:
+        int: The packed needs.
+    """
+    counts = [0] * len(NEEDS_COLUMNS)
+    for slot, slot_count in (slots.items() if isinstance(slots, dict) else ((slot, 1) for slot in slots)):
+        counts[_needs_column(slot)] += slot_count
+    packed = 0
+    for column, slot_count in enumerate(counts):
+        if not 0 <= slot_count <= _NEEDS_FIELD_MASK:
+            raise ValueError(f"{NEEDS_COLUMNS[column]} needs must be between 0 and {_NEEDS_FIELD_MASK}, got {slot_count}")
+        packed |= slot_count << (column * NEEDS_FIELD_BITS)
+    return packed
+
+def unpack_roster_needs(needs):
+    """Return packed needs as {needs column: open slot count}, e.g. for printing."""
+    return {
+        column: (needs >> (index * NEEDS_FIELD_BITS)) & _NEEDS_FIELD_MASK
+        for index, column in enumerate(NEEDS_COLUMNS)
+    }
+
+def _fits_roster_needs(needs, code):
+    """Check whether a player with position `code` fits any open slot, BENCH included."""
+    if code >= UNKNOWN_POSITION_CODE:
+        return False
+    return bool(
+        (needs >> (code * NEEDS_FIELD_BITS)) & _NEEDS_FIELD_MASK
+        or (code in _FLEX_CODES and (needs >> _FLEX_SHIFT) & _NEEDS_FIELD_MASK)
+        or (needs >> _BENCH_SHIFT) & _NEEDS_FIELD_MASK
+    )
+
+def _eligible_codes(needs):
+    """
+    Return the position codes a team can still draft given its packed needs.
+
+    QB, K and DEF only fill their own (capped) slots; RB, WR and TE fall back to FLEX, then BENCH.
+    """
+    codes = _ELIGIBLE_CODES.get(needs)
+    if codes is None:
+        open_flex = (needs >> _FLEX_SHIFT) & _NEEDS_FIELD_MASK
+        open_bench = (needs >> _BENCH_SHIFT) & _NEEDS_FIELD_MASK
+        codes = _ELIGIBLE_CODES[needs] = tuple(
+            code for code in range(len(SIM_POSITIONS))
+            if (needs >> (code * NEEDS_FIELD_BITS)) & _NEEDS_FIELD_MASK
+            or (code not in _CAPPED_CODES and ((code in _FLEX_CODES and open_flex) or open_bench))
+        )
+    return codes
+
+def _consume_roster_slot(needs, code):
+    """
+    Fill the first open slot for a drafted player: own position, then FLEX, then BENCH.
+
+    Returns:
+        int: The updated packed needs (unchanged if the player does not fit anywhere).
+    """
+    if code >= UNKNOWN_POSITION_CODE:
+        return needs
+    shift = code * NEEDS_FIELD_BITS
+    if (needs >> shift) & _NEEDS_FIELD_MASK:
+        return needs - (1 << shift)
+    if code in _FLEX_CODES and (needs >> _FLEX_SHIFT) & _NEEDS_FIELD_MASK:
+        return needs - (1 << _FLEX_SHIFT)
+    if (needs >> _BENCH_SHIFT) & _NEEDS_FIELD_MASK:
+        return needs - (1 << _BENCH_SHIFT)
+    return needs
+
+def remaining_simulation_needs(position_codes):
+    """
+    Packed SIMULATION_ROSTER_LIMITS slots a team still has open after rostering players.
+
+    Args:
+        position_codes (iterable): Position code of each rostered player.
+
+    Returns:
+        int: The packed needs.
+    """
+    needs = pack_roster_needs(SIMULATION_ROSTER_LIMITS)
+    for code in position_codes:
+        needs = _consume_roster_slot(needs, code)
+    return needs
+
+def teams_data(rosters):
+    """
+    Build the teams, packed roster needs and drafted players for a league's rosters without touching the globals.
+
+    Returns:
+        tuple: (team names, packed needs per team, drafted player IDs per team)
+    """
+    # Extract team names based on the owner's ID
+    teams = [f"Team_{roster['roster_id']}" for roster in rosters]
+
+    team_roster_needs = {team: pack_roster_needs(POSITIONS) for team in teams}
+    drafted_players = {team: roster['players'] if roster['players'] else [] for team, roster in zip(teams, rosters)}
+    return teams, team_roster_needs, drafted_players
@@ -1,6 +1,29 @@
-import requests
 import pandas as pd
+import numpy as np
+import argparse
+import logging
+import os
 import re
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from draft_logging import configure_logging, get_logger, log_event
+from instrumentation import StageRecorder, count, profiled
+from json_stream import iter_object_items
+from player_matching import PlayerMatchIndex, match_players, normalize_player_name, normalize_position, normalize_team
+# Roster-needs helpers and Sleeper API getters live in their own modules; the getters are
+# re-exported here for the modules that call them as su.<name>
+from roster_needs import (
+    BENCH_COLUMN, FLEX_COLUMN, NEEDS_COLUMNS, POSITION_CODES, POSITIONS, SIM_POSITIONS, UNKNOWN_POSITION_CODE,
+    _CAPPED_CODES, _FLEX_CODES, _consume_roster_slot, _eligible_codes, _fits_roster_needs, remaining_simulation_needs,
+    teams_data, unpack_roster_needs,
+)
+from sleeper_api import fetch_league_rosters, get_all_leagues_for_user, get_draft_picks, get_league, get_league_users
+from sleeper_cache import (
+    PLAYER_TABLE_CACHE_NAME, PLAYERS_CACHE_TTL, cached_fetch, cached_file_load, load_cached_value, save_cached_value,
+)
+from sleeper_client import default_client
+from transposition import TranspositionCache
 
 # Global Constants
 LEAGUE_ID = '1120130617145937920'
@@ -8,17 +31,13 @@ MY_USER_NAME = 'megaman2000'
 MY_USER_ID = '1004174905258176512'
 LEAGUE_SIZE = 12
 
-# Updated POSITIONS list with clearer roles for FLEX and BENCH spots
-POSITIONS = [
-    'QB',        # 1 QB
-    'RB', 'RB',  # 2 RB
-    'WR', 'WR',  # 2 WR
-    'TE',        # 1 TE
-    'K',         # 1 K
-    'DEF',       # 1 DEF
-    'FLEX1', 'FLEX2',  # 2 FLEX (RB, WR, or TE)
-    'BENCH1', 'BENCH2', 'BENCH3', 'BENCH4', 'BENCH5'  # 5 BENCH spots
-]
+logger = get_logger('simulator')
+
+# Default candidate picks kept per position by prune_dominated_candidates
+CANDIDATES_PER_POSITION = 5
+
+# League sizes whose baselines are saved with the cached player table (every size Sleeper allows)
+CACHED_BASELINE_LEAGUE_SIZES = range(2, 33)
 
 # Placeholder for the team data
 TEAMS = []
@@ -60,40 +79,92 @@ TEAM_NAME_MAPPING = {
     'MIN': 'Minnesota'
 }
 
-# File path to the Excel file
-excel_file_path = '/Users/danieljones/dev/ffp/utilities/cbs_ff_projection_data.xlsx'
+# CBS team name -> Sleeper abbreviation, for matching defense rows
+CBS_TEAM_ABBREVIATIONS = {}
+for abbreviation, cbs_team in TEAM_NAME_MAPPING.items():
+    CBS_TEAM_ABBREVIATIONS.setdefault(cbs_team, abbreviation.upper())
+
+# File path to the CBS projections workbook (override with FFP_PROJECTIONS_PATH)
+excel_file_path = os.environ.get(
+    'FFP_PROJECTIONS_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cbs_ff_projection_data.xlsx')
+)
+
+# Version of load_and_process_excel's output; bump when the parsing changes to invalidate caches
+PROJECTIONS_CACHE_VERSION = 3
 
 
 def normalize_name(name):
     # Remove special characters and spaces, convert to lowercase
     return re.sub(r'[^a-z0-9]', '', name.lower())
 
-def load_and_process_excel(file_path):
-    excel_data = pd.ExcelFile(file_path)
-    cbs_data = pd.concat([pd.read_excel(file_path, sheet_name=sheet) for sheet in excel_data.sheet_names])
-
-    def process_row(row):
-        if pd.notna(row.get('PLAYER')):  # Process as a player
-            parts = row['PLAYER'].split()
-            if len(parts) >= 4:  # Expecting 'First Name Last Name Position Team'
-                first_name = parts[0]
-                last_name = parts[1]
-                position = parts[2]
-                team = parts[3]
-                search_full_name = f"{first_name.lower()}{last_name.lower()}"
-                full_name = f"{first_name.capitalize()} {last_name.capitalize()}"
-                return pd.Series([search_full_name, None, full_name, position, team])
-        elif pd.notna(row.get('TEAM')):  # Process as a defense/special team
-            team_name = row['TEAM']
-            # Map the CBS team name to the Sleeper team abbreviation
-            for player_id, cbs_team in TEAM_NAME_MAPPING.items():
-                if cbs_team == team_name:
-                    mapped_team_name = player_id.upper()  # Keep team names in uppercase
-                    return pd.Series([None, mapped_team_name, None, 'DEF', None])
-        return pd.Series([pd.NA, pd.NA, pd.NA, 'Unknown', pd.NA])
-
-    # Apply the function to process each row and add the relevant identifier columns
-    cbs_data[['search_full_name', 'search_team_name', 'full_name', 'position', 'team']] = cbs_data.apply(process_row, axis=1)
+def load_and_process_excel(file_path, use_cache=True):
+    """
+    Load the CBS projections workbook into one normalized DataFrame.
+
+    The processed result is cached on disk, keyed on the workbook's mtime and content hash,
+    so later runs skip openpyxl entirely until the workbook changes.
+
+    Args:
+        file_path (str): Path to the CBS projections workbook.
+        use_cache (bool): Read and write the processed-projections cache.
+
+    Returns:
+        DataFrame: CBS stats plus search_full_name, search_team_name, full_name, cbs_name, position and team.
+    """
+    if use_cache:
+        cbs_data = cached_file_load(file_path, _process_excel, version=PROJECTIONS_CACHE_VERSION)
+    else:
+        cbs_data = _process_excel(file_path)
+
+    # Debug: Print the columns of the processed CBS data
+    print("CBS Data Columns:", cbs_data.columns)
+
+    return cbs_data
+
+def _identify_cbs_rows(cbs_data):
+    """
+    Derive the identifier columns for every CBS row in one vectorized pass.
+
+    Player rows ('First Last [Suffix] POS TEAM' in PLAYER) get a search_full_name, full_name,
+    cbs_name (the full name as CBS writes it), position and team; position and team are the
+    last two tokens so suffixed names like 'Kenneth Walker III' parse correctly. Defense rows
+    (a CBS team name in TEAM) get search_team_name set to the Sleeper abbreviation and
+    position 'DEF'. Anything else is position 'Unknown'.
+
+    Returns:
+        DataFrame: search_full_name, search_team_name, full_name, cbs_name, position and team
+        columns, positionally aligned with cbs_data.
+    """
+    missing = pd.Series(np.nan, index=cbs_data.index, dtype=object)
+    player = cbs_data['PLAYER'].astype(object) if 'PLAYER' in cbs_data.columns else missing
+    team_name = cbs_data['TEAM'] if 'TEAM' in cbs_data.columns else missing
+
+    parts = player.str.split(expand=True).reindex(columns=range(4))
+    tail = player.str.rsplit(n=2, expand=True).reindex(columns=range(3))
+    is_player = (player.notna() & parts[3].notna()).to_numpy()  # Expecting 'First Name Last Name Position Team'
+    def_team = team_name.map(CBS_TEAM_ABBREVIATIONS)
+    is_def = (player.isna() & def_team.notna()).to_numpy()
+
+    first_name, last_name = parts[0], parts[1]
+    identifiers = pd.DataFrame({
+        'search_full_name': np.where(is_player, first_name.str.lower() + last_name.str.lower(), None),
+        'search_team_name': np.where(is_def, def_team, None),
+        'full_name': np.where(is_player, first_name.str.capitalize() + ' ' + last_name.str.capitalize(), None),
+        'cbs_name': np.where(is_player, tail[0], None),
+        'position': np.where(is_player, tail[1], np.where(is_def, 'DEF', 'Unknown')),
+        'team': np.where(is_player, tail[2], None),
+    })
+    identifiers.index = cbs_data.index
+    return identifiers
+
+def _process_excel(file_path):
+    # Parse every sheet from the one open workbook instead of re-reading the file per sheet
+    with pd.ExcelFile(file_path) as excel_data:
+        cbs_data = pd.concat([excel_data.parse(sheet) for sheet in excel_data.sheet_names])
+
+    identifiers = _identify_cbs_rows(cbs_data)
+    cbs_data[list(identifiers.columns)] = identifiers
     
     # Ensure FPTS is present and correctly processed
     if 'FPTS' not in cbs_data.columns:
@@ -102,411 +173,1006 @@ def load_and_process_excel(file_path):
     # Drop the 'PLAYER' column after processing
     cbs_data = cbs_data.drop(columns=['PLAYER'])
     
-    # Debug: Print the columns of the processed CBS data
-    print("CBS Data Columns:", cbs_data.columns)
-    
     return cbs_data
 
-def fetch_data_from_sleeper():
-    url = "https://api.sleeper.app/v1/players/nfl"
-    response = requests.get(url)
-    
-    if response.status_code == 200:
-        data = response.json()
-        sleeper_data = []
-        for player_id, player_info in data.items():
-            if 'fantasy_positions' in player_info and player_info['fantasy_positions']:
-                positions = player_info['fantasy_positions']
-                if any(pos in POSITIONS for pos in positions):
-                    search_full_name = player_info.get('search_full_name', f"{player_info.get('first_name', '')}{player_info.get('last_name', '')}".lower())
-                    full_name = player_info.get('full_name', 'Unknown')
-                    team = player_info.get('team', '').upper() if player_info.get('team') else ''
-                    
-                    sleeper_data.append({
-                        'player_id': player_id if 'DEF' in positions else player_id.lower(),  # Keep DEF IDs as uppercase (team abbreviations)
-                        'search_full_name': search_full_name.lower() if search_full_name else '',
-                        'full_name': full_name,
-                        'position': positions[0],
-                        'team': team  # Convert to uppercase for consistency
-                    })
-        
-        sleeper_df = pd.DataFrame(sleeper_data)
-        
-        # Debug: Print the columns of the Sleeper data
-        print("Sleeper Data Columns:", sleeper_df.columns)
-        
-        return sleeper_df
-    else:
-        raise Exception(f"Failed to fetch data from Sleeper API: {response.status_code}")
+# Columns kept from the Sleeper players dump, and the initial row capacity reserved for them
+SLEEPER_PLAYER_COLUMNS = ['player_id', 'search_full_name', 'full_name', 'position', 'team']
+SLEEPER_PLAYERS_CAPACITY = 4096
 
-def merge_data(cbs_data, sleeper_data):
-    # First, ensure that Sleeper data contains only unique player IDs
-    sleeper_data_unique = sleeper_data.drop_duplicates(subset=['player_id'])
-
-    # Merge the CBS data with the unique Sleeper data based on `search_full_name`
-    player_merge = pd.merge(
-        sleeper_data_unique, 
-        cbs_data, 
-        left_on='search_full_name', 
-        right_on='search_full_name', 
-        how='left', 
-        suffixes=('', '_cbs')
-    )
+def _parse_sleeper_players(response):
+    """
+    Keep the fantasy-relevant players from a /players/nfl response as columns of arrays.
 
-    # Merge on team defenses using 'team' for rows where position is 'DEF', keeping Sleeper data as the base
-    def_merge = pd.merge(
-        sleeper_data_unique[sleeper_data_unique['position'] == 'DEF'], 
-        cbs_data[cbs_data['position'] == 'DEF'],
-        left_on='team', 
-        right_on='team', 
-        how='left', 
-        suffixes=('', '_cbs')
-    )
+    The body is decoded incrementally, one player at a time, straight into preallocated
+    object columns, so the raw payload and the full decoded dump are never in memory at once.
+    """
+    fantasy_positions = set(POSITIONS)
+    capacity = SLEEPER_PLAYERS_CAPACITY
+    columns = {name: np.empty(capacity, dtype=object) for name in SLEEPER_PLAYER_COLUMNS}
+    player_ids, search_names, full_names, player_positions, teams = (columns[name] for name in SLEEPER_PLAYER_COLUMNS)
+    rows = 0
+
+    for player_id, player_info in iter_object_items(response.iter_content(chunk_size=1 << 16)):
+        positions = player_info.get('fantasy_positions')
+        if not positions or fantasy_positions.isdisjoint(positions):
+            continue
 
-    # Concatenate both merged DataFrames
-    combined_merge = pd.concat([player_merge, def_merge], ignore_index=True)
+        if rows == capacity:
+            capacity *= 2
+            for name in SLEEPER_PLAYER_COLUMNS:
+                grown = np.empty(capacity, dtype=object)
+                grown[:rows] = columns[name]
+                columns[name] = grown
+            player_ids, search_names, full_names, player_positions, teams = (columns[name] for name in SLEEPER_PLAYER_COLUMNS)
 
-    # Drop unnecessary duplicated columns if any remain
-    combined_merge = combined_merge.drop(columns=['search_team_name', 'team_cbs'], errors='ignore')
+        search_full_name = player_info.get('search_full_name', f"{player_info.get('first_name', '')}{player_info.get('last_name', '')}".lower())
+        team = player_info.get('team')
+
+        player_ids[rows] = player_id if 'DEF' in positions else player_id.lower()  # Keep DEF IDs as uppercase (team abbreviations)
+        search_names[rows] = search_full_name.lower() if search_full_name else ''
+        full_names[rows] = player_info.get('full_name', 'Unknown')
+        player_positions[rows] = positions[0]
+        teams[rows] = team.upper() if team else ''  # Convert to uppercase for consistency
+        rows += 1
+
+    return {name: column[:rows].copy() for name, column in columns.items()}
+
+def fetch_data_from_sleeper(ttl=PLAYERS_CACHE_TTL, client=None):
+    """
+    Load the fantasy-relevant Sleeper players, using the on-disk players cache when it is fresh.
+
+    Args:
+        ttl (float): Seconds the cached players are used before revalidating with Sleeper.
+        client (SleeperClient): API client; defaults to the shared client.
+
+    Returns:
+        DataFrame: player_id, search_full_name, full_name, position and team per player.
+    """
+    client = client or default_client()
+    columns = cached_fetch(client.url('/players/nfl'), _parse_sleeper_players, 'sleeper_players.pkl', ttl=ttl, client=client)
+    sleeper_df = pd.DataFrame(columns)
+
+    # Debug: Print the columns of the Sleeper data
+    print("Sleeper Data Columns:", sleeper_df.columns)
+
+    return sleeper_df
+
+def _cbs_match_keys(cbs_data):
+    """(normalized name, position, team) per CBS row; defenses are keyed on their team alone."""
+    is_def = (cbs_data['position'] == 'DEF').to_numpy()
+    names = cbs_data['cbs_name'] if 'cbs_name' in cbs_data.columns else cbs_data['full_name']
+    teams = np.where(is_def, cbs_data['search_team_name'], cbs_data['team'])
+    return [
+        ('' if defense else normalize_player_name(name), normalize_position(position), normalize_team(team))
+        for defense, name, position, team in zip(is_def, names, cbs_data['position'], teams)
+    ]
+
+def _sleeper_match_keys(sleeper_data):
+    """(normalized name, position, team) per Sleeper row; defenses are keyed on their team alone."""
+    keys = []
+    for full_name, search_name, position, team in zip(
+        sleeper_data['full_name'], sleeper_data['search_full_name'], sleeper_data['position'], sleeper_data['team']
+    ):
+        if position == 'DEF':
+            name = ''
+        elif isinstance(full_name, str) and full_name != 'Unknown':
+            name = normalize_player_name(full_name)
+        else:
+            name = normalize_player_name(search_name)
+        keys.append((name, normalize_position(position), normalize_team(team)))
+    return keys
+
+# Identifier columns of the merged player data, and those of them stored as categoricals
+MERGED_ID_COLUMNS = ['player_id', 'full_name', 'position', 'team', 'match_confidence', 'match_method']
+MERGED_CATEGORY_COLUMNS = ['position', 'team', 'match_method']
+# Copies of the Sleeper identifiers (and CBS's defense team name), dropped after the merge
+MERGED_DROPPED_COLUMNS = ['search_full_name', 'full_name_cbs', 'position_cbs', 'TEAM']
+# Projections kept in float64: VORP and the simulator's point totals are computed from them
+MERGED_FLOAT64_COLUMNS = ['FPTS']
+
+def _memory_mb(df):
+    return df.memory_usage(deep=True).sum() / (1024 * 1024)
+
+def compact_player_data(merged_data):
+    """
+    Normalize the merged player data to a compact schema.
+
+    Duplicate identifier columns are dropped, position, team and match_method become
+    categoricals and every CBS stat other than FPTS becomes float32 (one consolidated block).
+    FPTS stays float64 so VORP and simulated totals are unchanged. The stats are kept dense:
+    sparse columns would halve their memory again, but make every row filter and sort of
+    the merged data several times slower.
+
+    Returns:
+        DataFrame: The compact merged data, in the same row order.
+    """
+    columns = {}
+    for column in merged_data.columns:
+        if column in MERGED_DROPPED_COLUMNS:
+            continue
+        values = merged_data[column]
+        if column in MERGED_CATEGORY_COLUMNS:
+            values = values.astype('category')
+        elif column == 'match_confidence':
+            values = values.astype(np.float32)
+        elif column in MERGED_FLOAT64_COLUMNS:
+            values = pd.to_numeric(values, errors='coerce').astype(np.float64)
+        elif column not in MERGED_ID_COLUMNS:
+            values = pd.to_numeric(values, errors='coerce').astype(np.float32)
+        columns[column] = values
+    return pd.DataFrame(columns, index=merged_data.index)
+
+def merge_data(cbs_data, sleeper_data, return_report=False, compact=True):
+    """
+    Join the CBS projections onto the Sleeper players, one CBS row per Sleeper player at most.
+
+    Rows are matched through a PlayerMatchIndex over the Sleeper players: an exact match on
+    (normalized name, position, team), then on (name, position), then a trigram fuzzy match
+    within the same position. Defenses match on their team abbreviation.
+
+    Args:
+        cbs_data (DataFrame): Output of load_and_process_excel.
+        sleeper_data (DataFrame): Output of fetch_data_from_sleeper.
+        return_report (bool): Also return the CBS rows that did not match any Sleeper player.
+        compact (bool): Normalize the result with compact_player_data and report its memory use.
+
+    Returns:
+        DataFrame: Every unique Sleeper player with its CBS stats (NaN when unmatched),
+        match_confidence and match_method columns (plus full_name_cbs and position_cbs
+        without compact). With return_report, a (merged, unmatched CBS rows) tuple.
+    """
+    # First, ensure that Sleeper data contains only unique player IDs
+    sleeper_data_unique = sleeper_data.drop_duplicates(subset=['player_id']).reset_index(drop=True)
+    cbs_rows = cbs_data[cbs_data['position'] != 'Unknown'].reset_index(drop=True)
+
+    sleeper_keys = _sleeper_match_keys(sleeper_data_unique)
+    index = PlayerMatchIndex(*zip(*sleeper_keys)) if sleeper_keys else PlayerMatchIndex([], [], [])
+    matches = match_players(_cbs_match_keys(cbs_rows), index)
+
+    sleeper_rows = np.array([-1 if row is None else row for row, _, _ in matches], dtype=np.int64)
+    cbs_rows['match_confidence'] = [confidence for _, confidence, _ in matches]
+    cbs_rows['match_method'] = [method for _, _, method in matches]
+    matched = sleeper_rows >= 0
+
+    # Line the matched CBS rows up with the Sleeper rows they belong to
+    cbs_columns = cbs_rows.drop(columns=['search_full_name', 'search_team_name', 'cbs_name', 'team'], errors='ignore')
+    cbs_columns = cbs_columns.rename(columns={'full_name': 'full_name_cbs', 'position': 'position_cbs'})
+    aligned = cbs_columns[matched].set_axis(sleeper_rows[matched]).reindex(sleeper_data_unique.index)
+    aligned['match_confidence'] = aligned['match_confidence'].fillna(0.0)
+    aligned['match_method'] = aligned['match_method'].fillna('unmatched')
+    combined_merge = pd.concat([sleeper_data_unique, aligned], axis=1)
+
+    unmatched = cbs_rows.loc[~matched, ['cbs_name', 'full_name', 'search_team_name', 'position', 'team', 'FPTS', 'match_method']] \
+        if 'cbs_name' in cbs_rows.columns else cbs_rows[~matched]
+    print(f"Matched {int(matched.sum())} of {len(cbs_rows)} CBS players "
+          f"({(cbs_rows['match_method'] == 'fuzzy').sum()} fuzzy, {len(unmatched)} unmatched).")
+
+    if compact:
+        memory_before = _memory_mb(combined_merge)
+        combined_merge = compact_player_data(combined_merge)
+        print(f"Merged data memory: {memory_before:.2f} MB -> {_memory_mb(combined_merge):.2f} MB")
 
     # Debug: Print the final combined columns and a preview of the data
     print("Combined Data Columns:", combined_merge.columns)
     print("Combined Data Preview:\n", combined_merge.head())
 
-    # Return the final DataFrame without dropping any columns
+    if return_report:
+        return combined_merge, unmatched
     return combined_merge
 
-def filter_by_team_needs(vorp_scores, merged_data):
-    team_filtered_players = {}
+# Immutable, array-backed view of the merged player data used by the draft simulator.
+# Players are addressed by integer index; `index` maps a Sleeper player_id to that index.
+PlayerTable = namedtuple('PlayerTable', ['player_id', 'full_name', 'team', 'position', 'fpts', 'vorp', 'index'])
+
+def build_player_table(merged_data):
+    """
+    Build the simulator's player table from the merged (and VORP-scored) player data.
+
+    Each player_id appears once. When the merge produced several rows for a player,
+    the last row with a projection wins, which matches the VORP that calculate_vorp reports.
+
+    Args:
+        merged_data (DataFrame): The output of merge_data with a VORP column added.
+
+    Returns:
+        PlayerTable: Read-only NumPy columns indexed by player index, plus a player_id -> index dict.
+    """
+    # Only the columns the table uses are sorted and deduplicated, not every stat column
+    players = merged_data[[column for column in ['player_id', 'full_name', 'team', 'position', 'FPTS', 'VORP']
+                           if column in merged_data.columns]].reset_index(drop=True)
+    players = (
+        players.assign(_has_points=players['FPTS'].notna())
+        .sort_values('_has_points', kind='stable')
+        .drop_duplicates(subset=['player_id'], keep='last')
+        .sort_index()
+    )
 
-    for team, needs in TEAM_ROSTER_NEEDS.items():
-        team_filtered_players[team] = {}
+    player_ids = players['player_id'].astype(str).to_numpy(dtype=object)
+    vorp = players['VORP'] if 'VORP' in players.columns else pd.Series(np.nan, index=players.index)
+    columns = {
+        'player_id': player_ids,
+        'full_name': players['full_name'].to_numpy(dtype=object),
+        'team': players['team'].astype(object).fillna('').to_numpy(dtype=object),
+        'position': players['position'].astype(object).map(POSITION_CODES).fillna(UNKNOWN_POSITION_CODE).to_numpy(dtype=np.int8),
+        'fpts': pd.to_numeric(players['FPTS'], errors='coerce').to_numpy(dtype=np.float64),
+        'vorp': pd.to_numeric(vorp, errors='coerce').to_numpy(dtype=np.float64),
+    }
+    for column in columns.values():
+        column.setflags(write=False)
+
+    return PlayerTable(index={player_id: i for i, player_id in enumerate(player_ids)}, **columns)
 
-        for player_id, vorp in vorp_scores.items():
-            # Retrieve the player's information from merged_data using player_id
-            player_info = merged_data[merged_data['player_id'] == player_id]
-            
-            # Safeguard: Check if the player exists in merged_data
-            if player_info.empty:
-                continue  # Skip if the player is not found in merged_data
+def position_name(player_table, player_index):
+    """Return the position name for a player index, or None for positions the simulator ignores."""
+    code = player_table.position[player_index]
+    return SIM_POSITIONS[code] if code < UNKNOWN_POSITION_CODE else None
 
-            # Extract the player's position
-            player_position = player_info['position'].values[0]
-            
-            # Check if the player's position matches the team's needs
-            if player_position in needs:
-                team_filtered_players[team][player_id] = vorp
+def filter_by_team_needs(player_table, team_roster_needs=None):
+    team_filtered_players = {}
+
+    for team, needs in (team_roster_needs if team_roster_needs is not None else TEAM_ROSTER_NEEDS).items():
+        # Positions with an open slot of their own (FLEX and BENCH slots are not expanded)
+        open_slots = unpack_roster_needs(needs)
+        needed_codes = [POSITION_CODES[position] for position in SIM_POSITIONS if open_slots[position] > 0]
+        matches = np.flatnonzero(np.isin(player_table.position, needed_codes))
+        team_filtered_players[team] = {int(i): player_table.vorp[i] for i in matches}
 
         # Warning if no players were found that match the team's needs
         if not team_filtered_players[team]:
-            print(f"Warning: No players found for team {team} based on needs {needs}")
+            print(f"Warning: No players found for team {team} based on needs {open_slots}")
 
     return team_filtered_players
 
-def identify_baseline_players(merged_data_df):
-    baseline_players_points = {}
+def position_requirements(roster_positions=POSITIONS):
+    """
+    Count the starting slots per position in a roster template, ignoring FLEX and BENCH.
 
-    # Calculate position requirements dynamically from the POSITIONS list
-    position_requirements = {}
-    for position in POSITIONS:
+    Args:
+        roster_positions (list): Slot names, e.g. POSITIONS.
+
+    Returns:
+        dict: Position -> number of starters, in first-seen order.
+    """
+    requirements = {}
+    for position in roster_positions:
         if position.startswith('BENCH') or position.startswith('FLEX'):
             continue  # Skip FLEX and BENCH for baseline calculations
-        if position in position_requirements:
-            position_requirements[position] += 1
-        else:
-            position_requirements[position] = 1
-
-    for position, required_count in position_requirements.items():
-        if position == 'FLEX1' or position == 'FLEX2':
-            # FLEX can be RB, WR, or TE, so combine all those positions
-            players_in_position = merged_data_df[
-                merged_data_df['position'].isin(['RB', 'WR', 'TE'])
-            ]
-        else:
-            players_in_position = merged_data_df[
-                merged_data_df['position'] == position
-            ]
-        
-        players_in_position = players_in_position.sort_values(by='FPTS', ascending=False)
-        
-        if not players_in_position.empty:
-            # Calculate baseline index accounting for multiple players per position
-            baseline_index = min((LEAGUE_SIZE * required_count) - 1, len(players_in_position) - 1)
-            baseline_players_points[position] = float(players_in_position.iloc[baseline_index]['FPTS'])
-        else:
-            baseline_players_points[position] = 0.0  # Ensure the default is a standard float
+        requirements[position] = requirements.get(position, 0) + 1
+    return requirements
+
+def baseline_matrix(merged_data_df, league_sizes=(LEAGUE_SIZE,), roster_templates=None):
+    """
+    Compute baseline (last starter) FPTS for many league configurations in one pass.
+
+    The data is grouped by position and each group's FPTS sorted once (missing values last);
+    every configuration's baseline is then a single index into those sorted arrays.
+
+    Args:
+        merged_data_df (DataFrame): Player data with position and FPTS columns.
+        league_sizes (iterable): League sizes to evaluate.
+        roster_templates (dict): Template name -> list of roster slot names.
+            Defaults to {'default': POSITIONS}.
 
-    return baseline_players_points
+    Returns:
+        DataFrame: One row per (league_size, template) pair and one column per position.
+    """
+    if roster_templates is None:
+        roster_templates = {'default': POSITIONS}
+    requirements = {name: position_requirements(slots) for name, slots in roster_templates.items()}
+    positions = list(dict.fromkeys(position for counts in requirements.values() for position in counts))
+
+    sorted_points = {
+        position: -np.sort(-group.to_numpy(dtype=np.float64))
+        for position, group in merged_data_df.groupby('position', sort=False, observed=True)['FPTS']
+    }
+
+    rows = pd.MultiIndex.from_product([list(league_sizes), list(roster_templates)], names=['league_size', 'template'])
+    sizes = rows.get_level_values('league_size').to_numpy()
+    matrix = pd.DataFrame(0.0, index=rows, columns=positions)
+    for position in positions:
+        points = sorted_points.get(position)
+        if points is None or len(points) == 0:
+            continue
+        counts = np.array([requirements[name].get(position, 0) for name in rows.get_level_values('template')])
+        # Baseline index accounting for multiple players per position
+        baseline_index = np.minimum(sizes * counts - 1, len(points) - 1)
+        matrix[position] = points[baseline_index]
+    return matrix
+
+def identify_baseline_players(merged_data_df, league_size=None):
+    baselines = baseline_matrix(merged_data_df, [league_size or LEAGUE_SIZE], {'default': POSITIONS})
+    return {position: float(points) for position, points in baselines.iloc[0].items()}
 
 def calculate_vorp(df, baseline_players):
-    df['VORP'] = df.apply(lambda row: row['FPTS'] - baseline_players.get(row['position'], 0), axis=1)
+    # Positions without a baseline are compared against zero
+    positions = df['position'].astype(object)
+    baseline = positions.map(baseline_players).where(positions.isin(list(baseline_players)), 0.0)
+    df['VORP'] = df['FPTS'] - baseline
     
     # Create a dictionary with player_id as the key and VORP as the value
     vorp_scores = df.set_index('player_id')['VORP'].to_dict()
     
     return vorp_scores
 
-def simulate_draft_for_my_team(vorp_scores, team_needs, merged_data, my_team):
-    print(f"Starting draft simulation for team: {my_team}")
-    print(f"Initial available players count: {len(vorp_scores)}")
-    print(f"Team needs for {my_team}: {team_needs[my_team]}")
+def with_baselines(player_table, baseline_players):
+    """
+    Return a copy of a player table with VORP recomputed against other baselines, e.g. another league size's.
 
-    simulated_draft_results = {team: DRAFTED_PLAYERS.get(team, []).copy() for team in TEAM_ROSTER_NEEDS.keys()}
-    available_players = set(merged_data['player_id']) - set(player for players in DRAFTED_PLAYERS.values() for player in players)
+    Gives the same VORP as calculate_vorp on the merged data followed by build_player_table,
+    without rebuilding the table; the other columns and the index are shared.
 
-    if not available_players:
-        print("No available players to draft.")
-        return None, 0
+    Args:
+        player_table (PlayerTable): The table built by build_player_table.
+        baseline_players (dict): Position -> baseline FPTS, as from identify_baseline_players.
 
-    total_roster_needs = {
-        team: {
-            'QB': 2, 'RB': 2, 'WR': 2, 'TE': 1, 'K': 2, 'DEF': 2, 'FLEX1': 1, 'FLEX2': 1, 'BENCH1': 1, 'BENCH2': 1, 'BENCH3': 1, 'BENCH4': 1, 'BENCH5': 1
-        } for team in TEAM_ROSTER_NEEDS.keys()
+    Returns:
+        PlayerTable: The table with the new vorp column.
+    """
+    # Positions without a baseline (including the unknown position code) are compared against zero
+    baseline_by_code = np.array([baseline_players.get(position, 0.0) for position in SIM_POSITIONS] + [0.0])
+    vorp = player_table.fpts - baseline_by_code[player_table.position]
+    vorp.setflags(write=False)
+    return player_table._replace(vorp=vorp)
+
+def save_player_table_cache(player_table, merged_data, cache_dir=None):
+    """
+    Save the player table, with baselines for every league size, for tools that skip the pipeline.
+
+    The columns are stored as plain lists so they can be read back without NumPy or pandas
+    (see draft_cli); load_cached_player_table rebuilds the table from them.
+
+    Args:
+        player_table (PlayerTable): The table built by build_player_table.
+        merged_data (DataFrame): The merged projections the table was built from, for the baselines.
+        cache_dir (str): Cache directory; defaults to CACHE_DIR.
+    """
+    baselines = baseline_matrix(merged_data, CACHED_BASELINE_LEAGUE_SIZES, {'default': POSITIONS})
+    save_cached_value(PLAYER_TABLE_CACHE_NAME, {
+        'player_id': player_table.player_id.tolist(),
+        'full_name': player_table.full_name.tolist(),
+        'search_name': [normalize_player_name(name) for name in player_table.full_name],
+        'team': player_table.team.tolist(),
+        'position': player_table.position.tolist(),
+        'fpts': player_table.fpts.tolist(),
+        'baselines': {
+            int(size): {position: float(points) for position, points in row.items()}
+            for (size, _), row in baselines.iterrows()
+        },
+    }, cache_dir)
+
+def load_cached_player_table(league_size=None, cache_dir=None):
+    """
+    Rebuild the player table saved by save_player_table_cache, with VORP for a league size.
+
+    Args:
+        league_size (int): Teams in the league; defaults to LEAGUE_SIZE.
+        cache_dir (str): Cache directory; defaults to CACHE_DIR.
+
+    Returns:
+        PlayerTable: The cached table, or None if there is no cache or no baselines for the size.
+    """
+    cached = load_cached_value(PLAYER_TABLE_CACHE_NAME, cache_dir)
+    if cached is None:
+        return None
+    columns = cached[0]
+    baseline_players = columns['baselines'].get(league_size or LEAGUE_SIZE)
+    if baseline_players is None:
+        return None
+
+    player_ids = np.array(columns['player_id'], dtype=object)
+    arrays = {
+        'player_id': player_ids,
+        'full_name': np.array(columns['full_name'], dtype=object),
+        'team': np.array(columns['team'], dtype=object),
+        'position': np.array(columns['position'], dtype=np.int8),
+        'fpts': np.array(columns['fpts'], dtype=np.float64),
     }
+    for column in arrays.values():
+        column.setflags(write=False)
+    player_table = PlayerTable(index={player_id: i for i, player_id in enumerate(player_ids)}, vorp=None, **arrays)
+    return with_baselines(player_table, baseline_players)
 
-    for team, drafted_players in simulated_draft_results.items():
-        for player_id in drafted_players:
-            player_info = merged_data.loc[merged_data['player_id'] == player_id]
-            if player_info.empty:
-                print(f"Warning: No position found for player ID {player_id}")
-                continue
-            
-            position = player_info['position'].values[0]
-            if total_roster_needs[team][position] > 0:
-                total_roster_needs[team][position] -= 1
-            elif position in ['RB', 'WR', 'TE'] and total_roster_needs[team]['FLEX1'] > 0:
-                total_roster_needs[team]['FLEX1'] -= 1
-            elif position in ['RB', 'WR', 'TE'] and total_roster_needs[team]['FLEX2'] > 0:
-                total_roster_needs[team]['FLEX2'] -= 1
-            else:
-                for bench_spot in ['BENCH1', 'BENCH2', 'BENCH3', 'BENCH4', 'BENCH5']:
-                    if total_roster_needs[team][bench_spot] > 0:
-                        total_roster_needs[team][bench_spot] -= 1
-                        break
+def calculate_vorp_matrix(df, baselines):
+    """
+    Compute VORP for every player under every configuration of a baseline_matrix.
+
+    Args:
+        df (DataFrame): Player data with position and FPTS columns.
+        baselines (DataFrame): The output of baseline_matrix.
 
-    print(f"Total roster needs after adjusting for drafted players: {total_roster_needs}")
+    Returns:
+        DataFrame: Players (df's index) by configurations (baselines' index).
+    """
+    known = df['position'].isin(list(baselines.columns)).to_numpy()
+    codes = baselines.columns.get_indexer(df['position'].where(known))
+    baseline = np.where(known[:, None], baselines.to_numpy().T[codes], 0.0)
+    vorp = df['FPTS'].to_numpy(dtype=np.float64)[:, None] - baseline
+    return pd.DataFrame(vorp, index=df.index, columns=baselines.index)
 
-    best_final_pick = None
-    max_total_points = float('-inf')
-    best_simulated_team = None
+class PositionQueues:
+    """
+    Greedy pick-selection engine: one queue per position of draftable player indices,
+    pre-sorted by descending VORP (ties by lower index), each with a read cursor.
 
-    potential_picks = {
-        player_id: vorp for player_id, vorp in vorp_scores.items()
-        if player_id in available_players and vorp >= 0
-        and (
-            (merged_data.loc[merged_data['player_id'] == player_id, 'position'].values[0] in team_needs[my_team] or
-            (merged_data.loc[merged_data['player_id'] == player_id, 'position'].values[0] in ['RB', 'WR', 'TE'] and team_needs[my_team]['FLEX1'] > 0)) or
-            team_needs[my_team]['BENCH1'] > 0
+    Drafted players are deleted lazily: they stay in their queue and are skipped the next
+    time that queue is peeked. Copies share the sorted queues and only duplicate the cursors.
+    """
+    __slots__ = ('orders', 'vorp', 'positions', 'cursors', 'available_players')
+
+    def __init__(self, orders, vorp, positions, available_players, cursors=None):
+        self.orders = orders
+        self.vorp = vorp
+        self.positions = positions
+        self.available_players = available_players
+        self.cursors = list(cursors) if cursors is not None else [0] * len(orders)
+
+    @classmethod
+    def from_table(cls, player_table, available_players):
+        """Build queues over the available players that have a VORP and a draftable position."""
+        draftable = (
+            available_players
+            & np.isfinite(player_table.vorp)
+            & (player_table.position < UNKNOWN_POSITION_CODE)
         )
-    }
+        orders = []
+        for code in range(len(SIM_POSITIONS)):
+            members = np.flatnonzero(draftable & (player_table.position == code))
+            orders.append(members[np.lexsort((members, -player_table.vorp[members]))].tolist())
+        return cls(orders, player_table.vorp.tolist(), player_table.position.tolist(), available_players)
+
+    def copy(self, available_players):
+        """Copy the cursors onto a new availability mask (a subset of this one's available players)."""
+        return PositionQueues(self.orders, self.vorp, self.positions, available_players, self.cursors)
+
+    def peek(self, code):
+        """Return the best still-available player index at a position, or None if it is exhausted."""
+        order = self.orders[code]
+        cursor = self.cursors[code]
+        while cursor < len(order) and not self.available_players[order[cursor]]:
+            cursor += 1
+        self.cursors[code] = cursor
+        return order[cursor] if cursor < len(order) else None
+
+    def best(self, codes):
+        """Return the highest-VORP available player across the given position codes, or None."""
+        best_pick = None
+        for code in codes:
+            head = self.peek(code)
+            if head is None:
+                continue
+            if best_pick is None or self.vorp[head] > self.vorp[best_pick] or (
+                self.vorp[head] == self.vorp[best_pick] and head < best_pick
+            ):
+                best_pick = head
+        return best_pick
+
+    def take(self, player_index):
+        """Mark a player as drafted; its queue entry is dropped on the next peek."""
+        self.available_players[player_index] = False
+
+def _roster_frame(player_table, players):
+    """Build a small DataFrame of the given player indices for printing."""
+    players = list(players)
+    return pd.DataFrame({
+        'full_name': player_table.full_name[players],
+        'position': [position_name(player_table, i) for i in players],
+        'FPTS': player_table.fpts[players],
+        'VORP': player_table.vorp[players],
+    })
+
+def initial_draft_state(player_table, team_roster_needs=None, drafted_players=None):
+    """
+    Build the simulator's starting state from TEAM_ROSTER_NEEDS and DRAFTED_PLAYERS.
 
-    print(f"Potential picks for {my_team}: {potential_picks}")
+    Args:
+        player_table (PlayerTable): The table built by build_player_table.
+        team_roster_needs (dict): Packed needs per team, for another league than the globals';
+            only its teams are used.
+        drafted_players (dict): Player IDs rostered per team, for another league than the globals'.
 
-    if not potential_picks:
-        print(f"No valid picks available for {my_team} based on current needs.")
-        return None, 0
+    Returns:
+        tuple: (player indices drafted per team, boolean availability mask,
+                packed open SIMULATION_ROSTER_LIMITS slots per team)
+    """
+    team_roster_needs = team_roster_needs if team_roster_needs is not None else TEAM_ROSTER_NEEDS
+    drafted_players = drafted_players if drafted_players is not None else DRAFTED_PLAYERS
+    draft_results = {team: [] for team in team_roster_needs.keys()}
+    available_players = np.ones(len(player_table.player_id), dtype=bool)
+    for team, team_players in drafted_players.items():
+        count('player_lookups', len(team_players))
+        for player_id in team_players:
+            player_index = player_table.index.get(str(player_id))
+            if player_index is None:
+                logger.warning("No position found for player ID %s", player_id)
+                continue
+            available_players[player_index] = False
+            if team in draft_results:
+                draft_results[team].append(player_index)
 
-    for player_id, vorp in potential_picks.items():
-        simulated_draft_results_copy = {team: picks.copy() for team, picks in simulated_draft_results.items()}
-        available_players_copy = available_players.copy()
-        team_needs_copy = {team: needs.copy() for team, needs in total_roster_needs.items()}
+    total_roster_needs = {
+        team: remaining_simulation_needs(int(player_table.position[player_index]) for player_index in drafted_players)
+        for team, drafted_players in draft_results.items()
+    }
 
-        simulated_draft_results_copy[my_team].append(player_id)
-        available_players_copy.remove(player_id)
+    return draft_results, available_players, total_roster_needs
 
-        player_info = merged_data.loc[merged_data['player_id'] == player_id]
-        if player_info.empty:
-            print(f"Warning: No player data found for player ID {player_id}. Skipping.")
-            continue
-        
-        player_position = player_info['position'].values[0]
-        if team_needs_copy[my_team][player_position] > 0:
-            team_needs_copy[my_team][player_position] -= 1
-        elif player_position in ['RB', 'WR', 'TE'] and team_needs_copy[my_team]['FLEX1'] > 0:
-            team_needs_copy[my_team]['FLEX1'] -= 1
-        elif player_position in ['RB', 'WR', 'TE'] and team_needs_copy[my_team]['FLEX2'] > 0:
-            team_needs_copy[my_team]['FLEX2'] -= 1
-        else:
-            for bench_spot in ['BENCH1', 'BENCH2', 'BENCH3', 'BENCH4', 'BENCH5']:
-                if team_needs_copy[my_team][bench_spot] > 0:
-                    team_needs_copy[my_team][bench_spot] -= 1
-                    break
+def find_potential_picks(player_table, available_players, needs):
+    """
+    Return {player index: VORP} for every available player with a non-negative VORP that fits `needs`
+    (packed needs, e.g. a TEAM_ROSTER_NEEDS entry).
+    """
+    # NaN VORP compares False, so unprojected players are never candidates
+    candidates = np.flatnonzero(available_players & (player_table.vorp >= 0))
+    return {
+        int(player_index): player_table.vorp[player_index] for player_index in candidates
+        if _fits_roster_needs(needs, int(player_table.position[player_index]))
+    }
 
-        simulate_remaining_draft(vorp_scores, team_needs_copy, merged_data, simulated_draft_results_copy, available_players_copy)
+def prune_dominated_candidates(player_table, potential_picks, per_position=CANDIDATES_PER_POSITION):
+    """
+    Drop candidate picks that are dominated by at least `per_position` others at the same position.
 
-        try:
-            total_points = sum(
-                merged_data.loc[merged_data['player_id'] == p, 'FPTS'].values[0] for p in simulated_draft_results_copy[my_team]
-            )
-            print(f"Total points for simulated pick {player_id}: {total_points}")
-        except IndexError:
-            print(f"Error calculating points for player ID {player_id}. Player data might be missing.")
-            continue
+    One player dominates another at the same position when their VORP and FPTS are both at
+    least as high and one of them is higher. Since same-position players fill the same slots,
+    a dominated player is rarely worth a rollout: this keeps the top `per_position` players per
+    position by VORP, plus anyone tied with them.
 
-        if total_points > max_total_points:
-            max_total_points = total_points
-            best_final_pick = player_id
-            best_simulated_team = simulated_draft_results_copy[my_team]
+    Args:
+        player_table (PlayerTable): The table built by build_player_table.
+        potential_picks (dict): {player index: VORP} from find_potential_picks.
+        per_position (int): Dominating players a candidate may have and still be kept.
 
-    if best_simulated_team:
-        print(f"\nBest simulated team for {my_team} after picking {merged_data.loc[merged_data['player_id'] == best_final_pick, 'full_name'].values[0]}:")
-        print(merged_data[merged_data['player_id'].isin(best_simulated_team)][['full_name', 'position', 'FPTS', 'VORP']])
+    Returns:
+        dict: The kept {player index: VORP} entries, in their original order.
+    """
+    by_position = {}
+    for player_index in potential_picks:
+        by_position.setdefault(player_table.position[player_index], []).append(player_index)
+
+    vorp, fpts = player_table.vorp, player_table.fpts
+    kept = set()
+    for members in by_position.values():
+        members.sort(key=lambda i: (-vorp[i], -fpts[i], i))
+        for rank, player_index in enumerate(members):
+            dominators = 0
+            for other in members[:rank]:
+                if (vorp[other] >= vorp[player_index] and fpts[other] >= fpts[player_index]
+                        and (vorp[other] > vorp[player_index] or fpts[other] > fpts[player_index])):
+                    dominators += 1
+                    if dominators >= per_position:
+                        break
+            if dominators < per_position:
+                kept.add(player_index)
 
-    return best_final_pick, max_total_points
+    return {player_index: value for player_index, value in potential_picks.items() if player_index in kept}
 
-def simulate_remaining_draft(vorp_scores, team_needs, merged_data, draft_results, available_players):
-    while any(sum(needs.values()) > 0 for needs in team_needs.values()):
-        for team, needs in team_needs.items():
-            if sum(needs.values()) == 0:
-                continue
+# Draft state for rollouts in a worker process, installed once by _init_rollout_worker
+_ROLLOUT_CONTEXT = {}
 
-            best_pick = None
-            max_vorp = float('-inf')
-
-            for player_id in available_players:
-                player_position = merged_data.loc[merged_data['player_id'] == player_id, 'position'].values[0]
-
-                # Enforce the limit of 2 QBs, 2 Ks, and 2 DEFs
-                if (player_position in ['QB', 'K', 'DEF'] and needs[player_position] <= 0):
-                    continue
-
-                if team_needs[team][player_position] > 0:
-                    if vorp_scores[player_id] > max_vorp:
-                        max_vorp = vorp_scores[player_id]
-                        best_pick = player_id
-                elif player_position in ['RB', 'WR', 'TE'] and needs['FLEX1'] > 0:
-                    if vorp_scores[player_id] > max_vorp:
-                        max_vorp = vorp_scores[player_id]
-                        best_pick = player_id
-                elif player_position in ['RB', 'WR', 'TE'] and needs['FLEX2'] > 0:
-                    if vorp_scores[player_id] > max_vorp:
-                        max_vorp = vorp_scores[player_id]
-                        best_pick = player_id
-                elif any(needs[bench_spot] > 0 for bench_spot in ['BENCH1', 'BENCH2', 'BENCH3', 'BENCH4', 'BENCH5']):
-                    if vorp_scores[player_id] > max_vorp:
-                        max_vorp = vorp_scores[player_id]
-                        best_pick = player_id
-
-            if best_pick:
-                draft_results[team].append(best_pick)
-                available_players.remove(best_pick)
-
-                if player_position in needs:
-                    needs[player_position] -= 1
-                elif player_position in ['RB', 'WR', 'TE'] and needs['FLEX1'] > 0:
-                    needs['FLEX1'] -= 1
-                elif player_position in ['RB', 'WR', 'TE'] and needs['FLEX2'] > 0:
-                    needs['FLEX2'] -= 1
-                else:
-                    for bench_spot in ['BENCH1', 'BENCH2', 'BENCH3', 'BENCH4', 'BENCH5']:
-                        if needs[bench_spot] > 0:
-                            needs[bench_spot] -= 1
-                            break
-
-    # Print the simulated team for each team after the draft is complete
-    for team, players in draft_results.items():
-        team_roster = merged_data[merged_data['player_id'].isin(players)]
-        print(f"\nSimulated team for {team}:")
-        print(team_roster[['full_name', 'position', 'FPTS', 'VORP']])
+def _init_rollout_worker(context):
+    _ROLLOUT_CONTEXT.update(context)
 
-    return draft_results
+def _evaluate_candidate_in_worker(player_index):
+    return _evaluate_candidate(_ROLLOUT_CONTEXT, player_index)
 
-def get_user_info(identifier):
+def _evaluate_candidates_in_worker(state, player_indices):
+    context = dict(_ROLLOUT_CONTEXT, **state)
+    return [_evaluate_candidate(context, player_index) for player_index in player_indices]
+
+def rollout_executor(player_table, workers):
     """
-    Fetch the user object from Sleeper API using either username or user_id.
+    A process pool for evaluate_candidates that outlives a single call.
+
+    Each worker receives `player_table` once, when it starts; every evaluate_candidates call
+    then ships only the draft state with its tasks. Pass the pool only with the same table,
+    and shut it down when done (e.g. DraftRoom.close).
 
     Args:
-        identifier (str): The Sleeper username or user ID.
+        player_table (PlayerTable): The table every call will evaluate against.
+        workers (int): Number of worker processes.
 
     Returns:
-        dict: A dictionary containing user information, including user_id.
+        ProcessPoolExecutor: The pool.
     """
-    url = f"https://api.sleeper.app/v1/user/{identifier}"
-    
-    try:
-        response = requests.get(url)
-        if response.status_code == 200:
-            user_info = response.json()
-            user_id = user_info.get("user_id")
-            # print(f"User ID: {user_id}")
-            return user_info
-        else:
-            print(f"Failed to retrieve user info: {response.status_code} - {response.text}")
-            return None
-    except Exception as e:
-        print(f"An error occurred: {e}")
-        return None
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_rollout_worker,
+                               initargs=({'player_table': player_table},))
 
-def get_all_leagues_for_user(user_id, sport='nfl', season='2024'):
+def _evaluate_candidate(context, player_index):
     """
-    Fetch all leagues for a specific user in a given sport and season from the Sleeper API.
+    Draft `player_index` for my team, simulate the rest of the draft, and score my roster.
+
+    Returns:
+        tuple: (total_points, my team's simulated roster as player indices)
+    """
+    player_table = context['player_table']
+    my_team = context['my_team']
+    simulated_draft_results = {team: picks.copy() for team, picks in context['draft_results'].items()}
+    available_players = context['available_players'].copy()
+    team_needs = dict(context['team_needs'])
+
+    simulated_draft_results[my_team].append(player_index)
+    available_players[player_index] = False
+    team_needs[my_team] = _consume_roster_slot(team_needs[my_team], int(player_table.position[player_index]))
+
+    simulate_remaining_draft(
+        player_table, team_needs, simulated_draft_results, available_players,
+        queues=context['queues'].copy(available_players), cache=context.get('cache')
+    )
+
+    # Rostered players without a CBS projection count as zero points
+    total_points = float(np.nansum(player_table.fpts[simulated_draft_results[my_team]]))
+    return total_points, simulated_draft_results[my_team]
+
+def evaluate_candidates(player_table, draft_results, available_players, team_needs, my_team, candidates,
+                        workers=1, queues=None, cache=None, executor=None):
+    """
+    Run one full-draft rollout per candidate pick for my team.
 
     Args:
-        user_id (str): The numerical ID of the user.
-        sport (str): The sport for the leagues (default is 'nfl').
-        season (str): The season year (e.g., '2018', '2023').
+        player_table (PlayerTable): The table built by build_player_table.
+        draft_results (dict): Player indices already drafted by each team.
+        available_players (ndarray): Boolean availability mask by player index.
+        team_needs (dict): Packed open roster slots per team.
+        my_team (str): The team to pick for.
+        candidates (list): Player indices to try as my next pick.
+        workers (int): Number of worker processes; 1 runs the rollouts in-process.
+        queues (PositionQueues): Pick queues over available_players, if the caller keeps them.
+        cache (TranspositionCache): Draft-suffix cache shared by the rollouts. Worker processes
+            each get their own copy, so hits there are not reflected in the caller's stats.
+        executor (ProcessPoolExecutor): A pool from rollout_executor(player_table, workers) to run
+            the rollouts on; without one, workers > 1 starts a pool for this call only.
 
     Returns:
-        list: A list of dictionaries, each representing a league the user is in.
+        list: (total_points, my simulated roster) per candidate, in candidate order.
     """
-    url = f"https://api.sleeper.app/v1/user/{user_id}/leagues/{sport}/{season}"
-    
-    try:
-        response = requests.get(url)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            print(f"Failed to retrieve leagues: {response.status_code} - {response.text}")
-            return []
-    except Exception as e:
-        print(f"An error occurred: {e}")
-        return []
-    
-def get_rosters_for_league(league_id):
+    # Sort the position queues once; each rollout only copies the cursors
+    context = {
+        'player_table': player_table,
+        'my_team': my_team,
+        'draft_results': draft_results,
+        'available_players': available_players,
+        'team_needs': team_needs,
+        'queues': queues if queues is not None else PositionQueues.from_table(player_table, available_players),
+        'cache': cache,
+    }
+    count('picks_evaluated', len(candidates))
+
+    if executor is not None:
+        # The workers already hold the table; each chunk of player indices carries the draft state
+        chunksize = max(1, len(candidates) // (max(workers, 1) * 4))
+        state = {name: value for name, value in context.items() if name != 'player_table'}
+        chunks = [candidates[start:start + chunksize] for start in range(0, len(candidates), chunksize)]
+        results = executor.map(_evaluate_candidates_in_worker, [state] * len(chunks), chunks)
+        return [result for chunk in results for result in chunk]
+    if workers > 1:
+        # Ship the table and draft state to each worker once; tasks are just player indices
+        chunksize = max(1, len(candidates) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_rollout_worker, initargs=(context,)) as executor:
+            return list(executor.map(_evaluate_candidate_in_worker, candidates, chunksize=chunksize))
+    return [_evaluate_candidate(context, player_index) for player_index in candidates]
+
+# Boolean masks over position codes for the batched simulator
+_FLEX_CODE_MASK = np.array([code in _FLEX_CODES for code in range(len(SIM_POSITIONS))])
+_CAPPED_CODE_MASK = np.array([code in _CAPPED_CODES for code in range(len(SIM_POSITIONS))])
+
+def _eligible_code_matrix(needs):
+    """Batched _eligible_codes: (rows, NEEDS_COLUMNS) open slot counts -> (rows, SIM_POSITIONS) bool."""
+    open_own = needs[:, :len(SIM_POSITIONS)] > 0
+    open_flex = (needs[:, FLEX_COLUMN] > 0)[:, None] & _FLEX_CODE_MASK
+    open_bench = (needs[:, BENCH_COLUMN] > 0)[:, None]
+    return open_own | ((open_flex | open_bench) & ~_CAPPED_CODE_MASK)
+
+def _consume_roster_slots(needs, rows, codes):
+    """Batched _consume_roster_slot: fill one slot in each of `rows` of a (rows, NEEDS_COLUMNS) needs array, in place."""
+    known = codes < UNKNOWN_POSITION_CODE
+    rows, codes = rows[known], codes[known]
+    own = needs[rows, codes] > 0
+    flex = ~own & _FLEX_CODE_MASK[codes] & (needs[rows, FLEX_COLUMN] > 0)
+    bench = ~own & ~flex & (needs[rows, BENCH_COLUMN] > 0)
+    columns = np.where(own, codes, np.where(flex, FLEX_COLUMN, BENCH_COLUMN))
+    filled = own | flex | bench
+    needs[rows[filled], columns[filled]] -= 1
+
+def evaluate_candidates_batched(player_table, draft_results, available_players, team_needs, my_team, candidates):
     """
-    Fetch all rosters (teams) for a specific league from the Sleeper API.
+    Run the rollouts of evaluate_candidates for every candidate at once, in lockstep.
+
+    Every team's greedy pick is the head of one of the position queues (the best available
+    player at each position), so the draft state of all rollouts is a (candidates x
+    positions) matrix of queue cursors plus a (candidates x teams x NEEDS_COLUMNS) open-slot
+    tensor. The candidate itself is the only player a rollout drafts out of queue order; its
+    cursors step over it. Each team's turn is one masked argmin over the heads' pick order
+    for all rollouts instead of one Python-level rollout per candidate. Rollouts whose team
+    is already full skip that turn, exactly as simulate_remaining_draft does, so the results
+    are identical to the scalar simulator's.
 
     Args:
-        league_id (str): The ID of the league.
+        player_table (PlayerTable): The table built by build_player_table.
+        draft_results (dict): Player indices already drafted by each team.
+        available_players (ndarray): Boolean availability mask by player index.
+        team_needs (dict): Packed open roster slots per team, in draft order.
+        my_team (str): The team to pick for.
+        candidates (list): Player indices to try as my next pick.
 
     Returns:
-        list: A list of dictionaries, each representing a roster (team) in the league.
+        list: (total_points, my simulated roster) per candidate, in candidate order.
     """
-    url = f"https://api.sleeper.app/v1/league/{league_id}/rosters"
-    
-    try:
-        response = requests.get(url)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            print(f"Failed to retrieve rosters: {response.status_code} - {response.text}")
-            return None
-    except Exception as e:
-        print(f"An error occurred: {e}")
-        return None
+    count('picks_evaluated', len(candidates))
+    if not len(candidates):
+        return []
+    candidates = np.asarray(candidates, dtype=np.intp)
+    rows = np.arange(len(candidates))
 
-def fetch_league_rosters(league_id):
+    # Draftable pool in pick order (VORP descending, ties to the lower index), split into
+    # one queue per position; each queue ends in a sentinel that ranks after every player
+    pool = np.flatnonzero(
+        available_players & np.isfinite(player_table.vorp) & (player_table.position < UNKNOWN_POSITION_CODE)
+    )
+    pool = pool[np.lexsort((pool, -player_table.vorp[pool]))]
+    pool_codes = player_table.position[pool]
+    queue_players, queue_ranks, queue_starts = [], [], []
+    for code in range(len(SIM_POSITIONS)):
+        ranks = np.flatnonzero(pool_codes == code)
+        queue_starts.append(sum(len(queue) for queue in queue_players))
+        queue_players.append(np.append(pool[ranks], -1))
+        queue_ranks.append(np.append(ranks, len(pool)))
+    queue_players = np.concatenate(queue_players)
+    queue_ranks = np.concatenate(queue_ranks)
+    cursors = np.tile(np.array(queue_starts, dtype=np.intp), (len(candidates), 1))
+    # A candidate at the head of its own queue is skipped straight away
+    cursors += queue_players[cursors] == candidates[:, None]
+
+    teams = list(team_needs)
+    my_slot = teams.index(my_team)
+    needs = np.empty((len(candidates), len(teams), len(NEEDS_COLUMNS)), dtype=np.int16)
+    for slot, team in enumerate(teams):
+        needs[:, slot] = list(unpack_roster_needs(team_needs[team]).values())
+    _consume_roster_slots(needs[:, my_slot], rows, player_table.position[candidates].astype(np.intp))
+
+    my_rosters = [list(draft_results[my_team]) + [int(candidate)] for candidate in candidates]
+    while needs.any():
+        for slot in range(len(teams)):
+            team_slots = needs[:, slot]
+            picking = np.flatnonzero(team_slots.any(axis=1))
+            if not len(picking):
+                continue
+            head_ranks = np.where(
+                _eligible_code_matrix(team_slots[picking]), queue_ranks[cursors[picking]], len(pool)
+            )
+            codes = head_ranks.argmin(axis=1)
+            found = head_ranks[np.arange(len(picking)), codes] < len(pool)
+            # A team with no eligible player left keeps its remaining slots empty
+            team_slots[picking[~found]] = 0
+            picking, codes = picking[found], codes[found]
+            players = queue_players[cursors[picking, codes]]
+            cursors[picking, codes] += 1
+            cursors[picking, codes] += queue_players[cursors[picking, codes]] == candidates[picking]
+            _consume_roster_slots(team_slots, picking, codes)
+            if slot == my_slot:
+                for row, player_index in zip(picking.tolist(), players.tolist()):
+                    my_rosters[row].append(player_index)
+
+    count('rollouts', len(candidates))
+    # Rostered players without a CBS projection count as zero points
+    return [(float(np.nansum(player_table.fpts[roster])), roster) for roster in my_rosters]
+
+def _best_rollout(candidates, rollouts):
+    """Return (player index, total points, simulated roster) of the best rollout; the first one wins ties."""
+    best = (None, float('-inf'), None)
+    for player_index, (total_points, simulated_team) in zip(candidates, rollouts):
+        if total_points > best[1]:
+            best = (player_index, total_points, simulated_team)
+    return best
+
+def simulate_draft_for_my_team(player_table, team_needs, my_team, workers=1, cache=None, per_position=None,
+                               verify=False, drafted_players=None, batched=True):
     """
-    Fetch the roster information for a given league from the Sleeper API.
-    
+    Pick the player whose full simulated draft gives my team the most projected points.
+
+    Every available player with a non-negative VORP that fits my team's needs is tried as
+    the next pick, followed by a greedy simulation of the rest of the draft. With
+    `per_position`, players dominated by that many better players at the same position are
+    skipped first.
+
     Args:
-        league_id (str): The league ID to fetch the rosters for.
-    
+        player_table (PlayerTable): The table built by build_player_table.
+        team_needs (dict): Packed open roster slots per team (TEAM_ROSTER_NEEDS).
+        my_team (str): The team to pick for.
+        workers (int): Number of worker processes for the candidate rollouts; 1 runs them in-process.
+        cache (TranspositionCache): Draft-suffix cache to reuse, e.g. across re-plans; a new
+            one is used for this call if omitted.
+        per_position (int): Candidates kept per position by prune_dominated_candidates; None
+            (the default) simulates every potential pick. Under the greedy opponent model a
+            lower-VORP player is sometimes the better pick, so check a setting with verify.
+        verify (bool): Also simulate the pruned candidates and report whether the exhaustive
+            search agrees with the pruned pick.
+        drafted_players (dict): Player IDs rostered per team; defaults to DRAFTED_PLAYERS.
+        batched (bool): Simulate all candidates in lockstep with evaluate_candidates_batched
+            (same results, no draft-state cache). Only applies with workers=1.
+
     Returns:
-        list: A list of dictionaries containing roster information for each team in the league.
+        tuple: (best player_id, max total points), or (None, 0) when there is nothing to pick.
     """
-    url = f"https://api.sleeper.app/v1/league/{league_id}/rosters"
-    
-    try:
-        response = requests.get(url)
-        if response.status_code == 200:
-            return response.json()
+    # Checked once: per-candidate output is skipped entirely unless DEBUG is on
+    debug = logger.isEnabledFor(logging.DEBUG)
+    log_event(logger, logging.INFO, 'simulation_start', "Starting draft simulation for team: %s (%d players)",
+              my_team, len(player_table.player_id), team=my_team, players=len(player_table.player_id))
+    if debug:
+        logger.debug("Team needs for %s: %s", my_team, unpack_roster_needs(team_needs[my_team]))
+
+    simulated_draft_results, available_players, total_roster_needs = initial_draft_state(
+        player_table, team_needs, drafted_players
+    )
+
+    if not available_players.any():
+        logger.info("No available players to draft.")
+        return None, 0
+
+    if debug:
+        logger.debug("Total roster needs after adjusting for drafted players: %s",
+                     {team: unpack_roster_needs(needs) for team, needs in total_roster_needs.items()})
+
+    potential_picks = find_potential_picks(player_table, available_players, team_needs[my_team])
+
+    if debug:
+        logger.debug("Potential picks for %s: %s", my_team,
+                     {player_table.player_id[i]: round(float(vorp), 1) for i, vorp in potential_picks.items()})
+
+    if not potential_picks:
+        logger.info("No valid picks available for %s based on current needs.", my_team)
+        return None, 0
+
+    candidates = list(potential_picks)
+    if per_position is not None:
+        candidates = list(prune_dominated_candidates(player_table, potential_picks, per_position))
+        log_event(logger, logging.INFO, 'candidates_pruned',
+                  "Pruned %d dominated of %d potential picks (%d rollouts avoided)",
+                  len(potential_picks) - len(candidates), len(potential_picks), len(potential_picks) - len(candidates),
+                  pruned=len(potential_picks) - len(candidates), potential_picks=len(potential_picks))
+
+    batched = batched and workers == 1
+    cache = cache if cache is not None else TranspositionCache()
+
+    def evaluate(candidates):
+        if batched:
+            return evaluate_candidates_batched(
+                player_table, simulated_draft_results, available_players, total_roster_needs, my_team, candidates
+            )
+        return evaluate_candidates(
+            player_table, simulated_draft_results, available_players, total_roster_needs, my_team, candidates, workers,
+            cache=cache
+        )
+
+    rollouts = evaluate(candidates)
+
+    if debug:
+        for player_index, (total_points, _) in zip(candidates, rollouts):
+            log_event(logger, logging.DEBUG, 'candidate', "Total points for simulated pick %s: %s",
+                      player_table.player_id[player_index], total_points,
+                      player_id=player_table.player_id[player_index], total_points=total_points)
+
+    # Reduce in candidate order so ties resolve the same way for any worker count
+    best_final_pick, max_total_points, best_simulated_team = _best_rollout(candidates, rollouts)
+
+    if verify and len(candidates) < len(potential_picks):
+        kept = set(candidates)
+        pruned = [player_index for player_index in potential_picks if player_index not in kept]
+        pruned_rollouts = evaluate(pruned)
+        # Merge back in potential_picks order so ties resolve exactly as an unpruned run would
+        results = dict(zip(candidates, rollouts))
+        results.update(zip(pruned, pruned_rollouts))
+        exhaustive_pick, exhaustive_points, _ = _best_rollout(list(potential_picks), [results[i] for i in potential_picks])
+        if exhaustive_pick == best_final_pick:
+            log_event(logger, logging.INFO, 'verification', "Verification passed: exhaustive search also picks %s",
+                      player_table.player_id[best_final_pick], passed=True)
         else:
-            print(f"Failed to retrieve rosters: {response.status_code} - {response.text}")
-            return []
-    except Exception as e:
-        print(f"An error occurred: {e}")
-        return []
+            log_event(logger, logging.WARNING, 'verification',
+                      "Verification FAILED: exhaustive search picks %s (%s) instead of %s (%s)",
+                      player_table.player_id[exhaustive_pick], exhaustive_points,
+                      player_table.player_id[best_final_pick], max_total_points,
+                      passed=False, exhaustive_pick=player_table.player_id[exhaustive_pick],
+                      exhaustive_points=exhaustive_points)
+
+    if workers == 1 and not batched:
+        log_event(logger, logging.INFO, 'cache_stats', "Draft state cache: %s", cache.stats(), **cache.stats())
+
+    if best_simulated_team and logger.isEnabledFor(logging.INFO):
+        roster = _roster_frame(player_table, best_simulated_team)
+        log_event(logger, logging.INFO, 'best_pick', "Best simulated team for %s after picking %s (%s points):\n%s",
+                  my_team, player_table.full_name[best_final_pick], max_total_points, roster,
+                  team=my_team, player_id=player_table.player_id[best_final_pick], total_points=max_total_points,
+                  roster=roster.to_dict('records'))
+
+    if best_final_pick is None:
+        return None, max_total_points
+    return player_table.player_id[best_final_pick], max_total_points
+
+def simulate_remaining_draft(player_table, team_needs, draft_results, available_players, verbose=False, queues=None,
+                             cache=None):
+    """
+    Greedily fill every team's open roster slots, one pick per team per round.
+
+    Each team takes the highest-VORP available player it has an open slot for, with ties
+    going to the lower player index. Players without a VORP are never drafted. A team that
+    has no eligible player left keeps its remaining slots empty.
+
+    With a cache, the state at the start of every round (the unavailable players and every
+    team's needs) is looked up first; on a hit the rest of the draft is replayed from the
+    cached picks instead of simulated.
+
+    Args:
+        player_table (PlayerTable): The table built by build_player_table.
+        team_needs (dict): Packed open roster slots per team, updated in place.
+        draft_results (dict): Player indices drafted by each team, appended to in place.
+        available_players (ndarray): Boolean availability mask by player index, updated in place.
+        verbose (bool): Log every team's simulated roster at DEBUG once the draft is complete.
+        queues (PositionQueues): Pick queues over available_players; built from the table if omitted.
+        cache (TranspositionCache): Cache of draft suffixes shared between rollouts, if any.
+
+    Returns:
+        dict: The updated draft_results.
+    """
+    if queues is None:
+        queues = PositionQueues.from_table(player_table, available_players)
+    # Counted per rollout rather than per pick, to keep the pick loop free of bookkeeping
+    picks_before = sum(len(players) for players in draft_results.values())
+
+    if cache is not None:
+        hits_before, misses_before = cache.hits, cache.misses
+        zobrist_keys = cache.bind(player_table).keys
+        state_hash = cache.state_hash(available_players)
+        pick_log = []
+        round_starts = []
+
+    while any(team_needs.values()):
+        if cache is not None:
+            state = (state_hash, tuple(team_needs.items()))
+            cached = cache.get(state)
+            if cached is not None:
+                picks, start = cached
+                for team, player_index in picks[start:]:
+                    queues.take(player_index)
+                    draft_results[team].append(player_index)
+                pick_log.extend(picks[start:])
+                for team in team_needs:
+                    team_needs[team] = 0
+                break
+            round_starts.append((state, len(pick_log)))
+
+        for team, needs in team_needs.items():
+            if not needs:
+                continue
+
+            best_pick = queues.best(_eligible_codes(needs))
+            if best_pick is None:
+                team_needs[team] = 0
+                continue
+
+            queues.take(best_pick)
+            draft_results[team].append(best_pick)
+            team_needs[team] = _consume_roster_slot(needs, queues.positions[best_pick])
+            if cache is not None:
+                pick_log.append((team, best_pick))
+                state_hash ^= zobrist_keys[best_pick]
+
+    if cache is not None and round_starts:
+        # Every round start seen on the way shares the one pick log, from its own offset
+        picks = tuple(pick_log)
+        for state, start in round_starts:
+            cache.put(state, (picks, start))
+
+    count('rollouts')
+    count('picks_simulated', sum(len(players) for players in draft_results.values()) - picks_before)
+    if cache is not None:
+        count('cache_hits', cache.hits - hits_before)
+        count('cache_lookups', cache.hits - hits_before + cache.misses - misses_before)
+
+    if verbose and logger.isEnabledFor(logging.DEBUG):
+        # Rendering the rosters is the expensive part, so only do it when it will be shown
+        for team, players in draft_results.items():
+            logger.debug("Simulated team for %s:\n%s", team, _roster_frame(player_table, players))
+
+    return draft_results
 
 def update_teams_data(rosters):
     """
@@ -516,13 +1182,7 @@ def update_teams_data(rosters):
         rosters (list): A list of dictionaries containing roster information for each team.
     """
     global TEAMS, TEAM_ROSTER_NEEDS, DRAFTED_PLAYERS
-    
-    # Extract team names based on the owner's ID
-    TEAMS = [f"Team_{roster['roster_id']}" for roster in rosters]
-    
-    # Update the TEAM_ROSTER_NEEDS and DRAFTED_PLAYERS dictionaries
-    TEAM_ROSTER_NEEDS = {team: POSITIONS.copy() for team in TEAMS}
-    DRAFTED_PLAYERS = {team: roster['players'] if roster['players'] else [] for team, roster in zip(TEAMS, rosters)}
+    TEAMS, TEAM_ROSTER_NEEDS, DRAFTED_PLAYERS = teams_data(rosters)
 
 def update_team_roster_needs(team, player_position, team_needs):
     """
@@ -531,176 +1191,213 @@ def update_team_roster_needs(team, player_position, team_needs):
     Args:
         team (str): The team name.
         player_position (str): The position of the drafted player.
-        team_needs (dict): The current needs of all teams.
+        team_needs (dict): The current packed needs of all teams.
     """
     if team not in team_needs:
-        print(f"Warning: Team '{team}' not found in TEAM_ROSTER_NEEDS.")
+        logger.warning("Team '%s' not found in TEAM_ROSTER_NEEDS.", team)
         return
     
-    if player_position in team_needs[team]:
-        team_needs[team].remove(player_position)
-    elif player_position in ['RB', 'WR', 'TE'] and 'FLEX1' in team_needs[team]:
-        team_needs[team].remove('FLEX1')
-    elif player_position in ['RB', 'WR', 'TE'] and 'FLEX2' in team_needs[team]:
-        team_needs[team].remove('FLEX2')
-    elif 'BENCH1' in team_needs[team]:
-        for i in range(1, 6):  # Attempt to remove from BENCH1 to BENCH5
-            bench_spot = f'BENCH{i}'
-            if bench_spot in team_needs[team]:
-                team_needs[team].remove(bench_spot)
-                break
+    team_needs[team] = _consume_roster_slot(team_needs[team], POSITION_CODES.get(player_position, UNKNOWN_POSITION_CODE))
 
-def get_league_users(league_id):
+def load_player_table(merged_csv=None):
     """
-    Retrieves all users in a Sleeper league.
+    Run the projection pipeline (Excel, Sleeper players, merge, baselines, VORP) and build the player table.
+
+    The table is also saved to the cache for load_cached_player_table and draft_cli.
 
     Args:
-        league_id (str): The ID of the league to retrieve users from.
+        merged_csv (str): Optional path to a saved merged_data_output.csv to use instead of
+            loading the Excel file and fetching players from Sleeper.
 
     Returns:
-        list: A list of dictionaries, each containing user information.
+        PlayerTable: The simulator's player table.
     """
-    url = f"https://api.sleeper.app/v1/league/{league_id}/users"
-    
-    try:
-        response = requests.get(url)
-        response.raise_for_status()  # Raise an HTTPError for bad responses (4xx or 5xx)
-        users = response.json()
-        return users
-    
-    except requests.exceptions.RequestException as e:
-        print(f"An error occurred: {e}")
-        return None
+    if merged_csv:
+        merged_data = pd.read_csv(merged_csv, dtype={'player_id': str})
+    else:
+        merged_data = merge_data(load_and_process_excel(excel_file_path), fetch_data_from_sleeper())
+    calculate_vorp(merged_data, identify_baseline_players(merged_data))
+    player_table = build_player_table(merged_data)
+    save_player_table_cache(player_table, merged_data)
+    return player_table
+
+def run_pipeline(stages=None):
+    """
+    Run the draft-day pipeline: load the league, projections and players, then simulate my next pick.
+
+    Args:
+        stages (StageRecorder): Records each numbered step's timings and counters; a new one is used if omitted.
+    """
+    stages = stages if stages is not None else StageRecorder()
+
+    # Start the users, rosters and players requests together; the players download
+    # also overlaps with the Excel parse in step 5
+    client = default_client()
+    users_request = client.submit(get_league_users, LEAGUE_ID, client)
+    rosters_request = client.submit(fetch_league_rosters, LEAGUE_ID, client)
+    players_request = client.submit(fetch_data_from_sleeper, client=client)
 
-def main():
     # Step 1: Fetch league users and populate TEAMS
-    print("Fetching league users...")
-    users = get_league_users(LEAGUE_ID)
-    
-    if not users:
-        print("No users found for the league.")
-        return
-    
-    TEAMS = []
-    for user in users:
-        team_name = user['metadata'].get('team_name', 'Unnamed Team')
-        user_id = user['user_id']
-        TEAMS.append({'team_name': team_name, 'user_id': user_id})
-    
-        # Step 2: Fetch league rosters and associate with teams
-    print("Fetching league rosters...")
-    rosters = fetch_league_rosters(LEAGUE_ID)
-    
-    if not rosters:
-        print("No rosters found for the league.")
-        return
-    
-    TEAM_INFO = []
-
-    for roster in rosters:
-        roster_id = roster['roster_id']
-        owner_id = roster['owner_id']
-        # Find the corresponding team name and user ID
-        team_info = next((team for team in TEAMS if team['user_id'] == owner_id), {"team_name": "Unknown Team", "user_id": owner_id})
-        team_name = team_info['team_name']
-        user_id = team_info['user_id']
-        
-        # Add the team info including name, user ID, and roster ID
-        TEAM_INFO.append({
-            'team_name': team_name,
-            'user_id': user_id,
-            'roster_id': roster_id
-        })
+    with stages.stage('1. League users'):
+        print("Fetching league users...")
+        users = users_request.result()
+
+        if not users:
+            print("No users found for the league.")
+            return
+
+        TEAMS = []
+        for user in users:
+            team_name = user['metadata'].get('team_name', 'Unnamed Team')
+            user_id = user['user_id']
+            TEAMS.append({'team_name': team_name, 'user_id': user_id})
+
+    # Step 2: Fetch league rosters and associate with teams
+    with stages.stage('2. League rosters'):
+        print("Fetching league rosters...")
+        rosters = rosters_request.result()
+
+        if not rosters:
+            print("No rosters found for the league.")
+            return
+
+        TEAM_INFO = []
+
+        for roster in rosters:
+            roster_id = roster['roster_id']
+            owner_id = roster['owner_id']
+            # Find the corresponding team name and user ID
+            team_info = next((team for team in TEAMS if team['user_id'] == owner_id), {"team_name": "Unknown Team", "user_id": owner_id})
+            team_name = team_info['team_name']
+            user_id = team_info['user_id']
+
+            # Add the team info including name, user ID, and roster ID
+            TEAM_INFO.append({
+                'team_name': team_name,
+                'user_id': user_id,
+                'roster_id': roster_id
+            })
 
     # Step 3: Print the team info including name, user ID, and roster ID
-    print("\nTEAM INFORMATION:")
-    for team in TEAM_INFO:
-        print(f"Team Name: {team['team_name']}, User ID: {team['user_id']}, Roster ID: {team['roster_id']}")
+    with stages.stage('3. Team info'):
+        print("\nTEAM INFORMATION:")
+        for team in TEAM_INFO:
+            print(f"Team Name: {team['team_name']}, User ID: {team['user_id']}, Roster ID: {team['roster_id']}")
 
     # Step 4: Update the team data with roster needs and drafted players
-    print("Updating team data...")
-    update_teams_data(rosters)
-    
+    with stages.stage('4. Team data'):
+        print("Updating team data...")
+        update_teams_data(rosters)
+
     # Step 5: Load and process the Excel file
-    try:
-        print("Loading and processing the Excel file...")
-        cbs_data = load_and_process_excel(excel_file_path)
-        print("Excel data loaded and processed successfully.")
-        
-        # Write the CBS data to a CSV file
-        cbs_data.to_csv('cbs_data_output.csv', index=False)
-        print("CBS data written to cbs_data_output.csv")
-    except Exception as e:
-        print(f"Error loading or processing Excel data: {e}")
-        return
+    with stages.stage('5. Excel projections'):
+        try:
+            print("Loading and processing the Excel file...")
+            cbs_data = load_and_process_excel(excel_file_path)
+            print("Excel data loaded and processed successfully.")
+
+            # Write the CBS data to a CSV file
+            cbs_data.to_csv('cbs_data_output.csv', index=False)
+            print("CBS data written to cbs_data_output.csv")
+        except Exception as e:
+            print(f"Error loading or processing Excel data: {e}")
+            return
 
     # Step 6: Fetch data from Sleeper API
-    try:
-        print("Fetching data from Sleeper API...")
-        sleeper_data = fetch_data_from_sleeper()
-        print("Sleeper data fetched successfully.")
-        
-        # Write the Sleeper data to a CSV file
-        sleeper_data.to_csv('sleeper_data_output.csv', index=False)
-        print("Sleeper data written to sleeper_data_output.csv")
-    except Exception as e:
-        print(f"Error fetching Sleeper data: {e}")
-        return
+    with stages.stage('6. Sleeper players'):
+        try:
+            print("Fetching data from Sleeper API...")
+            sleeper_data = players_request.result()
+            print("Sleeper data fetched successfully.")
+
+            # Write the Sleeper data to a CSV file
+            sleeper_data.to_csv('sleeper_data_output.csv', index=False)
+            print("Sleeper data written to sleeper_data_output.csv")
+        except Exception as e:
+            print(f"Error fetching Sleeper data: {e}")
+            return
 
     # Step 7: Merge CBS data with Sleeper data
-    try:
-        print("Merging CBS data with Sleeper data...")
-        merged_data = merge_data(cbs_data, sleeper_data)
-        if merged_data is None:
-            print("Process stopped due to unmatched players or defenses.")
+    with stages.stage('7. Merge'):
+        try:
+            print("Merging CBS data with Sleeper data...")
+            merged_data, unmatched_players = merge_data(cbs_data, sleeper_data, return_report=True)
+            if merged_data is None:
+                print("Process stopped due to unmatched players or defenses.")
+                return
+            print("Data merged successfully.")
+
+            # Write the merged data and the CBS players that found no Sleeper match to CSV files
+            merged_data.to_csv('merged_data_output.csv', index=False)
+            unmatched_players.to_csv('unmatched_players_output.csv', index=False)
+            print(f"{len(unmatched_players)} unmatched CBS players written to unmatched_players_output.csv")
+        except Exception as e:
+            print(f"Error during data merging: {e}")
             return
-        print("Data merged successfully.")
-
-        # Write the merged data to a CSV file
-        merged_data.to_csv('merged_data_output.csv', index=False)
-    except Exception as e:
-        print(f"Error during data merging: {e}")
-        return
 
     # Step 8: Identify baseline players
-    try:
-        print("Identifying baseline players...")
-        baseline_players = identify_baseline_players(merged_data)
-        print("Baseline players identified successfully.")
-    except Exception as e:
-        print(f"Error identifying baseline players: {e}")
-        return
+    with stages.stage('8. Baselines'):
+        try:
+            print("Identifying baseline players...")
+            baseline_players = identify_baseline_players(merged_data)
+            print("Baseline players identified successfully.")
+        except Exception as e:
+            print(f"Error identifying baseline players: {e}")
+            return
 
     # Step 9: Calculate VORP
-    try:
-        print("Calculating VORP scores...")
-        vorp_scores = calculate_vorp(merged_data, baseline_players)
-        print("VORP scores calculated successfully.")
-    except Exception as e:
-        print(f"Error calculating VORP scores: {e}")
-        return
+    with stages.stage('9. VORP'):
+        try:
+            print("Calculating VORP scores...")
+            calculate_vorp(merged_data, baseline_players)  # Adds the VORP column build_player_table reads
+            print("VORP scores calculated successfully.")
+        except Exception as e:
+            print(f"Error calculating VORP scores: {e}")
+            return
+
+        player_table = build_player_table(merged_data)
+        save_player_table_cache(player_table, merged_data)
 
     # Step 10: Filter players by team needs
-    try:
-        print("Filtering players by team needs...")
-        filtered_team_vorp_scores = filter_by_team_needs(vorp_scores, merged_data)
-        print("Players filtered by team needs successfully.")
-    except Exception as e:
-        print(f"Error filtering players by team needs: {e}")
-        return
+    with stages.stage('10. Filter by team needs'):
+        try:
+            print("Filtering players by team needs...")
+            filter_by_team_needs(player_table)  # Warns about teams with no eligible players
+            print("Players filtered by team needs successfully.")
+        except Exception as e:
+            print(f"Error filtering players by team needs: {e}")
+            return
 
     # Step 11: Simulate the draft for your team
-    try:
-        print("Simulating the draft for your team...")
-        best_pick, best_total_points = simulate_draft_for_my_team(vorp_scores, TEAM_ROSTER_NEEDS, merged_data, 'Team_10')
-        if best_pick is not None:
-            best_pick_name = merged_data.loc[merged_data['player_id'] == best_pick, 'full_name'].values[0]
-            print(f"The best pick for your team is {best_pick_name} with a projected total points of {best_total_points}.")
-        else:
-            print("No suitable pick found for your team.")
-    except Exception as e:
-        print(f"Error during draft simulation: {e}")
-        return
+    with stages.stage('11. Simulate draft'):
+        try:
+            print("Simulating the draft for your team...")
+            best_pick, best_total_points = simulate_draft_for_my_team(player_table, TEAM_ROSTER_NEEDS, 'Team_10')
+            if best_pick is not None:
+                best_pick_name = player_table.full_name[player_table.index[best_pick]]
+                print(f"The best pick for your team is {best_pick_name} with a projected total points of {best_total_points}.")
+            else:
+                print("No suitable pick found for your team.")
+        except Exception as e:
+            print(f"Error during draft simulation: {e}")
+            return
+
+def main():
+    parser = argparse.ArgumentParser(description="Load the league and projections and simulate the best next pick.")
+    parser.add_argument('--profile', nargs='?', const='profile_report.txt',
+                        help="Run under cProfile and tracemalloc and write a report (default profile_report.txt)")
+    args = parser.parse_args()
+
+    configure_logging()
+    stages = StageRecorder()
+    if args.profile:
+        with profiled(args.profile, stages):
+            run_pipeline(stages)
+        print(f"Profile report written to {args.profile}")
+    else:
+        run_pipeline(stages)
+    print("\nSTAGE TIMINGS:")
+    print(stages.report())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
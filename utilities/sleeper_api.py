@@ -0,0 +1,171 @@
+from sleeper_client import default_client
+
+# requests is not imported here so that callers using LightSleeperClient never load it; its
+# RequestException derives from OSError, which is what the functions below catch.
+
+
+def get_user_info(identifier, client=None):
+    """
+    Fetch the user object from Sleeper API using either username or user_id.
+
+    Args:
+        identifier (str): The Sleeper username or user ID.
+        client (SleeperClient): API client; defaults to the shared client.
+
+    Returns:
+        dict: A dictionary containing user information, including user_id.
+    """
+    client = client or default_client()
+    
+    try:
+        response = client.get(f"/user/{identifier}")
+        if response.status_code == 200:
+            user_info = response.json()
+            user_id = user_info.get("user_id")
+            # print(f"User ID: {user_id}")
+            return user_info
+        else:
+            print(f"Failed to retrieve user info: {response.status_code} - {response.text}")
+            return None
+    except Exception as e:
+        print(f"An error occurred: {e}")
+        return None
+
+def get_all_leagues_for_user(user_id, sport='nfl', season='2024', client=None):
+    """
+    Fetch all leagues for a specific user in a given sport and season from the Sleeper API.
+
+    Args:
+        user_id (str): The numerical ID of the user.
+        sport (str): The sport for the leagues (default is 'nfl').
+        season (str): The season year (e.g., '2018', '2023').
+        client (SleeperClient): API client; defaults to the shared client.
+
+    Returns:
+        list: A list of dictionaries, each representing a league the user is in.
+    """
+    client = client or default_client()
+    
+    try:
+        response = client.get(f"/user/{user_id}/leagues/{sport}/{season}")
+        if response.status_code == 200:
+            return response.json()
+        else:
+            print(f"Failed to retrieve leagues: {response.status_code} - {response.text}")
+            return []
+    except Exception as e:
+        print(f"An error occurred: {e}")
+        return []
+    
+def get_rosters_for_league(league_id, client=None):
+    """
+    Fetch all rosters (teams) for a specific league from the Sleeper API.
+
+    Args:
+        league_id (str): The ID of the league.
+        client (SleeperClient): API client; defaults to the shared client.
+
+    Returns:
+        list: A list of dictionaries, each representing a roster (team) in the league.
+    """
+    client = client or default_client()
+    
+    try:
+        response = client.get(f"/league/{league_id}/rosters")
+        if response.status_code == 200:
+            return response.json()
+        else:
+            print(f"Failed to retrieve rosters: {response.status_code} - {response.text}")
+            return None
+    except Exception as e:
+        print(f"An error occurred: {e}")
+        return None
+
+def fetch_league_rosters(league_id, client=None):
+    """
+    Fetch the roster information for a given league from the Sleeper API.
+    
+    Args:
+        league_id (str): The league ID to fetch the rosters for.
+        client (SleeperClient): API client; defaults to the shared client.
+    
+    Returns:
+        list: A list of dictionaries containing roster information for each team in the league.
+    """
+    client = client or default_client()
+    
+    try:
+        response = client.get(f"/league/{league_id}/rosters")
+        if response.status_code == 200:
+            return response.json()
+        else:
+            print(f"Failed to retrieve rosters: {response.status_code} - {response.text}")
+            return []
+    except Exception as e:
+        print(f"An error occurred: {e}")
+        return []
+
+def get_league_users(league_id, client=None):
+    """
+    Retrieves all users in a Sleeper league.
+
+    Args:
+        league_id (str): The ID of the league to retrieve users from.
+        client (SleeperClient): API client; defaults to the shared client.
+
+    Returns:
+        list: A list of dictionaries, each containing user information.
+    """
+    client = client or default_client()
+    
+    try:
+        response = client.get(f"/league/{league_id}/users")
+        response.raise_for_status()  # Raise an HTTPError for bad responses (4xx or 5xx)
+        users = response.json()
+        return users
+    
+    except OSError as e:
+        print(f"An error occurred: {e}")
+        return None
+
+def get_league(league_id, client=None):
+    """
+    Fetch a league object (settings, roster positions and its draft_id) from the Sleeper API.
+
+    Args:
+        league_id (str): The ID of the league.
+        client (SleeperClient): API client; defaults to the shared client.
+
+    Returns:
+        dict: The league object, or None if the request failed.
+    """
+    client = client or default_client()
+
+    try:
+        response = client.get(f"/league/{league_id}")
+        response.raise_for_status()
+        return response.json()
+    except OSError as e:
+        print(f"An error occurred: {e}")
+        return None
+
+def get_draft_picks(draft_id, client=None):
+    """
+    Fetch every pick made so far in a draft from the Sleeper API.
+
+    Args:
+        draft_id (str): The ID of the draft.
+        client (SleeperClient): API client; defaults to the shared client.
+
+    Returns:
+        list: Pick dictionaries (pick_no, roster_id, player_id, ...) in pick order, or None on failure.
+    """
+    client = client or default_client()
+
+    try:
+        response = client.get(f"/draft/{draft_id}/picks")
+        response.raise_for_status()
+        return response.json() or []
+    except OSError as e:
+        print(f"An error occurred: {e}")
+        return None
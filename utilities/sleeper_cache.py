@@ -0,0 +1,198 @@
+import hashlib
+import os
+import pickle
+import time
+
+from draft_logging import get_logger
+
+logger = get_logger('cache')
+
+# Directory for cached API payloads (override with FFP_CACHE_DIR)
+CACHE_DIR = os.environ.get('FFP_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache'))
+
+# Sleeper asks clients to fetch the players dump at most once a day
+PLAYERS_CACHE_TTL = 24 * 60 * 60
+
+# Bump when the layout of cached entries changes so old files are ignored
+CACHE_FORMAT_VERSION = 1
+
+# Entry holding the last player table built by the pipeline, for the command-line tools
+PLAYER_TABLE_CACHE_NAME = 'player_table.pkl'
+
+
+def _read_entry(path):
+    try:
+        with open(path, 'rb') as f:
+            entry = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    if not isinstance(entry, dict) or entry.get('version') != CACHE_FORMAT_VERSION:
+        return None
+    return entry
+
+
+def _write_entry(path, entry):
+    # Write to a temporary file and rename so readers never see a partial cache
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, path)
+
+
+def cached_fetch(url, parse, cache_name, ttl=PLAYERS_CACHE_TTL, cache_dir=None, timeout=30, client=None):
+    """
+    Fetch a URL through an on-disk cache of its parsed result.
+
+    A cached result younger than `ttl` seconds is returned without touching the network or
+    parsing anything. An expired one is revalidated with If-None-Match / If-Modified-Since;
+    a 304 answer renews it. A new payload is parsed and stored. If the request fails and a
+    stale result exists, the stale result is returned.
+
+    Args:
+        url (str): The URL to fetch.
+        parse (callable): Turns the requests.Response into the value to cache and return.
+        cache_name (str): File name of the cache entry inside the cache directory.
+        ttl (float): Seconds a cached result is used without revalidation.
+        cache_dir (str): Cache directory; defaults to CACHE_DIR.
+        timeout (float): Request timeout in seconds when no client is given.
+        client (SleeperClient): Client whose pooled session, timeouts and retries to use.
+
+    Returns:
+        The parsed (possibly cached) result.
+    """
+    # Imported here so reading the cache does not pay for loading requests
+    import requests
+
+    path = os.path.join(cache_dir or CACHE_DIR, cache_name)
+    entry = _read_entry(path)
+    if entry is not None and entry['url'] != url:
+        entry = None
+
+    if entry is not None and time.time() - entry['fetched_at'] < ttl:
+        return entry['data']
+
+    headers = {}
+    if entry is not None:
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+
+    try:
+        if client is not None:
+            response = client.get(url, headers=headers, stream=True)
+        else:
+            response = requests.get(url, headers=headers, timeout=timeout, stream=True)
+    except requests.exceptions.RequestException as e:
+        if entry is not None:
+            logger.warning("Using stale cache for %s: %s", url, e)
+            return entry['data']
+        raise
+
+    # The body is streamed, so release the pooled connection whether or not it is read
+    try:
+        if response.status_code == 304 and entry is not None:
+            entry['fetched_at'] = time.time()
+            _write_entry(path, entry)
+            return entry['data']
+
+        if response.status_code != 200:
+            if entry is not None:
+                logger.warning("Using stale cache for %s: HTTP %s", url, response.status_code)
+                return entry['data']
+            raise Exception(f"Failed to fetch data from Sleeper API: {response.status_code}")
+
+        data = parse(response)
+    finally:
+        response.close()
+    _write_entry(path, {
+        'version': CACHE_FORMAT_VERSION,
+        'url': url,
+        'fetched_at': time.time(),
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'data': data,
+    })
+    return data
+
+
+def _file_digest(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cached_file_load(path, load, cache_name=None, version=1, cache_dir=None):
+    """
+    Load a local file through an on-disk cache of its processed result.
+
+    The cache entry is keyed on the file's path, mtime, size and content hash. When the mtime
+    and size are unchanged the file is not read at all; when only the mtime changed, a matching
+    content hash still reuses the cached result.
+
+    Args:
+        path (str): The source file.
+        load (callable): Turns the file path into the value to cache and return.
+        cache_name (str): File name of the cache entry; derived from the path by default.
+        version (int): Version of `load`'s output; bump it when the processing changes.
+        cache_dir (str): Cache directory; defaults to CACHE_DIR.
+
+    Returns:
+        The processed (possibly cached) result.
+    """
+    source = os.path.abspath(path)
+    if cache_name is None:
+        stem = os.path.splitext(os.path.basename(source))[0]
+        cache_name = f"{stem}_{hashlib.sha1(source.encode()).hexdigest()[:12]}.pkl"
+    cache_path = os.path.join(cache_dir or CACHE_DIR, cache_name)
+
+    stat = os.stat(source)
+    entry = _read_entry(cache_path)
+    if entry is not None and (entry.get('source') != source or entry.get('load_version') != version):
+        entry = None
+
+    if entry is not None and entry['mtime'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+        return entry['data']
+
+    content_hash = _file_digest(source)
+    if entry is not None and entry['sha1'] == content_hash:
+        entry['mtime'] = stat.st_mtime_ns
+        _write_entry(cache_path, entry)
+        return entry['data']
+
+    data = load(source)
+    _write_entry(cache_path, {
+        'version': CACHE_FORMAT_VERSION,
+        'source': source,
+        'load_version': version,
+        'mtime': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'sha1': content_hash,
+        'data': data,
+    })
+    return data
+
+
+def save_cached_value(cache_name, data, cache_dir=None):
+    """Store a value computed locally (not fetched from a URL or loaded from a file) in the cache."""
+    _write_entry(os.path.join(cache_dir or CACHE_DIR, cache_name), {
+        'version': CACHE_FORMAT_VERSION,
+        'saved_at': time.time(),
+        'data': data,
+    })
+
+
+def load_cached_value(cache_name, cache_dir=None):
+    """
+    Read a value stored with save_cached_value.
+
+    Returns:
+        tuple: (value, seconds since it was saved), or None if there is no readable entry.
+    """
+    entry = _read_entry(os.path.join(cache_dir or CACHE_DIR, cache_name))
+    if entry is None or 'saved_at' not in entry:
+        return None
+    return entry['data'], time.time() - entry['saved_at']
@@ -0,0 +1,176 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+# Root of the Sleeper API (overridable to point at a local stub server)
+SLEEPER_API_BASE = 'https://api.sleeper.app/v1'
+
+
+class SleeperClient:
+    """
+    Shared Sleeper API client: one pooled keep-alive session, timeouts, bounded retries
+    with exponential backoff, and a thread pool for issuing requests concurrently.
+
+    Usage:
+        client = SleeperClient()
+        users, rosters = client.gather(
+            (client.get_json, f"/league/{league_id}/users"),
+            (client.get_json, f"/league/{league_id}/rosters"),
+        )
+    """
+
+    def __init__(self, base_url=SLEEPER_API_BASE, timeout=(3.05, 30), retries=3, backoff=0.5, max_workers=8):
+        """
+        Args:
+            base_url (str): Root of the Sleeper API.
+            timeout (float or tuple): Requests timeout, or (connect, read) timeouts, in seconds.
+            retries (int): Retries for connection errors, 429 and 5xx responses.
+            backoff (float): Backoff factor; retry n waits backoff * 2 ** (n - 1) seconds.
+            max_workers (int): Size of the connection pool and of the gather thread pool.
+        """
+        # Imported here so modules that only need LightSleeperClient start without loading requests
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.session = requests.Session()
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET']),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers, max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._max_workers = max_workers
+        self._executor = None
+
+    def url(self, path):
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def get(self, path, **kwargs):
+        """GET a path relative to base_url (or an absolute URL) through the pooled session."""
+        url = path if path.startswith(('http://', 'https://')) else self.url(path)
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.get(url, **kwargs)
+
+    def get_json(self, path, **kwargs):
+        """GET a path and decode its JSON body, raising requests.HTTPError on error statuses."""
+        response = self.get(path, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    def submit(self, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) on the client's thread pool and return its Future."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix='sleeper')
+        return self._executor.submit(fn, *args, **kwargs)
+
+    def gather(self, *calls):
+        """
+        Run several calls concurrently and return their results in order.
+
+        Args:
+            *calls: Callables, or (callable, arg, ...) tuples.
+
+        Returns:
+            list: Each call's return value; the first exception raised is re-raised.
+        """
+        futures = [
+            self.submit(call[0], *call[1:]) if isinstance(call, tuple) else self.submit(call)
+            for call in calls
+        ]
+        return [future.result() for future in futures]
+
+    def map(self, fn, items):
+        """Fan fn out over items concurrently (e.g. one request per league) and return results in order."""
+        return self.gather(*[(fn, item) for item in items])
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class InvalidJSONError(OSError, ValueError):
+    """A response body that is not JSON; an OSError like requests' JSONDecodeError, so callers catch one type."""
+
+
+class LightResponse:
+    """The parts of a requests.Response that the sleeper_api functions use."""
+
+    def __init__(self, status_code, content):
+        self.status_code = status_code
+        self.content = content
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self):
+        try:
+            return json.loads(self.content)
+        except ValueError as e:
+            raise InvalidJSONError(f"Response is not JSON: {e}") from e
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise OSError(f"HTTP {self.status_code}: {self.text[:200]}")
+
+
+class LightSleeperClient:
+    """
+    Minimal standard-library client for one-off requests from short-lived commands.
+
+    It has the get / get_json interface of SleeperClient but no connection pool, retries or
+    thread pool, and importing it does not load requests, which costs more than a single
+    request saves. Use SleeperClient for anything that makes many requests.
+    """
+
+    def __init__(self, base_url=SLEEPER_API_BASE, timeout=30):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def url(self, path):
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def get(self, path, headers=None, timeout=None):
+        """GET a path relative to base_url (or an absolute URL); error statuses are returned, not raised."""
+        import urllib.error
+        import urllib.request  # Loads ssl, so only when a request is actually made
+
+        url = path if path.startswith(('http://', 'https://')) else self.url(path)
+        request = urllib.request.Request(url, headers=headers or {})
+        try:
+            with urllib.request.urlopen(request, timeout=timeout or self.timeout) as response:
+                return LightResponse(response.status, response.read())
+        except urllib.error.HTTPError as e:
+            return LightResponse(e.code, e.read())
+
+    def get_json(self, path, **kwargs):
+        """GET a path and decode its JSON body, raising OSError on error statuses."""
+        response = self.get(path, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+
+_default_client = None
+
+
+def default_client():
+    """Return the process-wide client used when a function is not given one."""
+    global _default_client
+    if _default_client is None:
+        _default_client = SleeperClient()
+    return _default_client
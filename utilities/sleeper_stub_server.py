@@ -0,0 +1,127 @@
+import hashlib
+import json
+import re
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DRAFT_PICKS_PATH = re.compile(r'^/v1/draft/([^/]+)/picks$')
+
+
+class SleeperStubServer:
+    """
+    Local stand-in for the Sleeper API that serves recorded JSON payloads.
+
+    Routes map a request path (e.g. '/v1/league/123/rosters') to the payload to return.
+    Route responses carry an ETag and Last-Modified header and answer matching
+    If-None-Match / If-Modified-Since requests with 304 Not Modified.
+    A draft's pick stream can be replayed so that every request to its picks endpoint
+    reveals the next pick(s), like a live draft room. `delay` adds latency to every
+    response and fail_requests injects error statuses, for exercising timeouts and retries.
+
+    Usage:
+        with SleeperStubServer({'/v1/league/1/rosters': rosters}) as server:
+            requests.get(f"{server.base_url}/league/1/rosters")
+    """
+
+    def __init__(self, routes=None, host='127.0.0.1', port=0, delay=0.0):
+        self.delay = delay
+        self.failures = {}
+        self.routes = {}
+        for path, payload in (routes or {}).items():
+            self.add_route(path, payload)
+        self.pick_streams = {}
+        self.request_log = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def add_route(self, path, payload):
+        """
+        Serve `payload` at `path`; replacing a payload changes its ETag and Last-Modified.
+
+        Bytes are served as they are (e.g. an HTML error page); anything else is sent as JSON.
+        """
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        self.routes[path] = {
+            'body': body,
+            'etag': f'"{hashlib.sha1(body).hexdigest()}"',
+            'last_modified': formatdate(time.time(), usegmt=True),
+        }
+
+    def replay_picks(self, draft_id, picks, picks_per_request=1):
+        """Serve `picks` from /v1/draft/<draft_id>/picks, revealing picks_per_request more per request."""
+        self.pick_streams[str(draft_id)] = {'picks': list(picks), 'revealed': 0, 'step': picks_per_request}
+
+    def fail_requests(self, path, count, status=503):
+        """Answer the next `count` requests for `path` with `status`."""
+        self.failures[path] = [count, status]
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def respond(self, path, headers=None):
+        """Return (status, body bytes, extra headers) for a request path and its headers."""
+        headers = headers or {}
+        path = path.split('?', 1)[0]
+        with self._lock:
+            self.request_log.append(path)
+            failure = self.failures.get(path)
+            if failure and failure[0] > 0:
+                failure[0] -= 1
+                return failure[1], b'null', {}
+            match = DRAFT_PICKS_PATH.match(path)
+            if match and match.group(1) in self.pick_streams:
+                stream = self.pick_streams[match.group(1)]
+                stream['revealed'] = min(stream['revealed'] + stream['step'], len(stream['picks']))
+                return 200, json.dumps(stream['picks'][:stream['revealed']]).encode(), {}
+
+        route = self.routes.get(path)
+        if route is None:
+            # Sleeper answers unknown resources with a JSON null
+            return 404, b'null', {}
+
+        validators = {'ETag': route['etag'], 'Last-Modified': route['last_modified']}
+        if headers.get('If-None-Match') == route['etag'] or (
+            'If-None-Match' not in headers and headers.get('If-Modified-Since') == route['last_modified']
+        ):
+            return 304, b'', validators
+        return 200, route['body'], validators
+
+
+def _make_handler(stub):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if stub.delay:
+                time.sleep(stub.delay)
+            status, body, headers = stub.respond(self.path, self.headers)
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # Keep test and replay output quiet
+
+    return Handler
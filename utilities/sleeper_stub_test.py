@@ -0,0 +1,259 @@
+"""
+Checks of the draft room, the Sleeper client and the players cache against a local SleeperStubServer.
+
+Run from this directory with `python -m unittest sleeper_stub_test` (pytest also collects it).
+"""
+import json
+import os
+import tempfile
+import time
+import unittest
+
+import numpy as np
+import pandas as pd
+import requests
+
+import sleeper_cache
+import sleeperUtilities as su
+from draft_room import open_draft_room
+from sleeper_api import fetch_league_rosters, get_draft_picks, get_league, get_league_users
+from sleeper_client import InvalidJSONError, LightResponse, LightSleeperClient, SleeperClient
+from sleeper_stub_server import SleeperStubServer
+
+UTILITIES_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(UTILITIES_DIR, 'fixtures')
+MERGED_CSV = os.path.join(UTILITIES_DIR, 'merged_data_output.csv')
+
+LEAGUE_ID = 'stub_league'
+DRAFT_ID = 'stub_draft'
+TEAMS = 10
+MY_TEAM = 'Team_10'
+
+
+def load_rosters(teams=TEAMS):
+    with open(os.path.join(FIXTURES_DIR, 'sleeper_rosters.json')) as f:
+        return json.load(f)[:teams]
+
+
+def snake_picks(player_table, teams=TEAMS, rounds=2):
+    """Sleeper pick dictionaries for `rounds` snake rounds, each team taking the best projected player left."""
+    order = np.argsort(-np.nan_to_num(player_table.fpts, nan=-np.inf), kind='stable')
+    picks = []
+    for round_index in range(rounds):
+        slots = range(1, teams + 1) if round_index % 2 == 0 else range(teams, 0, -1)
+        for roster_id in slots:
+            picks.append({'pick_no': len(picks) + 1, 'round': round_index + 1, 'roster_id': roster_id,
+                          'player_id': player_table.player_id[order[len(picks)]]})
+    return picks
+
+
+class LeagueGlobalsTestCase(unittest.TestCase):
+    """Restores the league globals that open_draft_room and update_teams_data replace."""
+
+    def setUp(self):
+        saved = (su.TEAMS, su.TEAM_ROSTER_NEEDS, su.DRAFTED_PLAYERS)
+        self.addCleanup(self._restore_globals, saved)
+
+    @staticmethod
+    def _restore_globals(saved):
+        su.TEAMS, su.TEAM_ROSTER_NEEDS, su.DRAFTED_PLAYERS = saved
+
+
+class DraftRoomReplayTest(LeagueGlobalsTestCase):
+    @classmethod
+    def setUpClass(cls):
+        merged_data = pd.read_csv(MERGED_CSV, dtype={'player_id': str})
+        su.calculate_vorp(merged_data, su.identify_baseline_players(merged_data, TEAMS))
+        cls.player_table = su.build_player_table(merged_data)
+        cls.picks = snake_picks(cls.player_table)
+
+    def replay(self, workers=1):
+        """Follow the recorded picks through the stub, three per poll, and return the closed room."""
+        with SleeperStubServer({
+            f"/v1/league/{LEAGUE_ID}": {'league_id': LEAGUE_ID, 'draft_id': DRAFT_ID},
+            f"/v1/league/{LEAGUE_ID}/rosters": load_rosters(),
+        }) as server:
+            server.replay_picks(DRAFT_ID, self.picks, picks_per_request=3)
+            client = SleeperClient(server.base_url)
+            try:
+                room, _, _ = open_draft_room(LEAGUE_ID, MY_TEAM, self.player_table, client=client, workers=workers)
+                with room:
+                    room.run(poll_interval=0, total_picks=len(self.picks))
+            finally:
+                client.close()
+        return room
+
+    def test_replay_applies_every_pick(self):
+        room = self.replay()
+
+        self.assertEqual(room.last_pick_no, len(self.picks))
+        self.assertEqual(sum(len(players) for players in room.draft_results.values()), len(self.picks))
+        for pick in self.picks:
+            team = f"Team_{pick['roster_id']}"
+            self.assertFalse(room.available_players[self.player_table.index[pick['player_id']]])
+            self.assertIn(pick['player_id'], su.DRAFTED_PLAYERS[team])
+
+        # Following the picks one poll at a time ends where simulating from the final rosters does
+        best_pick, best_points = room.recommendation
+        self.assertTrue(room.available_players[self.player_table.index[best_pick]])
+        expected_pick, expected_points = su.simulate_draft_for_my_team(self.player_table, su.TEAM_ROSTER_NEEDS, MY_TEAM)
+        self.assertEqual(best_pick, expected_pick)
+        self.assertAlmostEqual(best_points, expected_points, places=3)
+
+    def test_replay_with_worker_pool(self):
+        room = self.replay()
+        pooled_room = self.replay(workers=2)
+
+        self.assertEqual(pooled_room.recommendation[0], room.recommendation[0])
+        self.assertAlmostEqual(pooled_room.recommendation[1], room.recommendation[1], places=3)
+        self.assertIsNone(pooled_room.executor)  # Shut down when the room was closed
+
+
+class PlayersCacheTest(unittest.TestCase):
+    PLAYERS_PATH = '/v1/players/nfl'
+
+    def setUp(self):
+        self.cache_dir = self.enterContext(tempfile.TemporaryDirectory())
+        self.server = self.enterContext(SleeperStubServer({self.PLAYERS_PATH: {'4034': {'position': 'RB'}}}))
+        self.client = SleeperClient(self.server.base_url, retries=0)
+        self.addCleanup(self.client.close)
+        self.parsed = 0
+        self.responses = []
+
+    def parse(self, response):
+        self.parsed += 1
+        return response.json()
+
+    def fetch(self, ttl=0):
+        """cached_fetch the players route, keeping every response the client returned."""
+        get = self.client.get
+
+        def recording_get(*args, **kwargs):
+            self.responses.append(get(*args, **kwargs))
+            return self.responses[-1]
+
+        self.client.get = recording_get
+        try:
+            return sleeper_cache.cached_fetch(self.client.url('/players/nfl'), self.parse, 'players.pkl', ttl=ttl,
+                                              cache_dir=self.cache_dir, client=self.client)
+        finally:
+            del self.client.get
+
+    def entry(self):
+        return sleeper_cache._read_entry(os.path.join(self.cache_dir, 'players.pkl'))
+
+    def test_fresh_cache_skips_the_request(self):
+        first = self.fetch(ttl=3600)
+        self.assertEqual(self.fetch(ttl=3600), first)
+        self.assertEqual(len(self.server.request_log), 1)
+        self.assertEqual(self.parsed, 1)
+
+    def test_expired_cache_revalidates_with_etag(self):
+        first = self.fetch()
+        fetched_at = self.entry()['fetched_at']
+        self.assertEqual(self.fetch(), first)
+        self.assertEqual([response.status_code for response in self.responses], [200, 304])
+        self.assertEqual(self.parsed, 1)
+        self.assertGreater(self.entry()['fetched_at'], fetched_at)
+
+    def test_expired_cache_revalidates_with_if_modified_since(self):
+        first = self.fetch()
+        entry = self.entry()
+        entry['etag'] = None
+        sleeper_cache._write_entry(os.path.join(self.cache_dir, 'players.pkl'), entry)
+        self.assertEqual(self.fetch(), first)
+        self.assertEqual([response.status_code for response in self.responses], [200, 304])
+        self.assertEqual(self.parsed, 1)
+
+    def test_changed_payload_is_parsed_again(self):
+        self.fetch()
+        self.server.add_route(self.PLAYERS_PATH, {'4034': {'position': 'RB'}, '4866': {'position': 'RB'}})
+        self.assertEqual(set(self.fetch()), {'4034', '4866'})
+        self.assertEqual(self.parsed, 2)
+
+    def test_stale_cache_is_served_when_the_request_fails(self):
+        first = self.fetch()
+        self.server.fail_requests(self.PLAYERS_PATH, 1, status=500)
+        with self.assertLogs('draft.cache', 'WARNING'):
+            self.assertEqual(self.fetch(), first)
+        self.assertEqual(self.responses[-1].status_code, 500)
+
+    def test_failure_without_cache_raises(self):
+        self.server.fail_requests(self.PLAYERS_PATH, 1, status=500)
+        with self.assertRaises(Exception):
+            self.fetch()
+        self.assertIsNone(self.entry())
+
+    def test_streamed_responses_are_closed(self):
+        self.fetch()
+        self.fetch()  # 304
+        self.server.fail_requests(self.PLAYERS_PATH, 1, status=500)
+        with self.assertLogs('draft.cache', 'WARNING'):
+            self.fetch()  # Stale fallback
+        self.assertEqual([response.status_code for response in self.responses], [200, 304, 500])
+        self.assertTrue(all(response.raw.closed for response in self.responses))
+
+
+class SleeperClientTest(unittest.TestCase):
+    ROSTERS_PATH = f"/v1/league/{LEAGUE_ID}/rosters"
+
+    def setUp(self):
+        self.server = self.enterContext(SleeperStubServer({self.ROSTERS_PATH: load_rosters()}))
+
+    def client(self, **options):
+        client = SleeperClient(self.server.base_url, backoff=0, **options)
+        self.addCleanup(client.close)
+        return client
+
+    def test_retries_server_errors(self):
+        for status in (500, 503, 429):
+            with self.subTest(status=status):
+                requests_before = len(self.server.request_log)
+                self.server.fail_requests(self.ROSTERS_PATH, 2, status=status)
+                self.assertEqual(self.client(retries=3).get_json(f"/league/{LEAGUE_ID}/rosters"), load_rosters())
+                self.assertEqual(len(self.server.request_log) - requests_before, 3)
+
+    def test_gives_up_after_the_last_retry(self):
+        client = self.client(retries=1)
+        self.server.fail_requests(self.ROSTERS_PATH, 2)
+        with self.assertRaises(requests.HTTPError):
+            client.get_json(f"/league/{LEAGUE_ID}/rosters")
+        self.server.fail_requests(self.ROSTERS_PATH, 2)
+        self.assertEqual(fetch_league_rosters(LEAGUE_ID, client), [])
+        self.assertEqual(len(self.server.request_log), 4)
+
+    def test_gather_overlaps_requests(self):
+        self.server.delay = 0.2
+        client = self.client()
+        started = time.perf_counter()
+        results = client.gather(*[(client.get_json, f"/league/{LEAGUE_ID}/rosters")] * 4)
+        self.assertEqual(results, [load_rosters()] * 4)
+        self.assertLess(time.perf_counter() - started, 0.6)  # One after another they take at least 0.8s
+
+
+class NonJsonResponseTest(unittest.TestCase):
+    MAINTENANCE_PAGE = b'<html><body>Down for maintenance</body></html>'
+
+    def test_light_response_json_raises_an_os_error(self):
+        with self.assertRaises(InvalidJSONError) as raised:
+            LightResponse(200, self.MAINTENANCE_PAGE).json()
+        self.assertIsInstance(raised.exception, OSError)
+        self.assertIsInstance(raised.exception, ValueError)
+
+    def test_getters_return_none_for_a_non_json_body(self):
+        with SleeperStubServer({
+            f"/v1/league/{LEAGUE_ID}": self.MAINTENANCE_PAGE,
+            f"/v1/league/{LEAGUE_ID}/users": self.MAINTENANCE_PAGE,
+            f"/v1/draft/{DRAFT_ID}/picks": self.MAINTENANCE_PAGE,
+        }) as server:
+            pooled_client = SleeperClient(server.base_url)
+            self.addCleanup(pooled_client.close)
+            for client in (LightSleeperClient(server.base_url), pooled_client):
+                with self.subTest(client=type(client).__name__):
+                    self.assertIsNone(get_league(LEAGUE_ID, client))
+                    self.assertIsNone(get_league_users(LEAGUE_ID, client))
+                    self.assertIsNone(get_draft_picks(DRAFT_ID, client))
+
+
+if __name__ == '__main__':
+    unittest.main()
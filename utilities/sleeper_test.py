@@ -1,18 +1,10 @@
-import requests
+import sleeperUtilities as su
 
-# Function to fetch data from Sleeper API
+# Function to fetch data from Sleeper API (the defenses come from the shared daily players cache)
 def fetch_data_from_sleeper():
-    url = "https://api.sleeper.app/v1/players/nfl"
-    response = requests.get(url)
-    
-    if response.status_code == 200:
-        data = response.json()
-        # Filter the data to include only team defenses (DST)
-        dst_data = [player_info for player_info in data.values() if 'position' in player_info and player_info['position'] == 'DEF']
-        
-        return dst_data
-    else:
-        raise Exception(f"Failed to fetch data from Sleeper API: {response.status_code}")
+    sleeper_df = su.fetch_data_from_sleeper()
+    # Filter the data to include only team defenses (DST)
+    return sleeper_df[sleeper_df['position'] == 'DEF'].to_dict('records')
 
 # Fetch DST data and print the format of the first one
 def main():
@@ -20,7 +12,7 @@ def main():
         dst_data = fetch_data_from_sleeper()
         if dst_data:
             print("Format of the first Defense and Special Teams (DST) player info:")
-            print(dst_data[0])  # Print the full dictionary for the first DST entry
+            print(dst_data[0])  # Print the cached columns for the first DST entry
         else:
             print("No DST data found.")
     except Exception as e:
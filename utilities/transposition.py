@@ -0,0 +1,87 @@
+from collections import OrderedDict
+
+import numpy as np
+
+# Default number of draft states kept before the least recently used ones are evicted
+DEFAULT_MAX_ENTRIES = 8192
+
+
+class TranspositionCache:
+    """
+    Size-bounded LRU cache of simulated draft suffixes, keyed on the draft state they start from.
+
+    Many different candidate picks lead to the same later state (the same players gone and the
+    same open slots per team). A greedy draft from that state always plays out the same way, so
+    the picks recorded the first time can be replayed instead of simulated again.
+
+    States are identified by a Zobrist hash of the set of unavailable players: every player gets
+    a random 64-bit key and a state's hash is the XOR of its drafted players' keys, so one pick
+    updates the hash in O(1) and the hash does not depend on the order players were drafted in.
+
+    A cache belongs to one player table (and one set of VORP values); binding it to a different
+    table clears it.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, seed=0):
+        """
+        Args:
+            max_entries (int): Number of states kept before least recently used ones are evicted.
+            seed (int): Seed for the Zobrist keys.
+        """
+        self.max_entries = max_entries
+        self.seed = seed
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._owner = None
+        self._key_array = None
+        self.keys = []
+
+    def bind(self, player_table):
+        """Use the cache for `player_table`, clearing it if it was used for a different table."""
+        if self._owner is not player_table:
+            self.clear()
+            self._owner = player_table
+            rng = np.random.default_rng(self.seed)
+            self._key_array = rng.integers(0, 2 ** 64 - 1, size=len(player_table.player_id), dtype=np.uint64, endpoint=True)
+            self.keys = self._key_array.tolist()
+        return self
+
+    def state_hash(self, available_players):
+        """Zobrist hash of the players marked unavailable in a boolean availability mask."""
+        return int(np.bitwise_xor.reduce(self._key_array[~available_players], initial=np.uint64(0)))
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        """Return hits, misses, hit_rate, evictions and current size."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate,
+            'evictions': self.evictions,
+            'size': len(self.entries),
+        }